@@ -0,0 +1,173 @@
+import asyncio
+import json
+import time
+
+from zerobot.bus.events import OutboundMessage
+from zerobot.bus.queue import MessageBus
+from zerobot.channels.manager import ChannelManager
+from zerobot.channels.outbound import OutboundWorkerPool, PartialSendError, RateLimiter
+from zerobot.channels.whatsapp import WhatsAppChannel
+from zerobot.config.schema import Config, WhatsAppConfig
+
+
+def _out(channel: str, chat_id: str, content: str, **kwargs) -> OutboundMessage:
+    return OutboundMessage(channel=channel, chat_id=chat_id, content=content, **kwargs)
+
+
+async def test_slow_channel_does_not_delay_others() -> None:
+    config = Config()
+    bus = MessageBus()
+    manager = ChannelManager(config, bus)
+    release = asyncio.Event()
+    fast: list[str] = []
+
+    async def slow_send(msg: OutboundMessage) -> None:
+        await release.wait()
+
+    async def fast_send(msg: OutboundMessage) -> None:
+        fast.append(msg.content)
+
+    manager.subscribe("slow", slow_send)
+    manager.subscribe("fast", fast_send)
+    for sender in manager.senders.values():
+        sender.start()
+    dispatcher = asyncio.create_task(manager._dispatch_outbound())
+
+    await bus.publish_outbound(_out("slow", "1", "stuck"))
+    await bus.publish_outbound(_out("fast", "1", "a"))
+    await bus.publish_outbound(_out("fast", "2", "b"))
+    await asyncio.wait_for(_until(lambda: len(fast) == 2), timeout=1)
+    assert fast == ["a", "b"]
+
+    release.set()
+    dispatcher.cancel()
+    await asyncio.gather(*(s.stop() for s in manager.senders.values()))
+    assert manager.senders["slow"].snapshot()["sent"] == 1
+
+
+async def test_retries_then_gives_up() -> None:
+    calls = 0
+
+    async def flaky(msg: OutboundMessage) -> None:
+        nonlocal calls
+        calls += 1
+        if calls < 3:
+            raise RuntimeError("boom")
+
+    pool = OutboundWorkerPool("t", [flaky], max_retries=2, retry_backoff_s=0.001)
+    pool.start()
+    pool.submit(_out("t", "1", "hi"))
+    await pool.join()
+    assert (calls, pool.stats.sent, pool.stats.retried, pool.stats.failed) == (3, 1, 2, 0)
+
+    async def broken(msg: OutboundMessage) -> None:
+        raise RuntimeError("down")
+
+    pool.sinks = [broken]
+    pool.submit(_out("t", "1", "again"))
+    pool.submit(_out("t", "1", "partial", partial=True))
+    await pool.join()
+    assert pool.stats.failed == 2  # The final message after retries, the partial after one attempt
+    await pool.stop()
+
+
+async def test_partial_send_retries_only_the_rest() -> None:
+    sent: list[str] = []
+    failed = False
+
+    async def chunked(msg: OutboundMessage) -> None:
+        nonlocal failed
+        for i, chunk in enumerate(msg.content.split("\n")):
+            if chunk == "two" and not failed:
+                failed = True
+                rest = OutboundMessage(msg.channel, msg.chat_id, "\n".join(msg.content.split("\n")[i:]))
+                raise PartialSendError(rest)
+            sent.append(chunk)
+
+    pool = OutboundWorkerPool("t", [chunked], max_retries=2, retry_backoff_s=0.001)
+    pool.start()
+    pool.submit(_out("t", "1", "one\ntwo\nthree"))
+    await pool.join()
+    assert sent == ["one", "two", "three"]
+    assert (pool.stats.sent, pool.stats.retried) == (1, 1)
+    await pool.stop()
+
+
+async def test_chats_keep_order_and_stale_partials_are_skipped() -> None:
+    sent: list[str] = []
+    gate = asyncio.Event()
+
+    async def send(msg: OutboundMessage) -> None:
+        await gate.wait()
+        sent.append(msg.content)
+
+    pool = OutboundWorkerPool("t", [send], workers=1)
+    pool.start()
+    pool.submit(_out("t", "1", "first"))
+    pool.submit(_out("t", "1", "p1", stream_id="s", partial=True))
+    pool.submit(_out("t", "1", "p2", stream_id="s", partial=True))
+    pool.submit(_out("t", "1", "final", stream_id="s"))
+    gate.set()
+    await pool.join()
+    await pool.stop()
+
+    assert sent == ["first", "final"]
+    assert pool.stats.dropped == 2
+
+
+async def test_rate_limiter_spaces_sends() -> None:
+    limiter = RateLimiter(rate=50, burst=1)
+    start = time.monotonic()
+    for _ in range(3):
+        await limiter.acquire()
+    assert time.monotonic() - start >= 0.035
+
+
+async def test_channel_send_failures_are_retried_and_counted() -> None:
+    channel = WhatsAppChannel(WhatsAppConfig(), MessageBus())
+    frames: list[dict] = []
+
+    class Bridge:
+        fail = 1
+
+        async def send(self, data: str) -> None:
+            if self.fail:
+                self.fail -= 1
+                raise ConnectionError("bridge closed")
+            frames.append(json.loads(data))
+
+    channel._ws, channel._connected = Bridge(), True
+    pool = OutboundWorkerPool("whatsapp", [channel.send], max_retries=2, retry_backoff_s=0.001)
+    pool.start()
+    pool.submit(_out("whatsapp", "123", "hi"))
+    await pool.join()
+    assert [f["text"] for f in frames] == ["hi"]
+    assert (pool.stats.sent, pool.stats.retried, pool.stats.failed) == (1, 1, 0)
+
+    channel._connected = False
+    pool.submit(_out("whatsapp", "123", "lost"))
+    await pool.join()
+    await pool.stop()
+    assert pool.stats.failed == 1
+
+
+async def test_subscribe_after_start_starts_the_sender() -> None:
+    bus = MessageBus()
+    manager = ChannelManager(Config(), bus)
+    manager._dispatch_task = asyncio.create_task(manager._dispatch_outbound())
+    seen: list[str] = []
+
+    async def sink(msg: OutboundMessage) -> None:
+        seen.append(msg.content)
+
+    manager.subscribe("late", sink)
+    await bus.publish_outbound(_out("late", "1", "hello"))
+    await asyncio.wait_for(_until(lambda: seen == ["hello"]), timeout=2)
+
+    await manager.stop_all()
+    assert manager._dispatch_task is None
+
+
+async def _until(predicate) -> None:
+    while not predicate():
+        await asyncio.sleep(0.005)
@@ -0,0 +1,47 @@
+from zerobot.agent.context import ContextBudget
+from zerobot.session.manager import Session
+from zerobot.utils.helpers import estimate_tokens
+
+
+def test_estimate_tokens_counts_wide_chars() -> None:
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("a" * 400) == 100
+    assert estimate_tokens("你好世界") == 4
+
+
+def test_history_keeps_newest_messages_within_budget() -> None:
+    session = Session(key="test:1")
+    for i in range(10):
+        session.add_message("user", f"question {i} " + "x" * 200)
+        session.add_message("assistant", f"answer {i}")
+
+    history = session.get_history(max_tokens=200)
+
+    assert history[0]["role"] == "user"
+    assert history[-1]["content"] == "answer 9"
+    assert sum(estimate_tokens(m["content"]) for m in history) <= 200
+    assert len(history) < 20
+    assert not any("tokens" in m for m in session.messages)  # Estimates are never stored
+
+
+def test_oversized_message_is_shortened() -> None:
+    session = Session(key="test:1")
+    session.add_message("user", "please look at this log")
+    session.add_message("assistant", "sure")
+    session.add_message("user", "START " + "log line\n" * 5000 + " END")
+
+    history = session.get_history(max_tokens=4000)
+
+    pasted = history[-1]["content"]
+    assert pasted.startswith("START") and pasted.endswith("END")
+    assert "characters omitted" in pasted
+    assert estimate_tokens(pasted) <= 1000
+    assert history[0]["content"] == "please look at this log"
+
+
+def test_budget_reserves_output_and_tools() -> None:
+    budget = ContextBudget(window=32000, max_output=8000, tool_reserve=8000, max_history=16000)
+
+    assert budget.history_tokens(fixed=4000) == 12000
+    assert budget.history_tokens(fixed=40000) == 0
+    assert ContextBudget(window=200000, max_output=8000).history_tokens(fixed=4000) == 16000
@@ -0,0 +1,60 @@
+import os
+
+from zerobot.agent.context import ContextBuilder
+
+
+def test_system_prompt_is_stable_across_turns(tmp_path) -> None:
+    builder = ContextBuilder(tmp_path)
+
+    first = builder.build_system_prompt()
+    second = builder.build_system_prompt()
+
+    assert first == second
+    assert "Current Time" not in first
+    assert "Current Session" not in first
+
+
+def test_unchanged_sections_are_not_reloaded(tmp_path, monkeypatch) -> None:
+    (tmp_path / "SOUL.md").write_text("be kind", encoding="utf-8")
+    builder = ContextBuilder(tmp_path)
+    builder.build_system_prompt()
+
+    calls = 0
+    original = builder.memory.get_memory_context
+
+    def counting() -> str:
+        nonlocal calls
+        calls += 1
+        return original()
+
+    monkeypatch.setattr(builder.memory, "get_memory_context", counting)
+    builder.build_system_prompt()
+    assert calls == 0
+
+    builder.memory.write_long_term("likes tea")
+    assert "likes tea" in builder.build_system_prompt()
+    assert calls == 1
+
+
+def test_bootstrap_edit_invalidates_prefix(tmp_path) -> None:
+    soul = tmp_path / "SOUL.md"
+    soul.write_text("be kind", encoding="utf-8")
+    builder = ContextBuilder(tmp_path)
+    assert "be kind" in builder.build_system_prompt()
+
+    soul.write_text("be brief and kind", encoding="utf-8")
+    stat = soul.stat()
+    os.utime(soul, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert "be brief and kind" in builder.build_system_prompt()
+
+
+def test_runtime_context_goes_last(tmp_path) -> None:
+    builder = ContextBuilder(tmp_path)
+
+    messages = builder.build_messages([], "hi", channel="telegram", chat_id="42")
+    system = messages[0]["content"]
+
+    assert system.startswith(builder.build_system_prompt())
+    assert system.rstrip().endswith("Chat ID: 42")
+    assert "## Current Time" in system
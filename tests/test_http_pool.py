@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from zerobot.config.schema import HttpConfig
+from zerobot.utils.http import HttpClientPool, configure_http, get_http_client
+
+
+@pytest.fixture(autouse=True)
+def _no_proxy(monkeypatch) -> None:
+    for name in ("HTTP_PROXY", "HTTPS_PROXY", "ALL_PROXY", "http_proxy", "https_proxy", "all_proxy"):
+        monkeypatch.delenv(name, raising=False)
+
+
+class _Server:
+    """Minimal keep-alive HTTP/1.1 server that counts connections and concurrent requests."""
+
+    def __init__(self, delay_s: float = 0.0):
+        self.delay_s = delay_s
+        self.connections = 0
+        self.active = 0
+        self.max_active = 0
+        self._server: asyncio.AbstractServer | None = None
+
+    async def __aenter__(self) -> str:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    async def __aexit__(self, *exc) -> None:
+        self._server.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while await reader.readuntil(b"\r\n\r\n"):
+                self.active += 1
+                self.max_active = max(self.max_active, self.active)
+                await asyncio.sleep(self.delay_s)
+                self.active -= 1
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def test_requests_reuse_one_connection() -> None:
+    pool = HttpClientPool()
+    async with _Server() as url:
+        client = pool.client()
+        assert pool.client() is client
+        for _ in range(3):
+            r = await client.get(url)
+            assert r.text == "ok"
+        stats = pool.snapshot()
+        await pool.aclose()
+
+    assert stats["requests"] == 3
+    assert stats["connections"] == 1
+    assert stats["hosts"]["127.0.0.1"]["in_flight"] == 0
+    assert pool.client(verify=False) is not pool.client()
+    await pool.aclose()
+
+
+async def test_per_host_limit_serializes_requests() -> None:
+    pool = HttpClientPool(per_host_limit=1)
+    server = _Server(delay_s=0.05)
+    async with server as url:
+        results = await asyncio.gather(*(pool.client().get(url) for _ in range(3)))
+        await pool.aclose()
+
+    assert [r.status_code for r in results] == [200, 200, 200]
+    assert server.max_active == 1
+    assert pool.snapshot()["hosts"]["127.0.0.1"]["waited"] == 2
+
+
+async def test_streamed_response_holds_slot_until_closed() -> None:
+    pool = HttpClientPool(per_host_limit=1)
+    async with _Server() as url:
+        client = pool.client()
+        async with client.stream("GET", url) as response:
+            assert pool.snapshot()["hosts"]["127.0.0.1"]["in_flight"] == 1
+            second = asyncio.create_task(client.get(url))
+            await asyncio.sleep(0.05)
+            assert not second.done()
+            await response.aread()
+        assert (await second).text == "ok"
+        await pool.aclose()
+
+    assert pool.snapshot()["hosts"]["127.0.0.1"]["in_flight"] == 0
+
+
+async def test_configure_http_replaces_shared_pool() -> None:
+    pool = configure_http(HttpConfig(per_host_limit=4, timeout_s=5.0))
+    try:
+        assert pool.per_host_limit == 4
+        assert get_http_client().timeout.read == 5.0
+        assert get_http_client() is get_http_client()
+    finally:
+        await pool.aclose()
+        configure_http(HttpConfig())
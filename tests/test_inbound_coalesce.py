@@ -0,0 +1,100 @@
+import asyncio
+
+from zerobot.bus.events import InboundMessage
+from zerobot.channels.coalesce import InboundCoalescer, merge_messages
+
+
+def _msg(content: str, chat_id: str = "1", sender_id: str = "u", **metadata) -> InboundMessage:
+    return InboundMessage(channel="t", sender_id=sender_id, chat_id=chat_id, content=content, metadata=metadata)
+
+
+def _coalescer(published: list[InboundMessage], **kwargs) -> InboundCoalescer:
+    async def publish(msg: InboundMessage) -> None:
+        published.append(msg)
+
+    options = {"window_s": 0.05, "max_delay_s": 1.0, **kwargs}
+    return InboundCoalescer(publish, **options)
+
+
+async def test_burst_becomes_one_message() -> None:
+    published: list[InboundMessage] = []
+    coalescer = _coalescer(published)
+    for text in ("hi", "are you there", "need help"):
+        await coalescer.add(_msg(text))
+    await coalescer.add(_msg("other chat", chat_id="2"))
+    assert published == []
+
+    await asyncio.sleep(0.1)
+    assert sorted(m.content for m in published) == ["hi\nare you there\nneed help", "other chat"]
+    assert coalescer.merged == 2
+
+
+async def test_mention_flushes_immediately() -> None:
+    published: list[InboundMessage] = []
+    coalescer = _coalescer(published, window_s=10)
+    await coalescer.add(_msg("context"))
+    await coalescer.add(_msg("@bot what do you think", was_mentioned=True))
+
+    [merged] = published
+    assert merged.content == "context\n@bot what do you think"
+    assert merged.metadata["coalesced_count"] == 2
+    assert coalescer.pending == 0
+
+
+async def test_max_delay_bounds_a_steady_stream() -> None:
+    published: list[InboundMessage] = []
+    coalescer = _coalescer(published, window_s=0.05, max_delay_s=0.12)
+    for i in range(6):
+        await coalescer.add(_msg(f"m{i}"))
+        await asyncio.sleep(0.03)
+    assert published, "the burst should have been flushed by the max delay"
+    await asyncio.sleep(0.1)
+    assert "\n".join(m.content for m in published) == "\n".join(f"m{i}" for i in range(6))
+
+
+async def test_commands_are_not_merged() -> None:
+    published: list[InboundMessage] = []
+    coalescer = _coalescer(published, window_s=10)
+    await coalescer.add(_msg("hello"))
+    await coalescer.add(_msg("/new"))
+    assert [m.content for m in published] == ["hello", "/new"]
+
+
+async def test_max_messages_flushes() -> None:
+    published: list[InboundMessage] = []
+    coalescer = _coalescer(published, window_s=10, max_messages=2)
+    await coalescer.add(_msg("a"))
+    await coalescer.add(_msg("b"))
+    assert [m.content for m in published] == ["a\nb"]
+
+
+def test_merge_labels_senders_in_groups() -> None:
+    merged = merge_messages([
+        _msg("hi", sender_id="1", sender_name="Ann"),
+        _msg("yo", sender_id="2", username="bob"),
+    ])
+    assert merged.content == "Ann: hi\nbob: yo"
+    assert merged.sender_id == "2"
+
+
+def test_telegram_detects_mentions_of_the_bot() -> None:
+    from types import SimpleNamespace
+
+    from zerobot.bus.queue import MessageBus
+    from zerobot.channels.telegram import TelegramChannel
+    from zerobot.config.schema import TelegramConfig
+
+    channel = TelegramChannel(TelegramConfig(), MessageBus())
+    channel._bot_id, channel._bot_username = 42, "zero_bot"
+
+    def message(text: str, entities=(), reply_from: int | None = None) -> SimpleNamespace:
+        reply = SimpleNamespace(from_user=SimpleNamespace(id=reply_from)) if reply_from else None
+        return SimpleNamespace(
+            text=text, entities=list(entities), caption=None, caption_entities=None, reply_to_message=reply,
+        )
+
+    mention = SimpleNamespace(type="mention", offset=4, length=9, user=None)
+    assert channel._is_mentioned(message("hey @Zero_Bot look", [mention]))
+    assert not channel._is_mentioned(message("hey @other_bo look", [mention]))
+    assert channel._is_mentioned(message("thanks", reply_from=42))
+    assert not channel._is_mentioned(message("thanks", reply_from=7))
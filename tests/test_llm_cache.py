@@ -0,0 +1,151 @@
+import asyncio
+import time
+from typing import Any
+
+from zerobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from zerobot.providers.cache import CachingProvider, ResponseCache, request_key
+
+
+class CountingProvider(LLMProvider):
+    def __init__(self, delay_s: float = 0.0, finish_reason: str = "stop"):
+        super().__init__()
+        self.calls = 0
+        self.delay_s = delay_s
+        self.finish_reason = finish_reason
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7) -> LLMResponse:
+        self.calls += 1
+        await asyncio.sleep(self.delay_s)
+        return LLMResponse(
+            content=f"answer {self.calls}",
+            tool_calls=[ToolCallRequest(id="t1", name="lookup", arguments={"q": "x"})],
+            finish_reason=self.finish_reason,
+            usage={"prompt_tokens": 10},
+        )
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+def _msgs(text: str) -> list[dict[str, Any]]:
+    return [{"role": "user", "content": text}]
+
+
+def test_request_key_normalizes() -> None:
+    a = request_key([{"role": "user", "content": "hi ", "name": None}], None, "m", 128, 0.0)
+    b = request_key(
+        [{"content": "hi", "role": "user", "cache_control": {"type": "ephemeral"}}],
+        [], "m", 128, 0.0,
+    )
+    assert a == b
+    assert a != request_key(_msgs("hi"), None, "m", 256, 0.0)
+    assert a != request_key(_msgs("hi"), None, "other", 128, 0.0)
+
+
+async def test_repeated_request_is_served_from_cache(tmp_path) -> None:
+    inner = CountingProvider()
+    provider = CachingProvider(inner, ResponseCache(tmp_path / "cache.db"))
+
+    first = await provider.chat(_msgs("classify"), temperature=0.0, max_tokens=128)
+    second = await provider.chat(_msgs("classify"), temperature=0.0, max_tokens=128)
+
+    assert inner.calls == 1
+    assert second.content == first.content == "answer 1"
+    assert provider.stats()["hits"] == 1 and provider.stats()["misses"] == 1
+
+
+async def test_cache_survives_restart(tmp_path) -> None:
+    inner = CountingProvider()
+    provider = CachingProvider(inner, ResponseCache(tmp_path / "cache.db"))
+    await provider.chat(_msgs("classify"), temperature=0.0)
+    provider.close()
+
+    reopened = CachingProvider(inner, ResponseCache(tmp_path / "cache.db"))
+    response = await reopened.chat(_msgs("classify"), temperature=0.0)
+
+    assert inner.calls == 1
+    assert response.tool_calls[0].arguments == {"q": "x"}
+    assert response.usage == {"prompt_tokens": 10}
+
+
+async def test_concurrent_identical_requests_share_one_call(tmp_path) -> None:
+    inner = CountingProvider(delay_s=0.05)
+    provider = CachingProvider(inner, ResponseCache(tmp_path / "cache.db"))
+
+    results = await asyncio.gather(*(provider.chat(_msgs("same"), temperature=0.0) for _ in range(5)))
+
+    assert inner.calls == 1
+    assert {r.content for r in results} == {"answer 1"}
+    assert provider.collapsed == 4
+
+
+async def test_sampled_and_error_responses_are_not_cached(tmp_path) -> None:
+    inner = CountingProvider()
+    provider = CachingProvider(inner, ResponseCache(tmp_path / "cache.db"))
+    await provider.chat(_msgs("chat"), temperature=0.7)
+    await provider.chat(_msgs("chat"), temperature=0.7)
+    assert inner.calls == 2
+    assert provider.bypassed == 2
+
+    failing = CountingProvider(finish_reason="error")
+    provider = CachingProvider(failing, ResponseCache(tmp_path / "errors.db"))
+    await provider.chat(_msgs("x"), temperature=0.0)
+    await provider.chat(_msgs("x"), temperature=0.0)
+    assert failing.calls == 2
+
+
+async def test_stream_hit_replays_cached_response(tmp_path) -> None:
+    inner = CountingProvider()
+    provider = CachingProvider(inner, ResponseCache(tmp_path / "cache.db"))
+    await provider.chat(_msgs("stream"), temperature=0.0)
+
+    chunks = [c async for c in provider.chat_stream(_msgs("stream"), temperature=0.0)]
+
+    assert inner.calls == 1
+    assert chunks[0].content == "answer 1"
+    assert chunks[-1].response.content == "answer 1"
+
+
+def test_expired_and_evicted_entries(tmp_path) -> None:
+    cache = ResponseCache(tmp_path / "cache.db", ttl_s=60.0, max_bytes=2000, memory_entries=1)
+    response = LLMResponse(content="x" * 400)
+    for i in range(6):
+        cache.put(f"k{i}", response)
+        time.sleep(0.001)
+
+    stats = cache.stats()
+    assert stats["bytes"] <= 2000
+    assert stats["evicted"] > 0
+    assert cache.get("k0") is None
+    assert cache.get("k5").content == response.content
+
+    cache.ttl_s = 0.0
+    time.sleep(0.01)
+    assert cache.get("k5") is None
+    cache.close()
+
+
+async def test_cancelled_caller_does_not_cancel_waiters(tmp_path) -> None:
+    inner = CountingProvider(delay_s=0.05)
+    provider = CachingProvider(inner, ResponseCache(tmp_path / "cache.db"))
+
+    first = asyncio.create_task(provider.chat(_msgs("same"), temperature=0.0))
+    second = asyncio.create_task(provider.chat(_msgs("same"), temperature=0.0))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert (await second).content == "answer 1"
+    assert first.cancelled()
+    assert inner.calls == 1
+
+
+async def test_callers_get_their_own_copy(tmp_path) -> None:
+    provider = CachingProvider(CountingProvider(), ResponseCache(tmp_path / "cache.db"))
+
+    first = await provider.chat(_msgs("classify"), temperature=0.0)
+    first.content = "changed"
+    first.tool_calls[0].arguments["q"] = "changed"
+    second = await provider.chat(_msgs("classify"), temperature=0.0)
+
+    assert second.content == "answer 1"
+    assert second.tool_calls[0].arguments == {"q": "x"}
@@ -0,0 +1,149 @@
+import asyncio
+
+from zerobot.providers.base import LLMProvider, LLMResponse, StreamChunk
+from zerobot.providers.failover import Endpoint, FailoverProvider, LatencyHistogram
+
+
+class FakeProvider(LLMProvider):
+    def __init__(self, name: str, delay_s: float = 0.0, fail: bool = False, raises: bool = False):
+        super().__init__()
+        self.name = name
+        self.delay_s = delay_s
+        self.fail = fail
+        self.raises = raises
+        self.models: list[str] = []
+        self.cancelled = 0
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7) -> LLMResponse:
+        self.models.append(model)
+        try:
+            await asyncio.sleep(self.delay_s)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.raises:
+            raise RuntimeError("connection reset")
+        if self.fail:
+            return LLMResponse(content="Error calling LLM: 503", finish_reason="error")
+        return LLMResponse(content=f"from {self.name}")
+
+    async def chat_stream(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        response = await self.chat(messages, tools, model, max_tokens, temperature)
+        if response.finish_reason != "error":
+            yield StreamChunk(content=response.content)
+        yield StreamChunk(response=response)
+
+    def get_default_model(self) -> str:
+        return self.name
+
+
+MSGS = [{"role": "user", "content": "hi"}]
+
+
+def _warm(endpoint: Endpoint, seconds: float, n: int = 20) -> None:
+    for _ in range(n):
+        endpoint.latency_for(endpoint.model).record(seconds)
+        endpoint.first_chunk_for(endpoint.model).record(seconds)
+
+
+def test_histogram_percentiles() -> None:
+    h = LatencyHistogram()
+    assert h.percentile(95) is None
+    for _ in range(95):
+        h.record(0.1)
+    for _ in range(5):
+        h.record(30.0)
+    assert h.percentile(50) < 0.2
+    assert h.percentile(95) < 0.2
+    assert h.percentile(99) >= 30.0
+
+
+async def test_fails_over_on_error_response_and_exception() -> None:
+    a, b, c = FakeProvider("a", fail=True), FakeProvider("b", raises=True), FakeProvider("c")
+    provider = FailoverProvider([Endpoint(a, "model-a"), Endpoint(b, "model-b"), Endpoint(c, "model-c")])
+
+    response = await provider.chat(MSGS)
+
+    assert response.content == "from c"
+    assert (a.models, b.models, c.models) == (["model-a"], ["model-b"], ["model-c"])
+    assert provider.snapshot()["model-a"]["errors"] == 1
+
+
+async def test_fails_over_on_timeout() -> None:
+    slow, fast = FakeProvider("slow", delay_s=1.0), FakeProvider("fast")
+    provider = FailoverProvider([Endpoint(slow, "s", timeout_s=0.05), Endpoint(fast, "f")])
+
+    assert (await provider.chat(MSGS)).content == "from fast"
+    assert provider.snapshot()["s"]["timeouts"] == 1
+
+
+async def test_all_endpoints_failing_returns_error() -> None:
+    a, b = FakeProvider("a", fail=True), FakeProvider("b", raises=True)
+    provider = FailoverProvider([Endpoint(a, "a"), Endpoint(b, "b")])
+
+    response = await provider.chat(MSGS)
+
+    assert response.finish_reason == "error"
+    assert "a:" in response.content and "connection reset" in response.content
+
+
+async def test_other_model_goes_to_first_endpoint() -> None:
+    a, b = FakeProvider("a"), FakeProvider("b")
+    provider = FailoverProvider([Endpoint(a, "main"), Endpoint(b, "backup")])
+
+    await provider.chat(MSGS, model="cheap")
+    await provider.chat(MSGS, model="main")
+
+    assert a.models == ["cheap", "main"]
+    assert provider.get_default_model() == "main"
+
+
+async def test_hedge_uses_faster_secondary() -> None:
+    slow, fast = FakeProvider("slow", delay_s=0.5), FakeProvider("fast", delay_s=0.01)
+    primary = Endpoint(slow, "s")
+    _warm(primary, 0.05)
+    provider = FailoverProvider([primary, Endpoint(fast, "f")], hedge=True, hedge_min_samples=20)
+
+    response = await provider.chat(MSGS)
+
+    assert response.content == "from fast"
+    assert provider.snapshot()["f"]["hedges_won"] == 1
+    assert slow.cancelled == 1
+
+
+async def test_hedge_delay_is_tracked_per_model() -> None:
+    slow, fast = FakeProvider("slow", delay_s=0.3), FakeProvider("fast", delay_s=0.01)
+    primary = Endpoint(slow, "s")
+    _warm(primary, 0.05)
+    provider = FailoverProvider([primary, Endpoint(fast, "f")], hedge=True, hedge_min_samples=20)
+
+    # No latency samples for the overridden model yet, so no hedge
+    assert (await provider.chat(MSGS, model="cheap")).content == "from slow"
+    assert fast.models == []
+    assert primary.latency_for("s").count == 20
+    assert primary.latency_for("cheap").count == 1
+    assert list(provider.snapshot()["s"]["other_models_p95_s"]) == ["cheap"]
+
+
+async def test_no_hedge_before_enough_samples() -> None:
+    slow, fast = FakeProvider("slow", delay_s=0.1), FakeProvider("fast")
+    provider = FailoverProvider([Endpoint(slow, "s"), Endpoint(fast, "f")], hedge=True, hedge_min_samples=20)
+
+    assert (await provider.chat(MSGS)).content == "from slow"
+    assert fast.models == []
+
+
+async def test_stream_fails_over_and_hedges_first_chunk() -> None:
+    broken, ok = FakeProvider("broken", fail=True), FakeProvider("ok")
+    provider = FailoverProvider([Endpoint(broken, "b"), Endpoint(ok, "o")])
+    chunks = [c async for c in provider.chat_stream(MSGS)]
+    assert chunks[0].content == "from ok"
+    assert chunks[-1].response.content == "from ok"
+
+    slow, fast = FakeProvider("slow", delay_s=0.5), FakeProvider("fast", delay_s=0.01)
+    primary = Endpoint(slow, "s")
+    _warm(primary, 0.05)
+    provider = FailoverProvider([primary, Endpoint(fast, "f")], hedge=True)
+    chunks = [c async for c in provider.chat_stream(MSGS)]
+    assert chunks[-1].response.content == "from fast"
+    assert provider.snapshot()["f"]["hedges_won"] == 1
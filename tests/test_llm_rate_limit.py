@@ -0,0 +1,153 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from zerobot.config.schema import RateLimitsConfig
+from zerobot.providers import litellm_provider
+from zerobot.providers.litellm_provider import LiteLLMProvider
+from zerobot.providers.rate_limit import (
+    LLMScheduler,
+    ModelLimits,
+    configure_llm_limits,
+    llm_priority,
+    retry_after,
+)
+
+
+class ApiError(Exception):
+    def __init__(self, status_code: int, headers: dict[str, str] | None = None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(status_code=status_code, headers=headers or {})
+
+
+async def test_concurrency_cap() -> None:
+    scheduler = LLMScheduler(ModelLimits(max_concurrent=2))
+    active = peak = 0
+
+    async def request() -> str:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.02)
+        active -= 1
+        return "ok"
+
+    results = await asyncio.gather(*(scheduler.call("m", 0, request) for _ in range(5)))
+
+    assert results == ["ok"] * 5
+    assert peak == 2
+    assert scheduler.snapshot()["m"]["requests"] == 5
+
+
+async def test_interactive_requests_go_before_background() -> None:
+    scheduler = LLMScheduler(ModelLimits(max_concurrent=1))
+    holder = await scheduler.acquire("m")
+    order: list[str] = []
+
+    async def job(name: str, priority: str) -> None:
+        with llm_priority(priority):
+            lease = await scheduler.acquire("m")
+        order.append(name)
+        lease.release()
+
+    background = asyncio.create_task(job("background", "background"))
+    await asyncio.sleep(0.01)
+    interactive = asyncio.create_task(job("interactive", "interactive"))
+    await asyncio.sleep(0.01)
+    holder.release()
+    await asyncio.gather(background, interactive)
+
+    assert order == ["interactive", "background"]
+
+
+async def test_rate_limit_honours_retry_after() -> None:
+    scheduler = LLMScheduler(ModelLimits(), backoff_s=5.0)
+    calls = 0
+
+    async def request() -> str:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise ApiError(429, {"retry-after": "0.05"})
+        return "ok"
+
+    started = time.monotonic()
+    assert await scheduler.call("m", 0, request) == "ok"
+
+    assert 0.05 <= time.monotonic() - started < 1.0
+    stats = scheduler.snapshot()["m"]
+    assert stats["rate_limited"] == 1 and stats["retries"] == 1 and stats["failed"] == 0
+
+
+async def test_client_errors_are_not_retried() -> None:
+    scheduler = LLMScheduler(ModelLimits())
+    calls = 0
+
+    async def request() -> str:
+        nonlocal calls
+        calls += 1
+        raise ApiError(400)
+
+    with pytest.raises(ApiError):
+        await scheduler.call("m", 0, request)
+    assert calls == 1
+    assert scheduler.snapshot()["m"]["failed"] == 1
+    assert scheduler.snapshot()["m"]["in_flight"] == 0
+
+
+async def test_minute_budgets() -> None:
+    scheduler = LLMScheduler(ModelLimits(requests_per_minute=2, tokens_per_minute=1000))
+    limiter = scheduler.limiter("m")
+    for _ in range(2):
+        (await limiter.acquire(100)).release({"total_tokens": 300})
+
+    now = time.monotonic()
+    assert limiter._budget_delay(0, now) > 59  # Third request this minute
+    limiter.limits.requests_per_minute = 0
+    assert limiter._budget_delay(400, now) == 0
+    assert limiter._budget_delay(500, now) > 59  # 600 used + 500 > 1000
+    assert limiter.snapshot()["last_minute_tokens"] == 600
+
+
+def test_model_overrides_by_prefix() -> None:
+    config = RateLimitsConfig.model_validate(
+        {"max_concurrent": 3, "models": {"anthropic/": {"max_concurrent": 1, "tokens_per_minute": 40000}}}
+    )
+    scheduler = configure_llm_limits(config)
+    try:
+        assert scheduler.limits_for("anthropic/claude-sonnet-4-5").tokens_per_minute == 40000
+        assert scheduler.limits_for("gpt-4o").max_concurrent == 3
+    finally:
+        configure_llm_limits(RateLimitsConfig())
+
+
+def test_retry_after_forms() -> None:
+    assert retry_after(ApiError(429, {"retry-after-ms": "1500"})) == 1.5
+    assert retry_after(ApiError(429, {"retry-after": "7"})) == 7.0
+    assert retry_after(ApiError(429)) is None
+
+
+async def test_litellm_provider_retries_rate_limits(monkeypatch) -> None:
+    configure_llm_limits(RateLimitsConfig(backoff_s=0.01))
+    calls = 0
+
+    async def fake_completion(**kwargs):
+        nonlocal calls
+        calls += 1
+        if calls < 3:
+            raise ApiError(429)
+        message = SimpleNamespace(content="hello", tool_calls=None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason="stop")], usage=None)
+
+    monkeypatch.setattr(litellm_provider, "acompletion", fake_completion)
+    try:
+        response = await LiteLLMProvider(default_model="gpt-4o").chat([{"role": "user", "content": "hi"}])
+    finally:
+        configure_llm_limits(RateLimitsConfig())
+
+    assert calls == 3
+    assert response.content == "hello"
+    assert response.finish_reason == "stop"
@@ -0,0 +1,74 @@
+from zerobot.agent.context import ContextBuilder
+from zerobot.agent.memory import MemoryStore
+
+MEMORY = """# Long-term Memory
+
+## Preferences
+- Prefers dark mode
+- Drinks green tea, never coffee
+
+## Projects
+- The API uses OAuth2
+  with refresh tokens
+"""
+
+
+def test_entries_are_parsed_with_sections_and_stable_ids(tmp_path) -> None:
+    store = MemoryStore(tmp_path)
+    store.write_long_term(MEMORY)
+
+    entries = store.get_entries()
+    assert [(e.section, e.text) for e in entries] == [
+        ("Preferences", "Prefers dark mode"),
+        ("Preferences", "Drinks green tea, never coffee"),
+        ("Projects", "The API uses OAuth2 with refresh tokens"),
+    ]
+    assert [e.id for e in MemoryStore(tmp_path).get_entries()] == [e.id for e in entries]
+
+
+def test_apply_ops_edits_entries_in_place(tmp_path) -> None:
+    store = MemoryStore(tmp_path)
+    store.write_long_term(MEMORY)
+    dark, tea, api = store.get_entries()
+
+    applied = store.apply_ops([
+        {"op": "update", "id": tea.id, "text": "Drinks oolong tea"},
+        {"op": "delete", "id": dark.id},
+        {"op": "add", "section": "Projects", "text": "Deploys on Fridays"},
+        {"op": "add", "section": "Location", "text": "Lives in Lisbon"},
+        {"op": "delete", "id": "nope"},
+        "garbage",
+    ])
+
+    assert applied == {"update": 1, "delete": 1, "add": 2}
+    content = store.read_long_term()
+    assert "dark mode" not in content
+    assert "# Long-term Memory" in content
+    assert content.index("Drinks oolong tea") < content.index("## Projects")
+    assert content.index("refresh tokens") < content.index("Deploys on Fridays") < content.index("## Location")
+    assert content.rstrip().endswith("- Lives in Lisbon")
+
+
+def test_small_memory_is_inlined(tmp_path) -> None:
+    builder = ContextBuilder(tmp_path)
+    builder.memory.write_long_term(MEMORY)
+
+    assert "Drinks green tea" in builder.build_system_prompt()
+    assert builder.memory.get_relevant_context("tea") == ""
+
+
+def test_large_memory_retrieves_relevant_entries(tmp_path) -> None:
+    builder = ContextBuilder(tmp_path, prompt_caching=True, memory_inline_tokens=50, memory_top_k=2)
+    facts = [f"- Fact number {i} about gardening" for i in range(40)]
+    builder.memory.write_long_term(MEMORY + "\n## Misc\n" + "\n".join(facts) + "\n")
+
+    system = builder.build_system_prompt()
+    assert "Drinks green tea" not in system
+    assert "43 entries" in system
+
+    messages = builder.build_messages([], "what tea do I like?")
+    user = messages[-1]["content"]
+    assert "## Relevant Long-term Memory" in user
+    assert "Drinks green tea, never coffee" in user
+    assert "gardening" not in user
+    assert messages[0]["content"] == system
@@ -0,0 +1,99 @@
+import json
+
+from zerobot.agent.memory import MemoryStore
+from zerobot.agent.memory_index import MemoryIndex
+from zerobot.agent.tools.memory import MemorySearchTool
+
+
+def _write_session(path, messages) -> None:
+    lines = [json.dumps({"_type": "metadata", "created_at": "2026-01-01T00:00:00"})]
+    lines += [json.dumps(m) for m in messages]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _setup(tmp_path):
+    store = MemoryStore(tmp_path)
+    sessions = tmp_path / "sessions"
+    sessions.mkdir()
+    return store, sessions, MemoryIndex(tmp_path, sessions)
+
+
+def test_history_search_with_date_filter(tmp_path) -> None:
+    store, _, index = _setup(tmp_path)
+    store.append_history("[2026-01-05 10:00] Booked a flight to Lisbon for the conference.")
+    store.append_history("[2026-02-10 09:30] Discussed the Lisbon hotel options.")
+
+    hits = index.search("Lisbon")
+    assert len(hits) == 2
+    assert all(h.source == "history" for h in hits)
+
+    hits = index.search("lisbon", since="2026-02-01")
+    assert [h.timestamp for h in hits] == ["2026-02-10 09:30"]
+    assert "[Lisbon]" in hits[0].snippet
+
+
+def test_incremental_indexing(tmp_path) -> None:
+    store, sessions, index = _setup(tmp_path)
+    store.append_history("[2026-01-05 10:00] First entry about apples.")
+    assert index.refresh() == 1
+    assert index.refresh() == 0
+
+    store.append_history("[2026-01-06 10:00] Second entry about pears.")
+    msgs = [{"role": "user", "content": "remind me about the dentist", "timestamp": "2026-01-07T08:00:00"}]
+    _write_session(sessions / "telegram_42.jsonl", msgs)
+    assert index.refresh() == 2
+
+    msgs.append({"role": "assistant", "content": "Dentist reminder set", "timestamp": "2026-01-07T08:00:05"})
+    _write_session(sessions / "telegram_42.jsonl", msgs)
+    assert index.refresh() == 1
+
+    hits = index.search("dentist", source="session")
+    assert {h.role for h in hits} == {"user", "assistant"}
+    assert hits[0].ref == "telegram:42"
+
+
+def test_cleared_session_is_reindexed(tmp_path) -> None:
+    _, sessions, index = _setup(tmp_path)
+    path = sessions / "cli_direct.jsonl"
+    _write_session(path, [{"role": "user", "content": "old topic zebra", "timestamp": "2026-01-01T00:00:00"}])
+    index.refresh()
+
+    _write_session(path, [{"role": "user", "content": "new topic giraffe", "timestamp": "2026-01-02T00:00:00"}])
+    index.refresh()
+
+    assert index.search("zebra") == []
+    assert len(index.search("giraffe")) == 1
+
+
+def test_appended_session_reads_only_new_bytes(tmp_path) -> None:
+    _, sessions, index = _setup(tmp_path)
+    path = sessions / "cli_direct.jsonl"
+    _write_session(path, [
+        {"role": "user", "content": "first topic walrus", "timestamp": "2026-01-01T00:00:00"},
+        {"role": "assistant", "content": "noted", "timestamp": "2026-01-01T00:00:01"},
+    ])
+    index.refresh()
+
+    # Change the start of the file without touching the indexed tail: only an append is read
+    text = path.read_text(encoding="utf-8").replace("walrus", "badger")
+    path.write_text(text, encoding="utf-8")
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"role": "user", "content": "second topic otter", "timestamp": "2026-01-02T00:00:00"}) + "\n")
+        f.write(json.dumps({"role": "user", "content": "torn"}))  # Not yet terminated
+    assert index.refresh() == 1
+
+    assert len(index.search("walrus")) == 1
+    assert index.search("badger") == []
+    assert len(index.search("otter")) == 1
+
+
+async def test_tool_formats_results(tmp_path) -> None:
+    store, _, index = _setup(tmp_path)
+    store.append_history("[2026-01-05 10:00] User prefers green tea.")
+    tool = MemorySearchTool(index)
+
+    result = await tool.execute(query="green tea")
+    assert "1. [history] 2026-01-05 10:00" in result
+
+    assert (await tool.execute(query="coffee")).startswith("No results")
+    assert (await tool.execute(query="tea", since="last week")).startswith("Error")
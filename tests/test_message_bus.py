@@ -0,0 +1,124 @@
+import asyncio
+
+import pytest
+
+from zerobot.bus.events import InboundMessage, OutboundMessage
+from zerobot.bus.queue import MessageBus, message_lane
+
+
+def _msg(channel: str, chat_id: str, content: str = "", **metadata) -> InboundMessage:
+    return InboundMessage(channel=channel, sender_id="u", chat_id=chat_id, content=content, metadata=metadata)
+
+
+async def _drain(bus: MessageBus) -> list[str]:
+    out = []
+    while bus.inbound_size:
+        out.append((await bus.consume_inbound()).content)
+    return out
+
+
+def test_message_lanes() -> None:
+    assert message_lane(_msg("system", "cli:1")) == 0
+    assert message_lane(_msg("telegram", "1")) == 1
+    assert message_lane(_msg("telegram", "1", is_group=True)) == 2
+    assert message_lane(_msg("feishu", "1", chat_type="group")) == 2
+    assert message_lane(_msg("discord", "1", guild_id="g")) == 2
+    assert message_lane(_msg("slack", "C1", slack={"channel_type": "channel"})) == 2
+    assert message_lane(_msg("slack", "D1", slack={"channel_type": "im"})) == 1
+    assert message_lane(_msg("telegram", "1", is_group=True, priority="system")) == 0
+
+
+async def test_priority_lanes_and_fairness() -> None:
+    bus = MessageBus()
+    for i in range(3):
+        await bus.publish_inbound(_msg("telegram", "noisy", f"g{i}", is_group=True))
+    await bus.publish_inbound(_msg("discord", "quiet", "d0", guild_id="g"))
+    await bus.publish_inbound(_msg("telegram", "dm", "dm"))
+    await bus.publish_inbound(_msg("system", "telegram:dm", "sys"))
+
+    assert await _drain(bus) == ["sys", "dm", "g0", "d0", "g1", "g2"]
+
+
+async def test_drop_oldest_sheds_the_noisiest_group_chat() -> None:
+    bus = MessageBus(inbound_max=3, overflow="drop_oldest")
+    await bus.publish_inbound(_msg("telegram", "a", "a0", is_group=True))
+    await bus.publish_inbound(_msg("telegram", "b", "b0", is_group=True))
+    await bus.publish_inbound(_msg("telegram", "b", "b1", is_group=True))
+
+    assert await bus.publish_inbound(_msg("telegram", "dm", "dm"))
+    assert await bus.publish_inbound(_msg("system", "x:1", "sys"))  # Never dropped, even over the bound
+    assert await _drain(bus) == ["sys", "dm", "a0", "b1"]
+    assert bus.snapshot()["inbound"]["lanes"]["group"]["dropped"] == 1
+
+
+async def test_drop_oldest_keeps_more_urgent_messages() -> None:
+    bus = MessageBus(inbound_max=1, overflow="drop_oldest")
+    await bus.publish_inbound(_msg("telegram", "dm", "dm"))
+    assert not await bus.publish_inbound(_msg("telegram", "g", "group", is_group=True))
+    assert await _drain(bus) == ["dm"]
+
+
+async def test_drop_new() -> None:
+    bus = MessageBus(inbound_max=1, overflow="drop_new")
+    await bus.publish_inbound(_msg("telegram", "g", "first", is_group=True))
+    assert not await bus.publish_inbound(_msg("telegram", "dm", "second"))
+    assert await _drain(bus) == ["first"]
+
+
+async def test_block_waits_for_space() -> None:
+    bus = MessageBus(inbound_max=1, overflow="block")
+    await bus.publish_inbound(_msg("telegram", "1", "first"))
+    blocked = asyncio.create_task(bus.publish_inbound(_msg("telegram", "1", "second")))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+
+    assert (await bus.consume_inbound()).content == "first"
+    assert await blocked
+    assert (await bus.consume_inbound()).content == "second"
+
+
+async def test_outbound_drops_partials_when_full() -> None:
+    bus = MessageBus(outbound_max=1)
+    await bus.publish_outbound(OutboundMessage(channel="t", chat_id="1", content="final"))
+    assert not await bus.publish_outbound(OutboundMessage(channel="t", chat_id="1", content="...", partial=True))
+    assert (await bus.consume_outbound()).content == "final"
+
+    stats = bus.snapshot()["outbound"]
+    assert (stats["published"], stats["delivered"], stats["dropped"]) == (2, 1, 1)
+
+
+async def test_snapshot_reports_depth_and_wait() -> None:
+    bus = MessageBus()
+    await bus.publish_inbound(_msg("telegram", "1", "a"))
+    await bus.publish_inbound(_msg("discord", "2", "b", guild_id="g"))
+    snap = bus.snapshot()["inbound"]
+    assert snap["depth"] == 2
+    assert snap["channels"] == {"telegram": 1, "discord": 1}
+    await asyncio.sleep(0.01)
+    await bus.consume_inbound()
+    direct = bus.snapshot()["inbound"]["lanes"]["direct"]
+    assert direct["delivered"] == 1 and direct["max_wait_s"] >= 0.01
+
+
+def test_rejects_unknown_policy() -> None:
+    with pytest.raises(ValueError):
+        MessageBus(overflow="spill")
+
+
+async def test_consume_skips_chats_that_are_not_ready() -> None:
+    bus = MessageBus()
+    for content in ("busy 1", "busy 2"):
+        await bus.publish_inbound(_msg("telegram", "busy", content))
+    await bus.publish_inbound(_msg("telegram", "quiet", "quiet 1"))
+
+    busy = {"busy"}
+    ready = lambda m: m.chat_id not in busy  # noqa: E731
+    assert (await bus.consume_inbound(ready)).content == "quiet 1"
+
+    waiter = asyncio.create_task(bus.consume_inbound(ready))
+    await asyncio.sleep(0)
+    assert not waiter.done()
+    busy.clear()
+    await bus.notify_inbound()
+    assert (await asyncio.wait_for(waiter, timeout=1)).content == "busy 1"
+    assert bus.inbound_size == 1
@@ -0,0 +1,121 @@
+from zerobot.agent.loop import AgentLoop
+from zerobot.agent.router import ModelRouter
+from zerobot.agent.streaming import StreamRelay
+from zerobot.bus.events import OutboundMessage
+from zerobot.bus.queue import MessageBus
+from zerobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+
+PRICES = {"main": (10e-6, 30e-6), "small": (1e-6, 2e-6)}
+USAGE = {"prompt_tokens": 1000, "completion_tokens": 100}
+
+
+class ScriptedProvider(LLMProvider):
+    """Answers with a per-model queue of responses, recording which models were called."""
+
+    def __init__(self, script: dict[str, list[LLMResponse]]):
+        super().__init__()
+        self.script = script
+        self.models: list[str] = []
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7) -> LLMResponse:
+        self.models.append(model)
+        return self.script[model].pop(0)
+
+    def get_default_model(self) -> str:
+        return "main"
+
+
+def _loop(tmp_path, provider: LLMProvider) -> AgentLoop:
+    loop = AgentLoop(
+        bus=MessageBus(), provider=provider, workspace=tmp_path, model="main",
+        router_model="small", context_window_tokens=32768,
+    )
+    loop.router._prices.update(PRICES)
+    return loop
+
+
+def test_rules() -> None:
+    router = ModelRouter("main", "small", chat_max_chars=50)
+
+    assert router.route("turn", "thanks!").model == "small"
+    assert router.route("turn", "x" * 51).reason == "long message"
+    assert router.route("turn", "look at https://example.com").model == "main"
+    assert router.route("turn", "what's this?", media=True).model == "main"
+    assert router.route("consolidation").small
+    assert router.route("consolidation", model="pinned").model == "pinned"
+    assert ModelRouter("main").route("classification").model == "main"
+
+
+def test_savings_are_estimated_from_prices() -> None:
+    router = ModelRouter("main", "small", prices=PRICES)
+
+    router.record(router.route("classification"), USAGE)
+    route = router.escalate(router.route("consolidation"), USAGE, "not a JSON dict")
+    router.record(route, USAGE)
+
+    stats = router.snapshot()
+    assert stats["classification"] == {"calls": 1, "small": 1, "escalated": 0, "saved_usd": 0.0118}
+    assert stats["consolidation"]["escalated"] == 1
+    assert stats["consolidation"]["saved_usd"] == -0.0012  # The rejected small call was wasted
+
+
+async def test_chit_chat_stays_on_small_model(tmp_path) -> None:
+    provider = ScriptedProvider({"small": [LLMResponse(content="Hi there!", usage=USAGE)]})
+    loop = _loop(tmp_path, provider)
+
+    route = loop.router.route("turn", "hello")
+    content, _, _ = await loop._run_agent_loop([{"role": "user", "content": "hello"}], route=route)
+
+    assert content == "Hi there!"
+    assert provider.models == ["small"]
+    assert loop.router.snapshot()["turn"]["small"] == 1
+
+
+async def test_turn_needing_tools_escalates_to_main(tmp_path) -> None:
+    call = ToolCallRequest(id="t1", name="list_dir", arguments={"path": str(tmp_path)})
+    provider = ScriptedProvider({
+        "small": [LLMResponse(content=None, tool_calls=[call])],
+        "main": [LLMResponse(content=None, tool_calls=[call]), LLMResponse(content="Done.")],
+    })
+    loop = _loop(tmp_path, provider)
+
+    route = loop.router.route("turn", "what files do I have?")
+    content, tools_used, _ = await loop._run_agent_loop([{"role": "user", "content": "files?"}], route=route)
+
+    assert content == "Done."
+    assert provider.models == ["small", "main", "main"]
+    assert tools_used == ["list_dir"]
+    assert loop.router.snapshot()["turn"]["escalated"] == 1
+
+
+async def test_invalid_classification_escalates(tmp_path) -> None:
+    provider = ScriptedProvider({
+        "small": [LLMResponse(content="web search, probably")],
+        "main": [LLMResponse(content='["web_search"]')],
+    })
+    loop = _loop(tmp_path, provider)
+
+    caps = await loop._llm_infer_caps("latest news?", None, [], ["web_search", "exec"])
+
+    assert caps == ["web_search"]
+    assert provider.models == ["small", "main"]
+
+
+async def test_rejected_small_answer_is_never_streamed(tmp_path) -> None:
+    call = ToolCallRequest(id="t1", name="list_dir", arguments={"path": str(tmp_path)})
+    provider = ScriptedProvider({
+        "small": [LLMResponse(content="Let me check", tool_calls=[call])],
+        "main": [LLMResponse(content="You have no files.")],
+    })
+    loop = _loop(tmp_path, provider)
+    published: list[OutboundMessage] = []
+
+    async def publish(msg: OutboundMessage) -> None:
+        published.append(msg)
+
+    stream = StreamRelay(publish, channel="test", chat_id="1", interval_s=0)
+    route = loop.router.route("turn", "any files?")
+    content, _, _ = await loop._run_agent_loop([{"role": "user", "content": "any files?"}], stream, route)
+
+    assert content == "You have no files."
+    assert [m.content for m in published] == ["You have no files."]
@@ -0,0 +1,62 @@
+from litellm.types.utils import PromptTokensDetailsWrapper, Usage
+
+from zerobot.agent.context import ContextBuilder
+from zerobot.providers.litellm_provider import LiteLLMProvider
+
+
+def test_cache_breakpoints_on_system_and_tail() -> None:
+    provider = LiteLLMProvider(default_model="anthropic/claude-sonnet-4-5")
+    messages = [
+        {"role": "system", "content": "stable"},
+        {"role": "user", "content": "hi"},
+        {"role": "assistant", "content": "", "tool_calls": [{"id": "1"}]},
+        {"role": "tool", "tool_call_id": "1", "name": "x", "content": "result"},
+        {"role": "user", "content": [{"type": "text", "text": "now"}]},
+    ]
+
+    kwargs = provider._build_kwargs(messages, None, None, 100, 0.0)
+    sent = kwargs["messages"]
+
+    marked = [i for i, m in enumerate(sent) if isinstance(m["content"], list)
+              and "cache_control" in m["content"][-1]]
+    assert marked == [0, 3, 4]
+    assert sent[0]["content"] == [{"type": "text", "text": "stable", "cache_control": {"type": "ephemeral"}}]
+    # Caller's messages are left untouched
+    assert messages[0]["content"] == "stable"
+    assert "cache_control" not in messages[4]["content"][0]
+
+
+def test_no_breakpoints_for_providers_without_cache_control() -> None:
+    messages = [{"role": "system", "content": "stable"}, {"role": "user", "content": "hi"}]
+
+    openai = LiteLLMProvider(default_model="gpt-4o")
+    assert openai._build_kwargs(messages, None, None, 100, 0.0)["messages"] == messages
+
+    disabled = LiteLLMProvider(default_model="anthropic/claude-sonnet-4-5", prompt_caching=False)
+    assert disabled._build_kwargs(messages, None, None, 100, 0.0)["messages"] == messages
+
+
+def test_usage_reports_cached_tokens() -> None:
+    provider = LiteLLMProvider(default_model="gpt-4o")
+    usage = Usage(
+        prompt_tokens=1000,
+        completion_tokens=10,
+        total_tokens=1010,
+        prompt_tokens_details=PromptTokensDetailsWrapper(cached_tokens=800),
+    )
+
+    parsed = provider._parse_usage(usage)
+
+    assert parsed["cached_tokens"] == 800
+    assert parsed["prompt_tokens"] == 1000
+
+
+def test_runtime_context_moves_to_user_turn(tmp_path) -> None:
+    builder = ContextBuilder(tmp_path, prompt_caching=True)
+
+    messages = builder.build_messages([], "hi", channel="telegram", chat_id="42")
+
+    assert messages[0]["content"] == builder.build_system_prompt()
+    assert messages[-1]["content"].startswith("## Current Time")
+    assert messages[-1]["content"].endswith("hi")
+    assert "Chat ID: 42" in messages[-1]["content"]
@@ -0,0 +1,111 @@
+import gzip
+import os
+import time
+
+import pytest
+
+from zerobot.agent.memory_index import MemoryIndex
+from zerobot.session.archive import SessionArchive
+from zerobot.session.manager import Session, SessionManager
+
+
+@pytest.fixture
+def manager(tmp_path) -> SessionManager:
+    return SessionManager(tmp_path, sessions_dir=tmp_path / "sessions")
+
+
+def _save(manager: SessionManager, key: str, n: int = 20, age_s: float = 0) -> Session:
+    session = Session(key=key, metadata={"k": key})
+    for i in range(n):
+        session.add_message("user", f"{key} message {i} " + "lorem ipsum " * 20)
+    session.last_consolidated = n
+    manager.save(session)
+    if age_s:
+        path = manager.store.path(key)
+        old = time.time() - age_s
+        os.utime(path, (old, old))
+    return session
+
+
+def test_archives_idle_sessions_only(manager) -> None:
+    _save(manager, "cli:old", age_s=7200)
+    _save(manager, "cli:new")
+    manager.invalidate("cli:old")
+    manager.invalidate("cli:new")
+
+    result = manager.archive_idle(3600)
+    assert result["sessions"] == 1
+    assert result["compressed"] < result["bytes"]
+    assert not manager.store.path("cli:old").exists()
+    assert manager.store.path("cli:new").exists()
+
+    listed = {info["key"]: info for info in manager.list_sessions()}
+    assert set(listed) == {"cli:old", "cli:new"}
+    assert listed["cli:old"]["archived"]
+
+    # The segment is an ordinary gzip file
+    [segment] = (manager.sessions_dir / "archive").glob("segment-*.gz")
+    assert b"cli:old message 0" in gzip.decompress(segment.read_bytes())
+
+
+def test_cached_sessions_are_not_archived(manager) -> None:
+    _save(manager, "cli:busy", age_s=7200)
+    assert manager.archive_idle(3600)["sessions"] == 0
+    assert manager.store.path("cli:busy").exists()
+
+
+def test_get_or_create_rehydrates(manager) -> None:
+    original = _save(manager, "cli:cold", age_s=7200)
+    manager.invalidate("cli:cold")
+    manager.archive_idle(3600)
+
+    fresh = SessionManager(manager.workspace, sessions_dir=manager.sessions_dir)
+    assert [info.get("archived") for info in fresh.list_sessions()] == [True]
+    session = fresh.get_or_create("cli:cold")
+    assert [m["content"] for m in session.messages] == [m["content"] for m in original.messages]
+    assert session.metadata == {"k": "cli:cold"}
+    assert fresh.store.path("cli:cold").exists()
+    assert fresh.store.archive_stats()["archived_sessions"] == 0
+    assert not list((manager.sessions_dir / "archive").glob("segment-*.gz"))
+
+    session.add_message("user", "back again")
+    fresh.save(session)
+    fresh.invalidate("cli:cold")
+    assert fresh.get_or_create("cli:cold").messages[-1]["content"] == "back again"
+
+
+def test_archive_stats_and_read_all(manager) -> None:
+    _save(manager, "cli:a", age_s=7200)
+    _save(manager, "cli:b", age_s=7200)
+    manager.invalidate("cli:a")
+    manager.invalidate("cli:b")
+    manager.archive_idle(3600)
+
+    stats = manager.store.archive_stats()
+    assert (stats["live_sessions"], stats["archived_sessions"], stats["archived_segments"]) == (0, 2, 1)
+    assert stats["archived_segment_bytes"] * 5 < stats["archived_bytes"]
+    assert len(manager.read_all("cli:a")) == 20
+
+
+def test_archived_sessions_stay_searchable(manager) -> None:
+    _save(manager, "cli:find", n=2, age_s=7200)
+    manager.invalidate("cli:find")
+    index = MemoryIndex(manager.workspace, manager.sessions_dir)
+    assert index.search("lorem")
+
+    manager.archive_idle(3600)
+    assert [hit.ref for hit in index.search("lorem")] == ["cli:find", "cli:find"]
+
+
+def test_archive_shared_between_processes(tmp_path) -> None:
+    gateway, cli = SessionArchive(tmp_path / "archive"), SessionArchive(tmp_path / "archive")
+    for name in ("a.jsonl", "b.jsonl", "c.jsonl"):
+        (tmp_path / name).write_text(name)
+    gateway.add([(tmp_path / "a.jsonl", {"key": "a"})])
+    assert "a.jsonl" in gateway
+
+    cli.add([(tmp_path / "b.jsonl", {"key": "b"})])
+    gateway.add([(tmp_path / "c.jsonl", {"key": "c"})])  # Must not write its stale index over cli's
+
+    assert set(cli.entries()) == {"a.jsonl", "b.jsonl", "c.jsonl"}
+    assert gateway.read("b.jsonl") == b"b.jsonl"
@@ -0,0 +1,79 @@
+import gc
+
+import pytest
+
+from zerobot.session.manager import Session, SessionManager
+
+
+@pytest.fixture
+def manager(tmp_path) -> SessionManager:
+    m = SessionManager(tmp_path, cache_max_messages=10, sessions_dir=tmp_path)
+    return m
+
+
+def _fill(manager: SessionManager, key: str, count: int) -> None:
+    session = manager.get_or_create(key)
+    for i in range(count):
+        session.add_message("user", f"{key} {i}")
+    manager.save(session)
+
+
+def test_lru_evicts_over_message_budget_and_reloads(manager) -> None:
+    _fill(manager, "chat:a", 6)
+    _fill(manager, "chat:b", 6)
+    gc.collect()
+
+    stats = manager.cache_stats()
+    assert stats["sessions"] == 1
+    assert stats["evictions"] == 1
+    assert stats["messages"] == 6
+
+    reloaded = manager.get_or_create("chat:a")
+    assert [m["content"] for m in reloaded.messages][-1] == "chat:a 5"
+    stats = manager.cache_stats()
+    assert stats["misses"] == 3
+    assert stats["evictions"] == 2
+
+
+def test_recently_used_session_survives(manager) -> None:
+    _fill(manager, "chat:a", 3)
+    _fill(manager, "chat:b", 3)
+    manager.get_or_create("chat:a")
+    _fill(manager, "chat:c", 6)
+
+    cached = list(manager._cache)
+    assert cached == ["chat:a", "chat:c"]
+
+
+def test_evicted_session_still_in_use_is_reused(manager) -> None:
+    _fill(manager, "chat:a", 6)
+    held = manager.get_or_create("chat:a")
+    _fill(manager, "chat:b", 6)
+    assert "chat:a" not in manager._cache
+
+    assert manager.get_or_create("chat:a") is held
+    assert manager.cache_stats()["hits"] == 2
+
+
+def test_idle_sessions_are_evicted(tmp_path, monkeypatch) -> None:
+    manager = SessionManager(tmp_path, cache_idle_s=10, sessions_dir=tmp_path)
+    clock = [1000.0]
+    monkeypatch.setattr("zerobot.session.manager.time.monotonic", lambda: clock[0])
+
+    manager.save(Session(key="chat:old"))
+    clock[0] += 11
+    manager.get_or_create("chat:new")
+
+    assert list(manager._cache) == ["chat:new"]
+
+
+def test_is_current_rejects_replaced_session(manager) -> None:
+    old = manager.get_or_create("chat:a")
+    old.add_message("user", "hello")
+    manager.save(old)
+    manager.invalidate("chat:a")
+    assert not manager.is_current(old)
+
+    fresh = manager.get_or_create("chat:a")
+    assert manager.is_current(fresh)
+    assert not manager.is_current(old)
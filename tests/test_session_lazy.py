@@ -0,0 +1,119 @@
+import json
+import threading
+
+import pytest
+
+from zerobot.session.manager import Session, SessionManager
+
+
+def _manager(tmp_path, **kwargs) -> SessionManager:
+    m = SessionManager(tmp_path, lazy_min_bytes=0, tail_messages=50, sessions_dir=tmp_path, **kwargs)
+    return m
+
+
+@pytest.fixture
+def saved(tmp_path) -> Session:
+    writer = _manager(tmp_path)
+    session = Session(key="chat:long")
+    for i in range(1000):
+        session.add_message("user" if i % 2 == 0 else "assistant", f"msg{i}")
+        if i % 100 == 99:
+            writer.save(session)
+    session.last_consolidated = 990
+    writer.save(session)
+    return session
+
+
+def test_only_tail_is_loaded(tmp_path, saved) -> None:
+    session = _manager(tmp_path).get_or_create(saved.key)
+
+    assert len(session.messages) == 1000
+    assert session.messages.loaded == 50
+    assert session.last_consolidated == 990
+    assert session.messages[-1]["content"] == "msg999"
+
+    history = session.get_history(max_tokens=100)
+    assert history[-1]["content"] == "msg999"
+    assert session.messages.loaded == 50
+
+
+def test_older_messages_load_on_demand(tmp_path, saved) -> None:
+    session = _manager(tmp_path).get_or_create(saved.key)
+
+    assert session.messages[0]["content"] == "msg0"
+    assert [m["content"] for m in session.messages[500:503]] == ["msg500", "msg501", "msg502"]
+    assert session.messages == saved.messages
+
+
+async def test_history_async_reads_older_messages_off_the_loop(tmp_path, saved) -> None:
+    session = _manager(tmp_path).get_or_create(saved.key)
+    source = session.messages._source
+    read = source.read
+    threads: list[str] = []
+
+    def tracking_read(*args, **kwargs):
+        threads.append(threading.current_thread().name)
+        return read(*args, **kwargs)
+
+    source.read = tracking_read
+    history = await session.get_history_async(max_tokens=2000)
+
+    assert session.messages.loaded > 50
+    assert threads and threading.main_thread().name not in threads
+    reads = len(threads)
+    assert history == session.get_history(max_tokens=2000)
+    assert len(threads) == reads  # Everything the walk needed was already loaded
+
+
+def test_unconsolidated_messages_are_always_loaded(tmp_path, saved) -> None:
+    saved.last_consolidated = 100
+    _manager(tmp_path).save(saved)
+
+    session = _manager(tmp_path).get_or_create(saved.key)
+    assert session.messages.loaded >= 900
+
+
+def test_appends_and_compaction_after_lazy_load(tmp_path, saved) -> None:
+    manager = _manager(tmp_path)
+    session = manager.get_or_create(saved.key)
+    session.add_message("user", "new")
+    manager.save(session)
+    assert manager.compact(session.key)
+
+    assert session.messages[10]["content"] == "msg10"
+    reloaded = _manager(tmp_path).get_or_create(saved.key)
+    assert len(reloaded.messages) == 1001
+    assert reloaded.messages[-1]["content"] == "new"
+    assert reloaded.messages[10]["content"] == "msg10"
+
+
+def test_legacy_file_is_read_whole(tmp_path) -> None:
+    manager = _manager(tmp_path)
+    path = manager.store.path("chat:legacy")
+    lines = [{"_type": "metadata", "created_at": "2026-01-01T00:00:00", "metadata": {}, "last_consolidated": 0}]
+    lines += [{"role": "user", "content": f"m{i}"} for i in range(100)]
+    path.write_text("".join(json.dumps(line) + "\n" for line in lines))
+
+    session = manager.get_or_create("chat:legacy")
+    assert session.messages.loaded == 100
+
+
+def test_history_views_are_reused(tmp_path, saved) -> None:
+    session = _manager(tmp_path).get_or_create(saved.key)
+
+    first = session.get_history(max_tokens=200)
+    second = session.get_history(max_tokens=200)
+    assert first == second
+    assert all(a is b for a, b in zip(first, second))
+
+
+def test_token_estimates_are_not_saved(tmp_path, saved) -> None:
+    manager = _manager(tmp_path)
+    session = manager.get_or_create(saved.key)
+
+    session.add_message("user", "one more")
+    session.get_history(max_tokens=200)
+    manager.save(session)
+
+    assert session.messages.tokens(-1) > 0
+    assert '"tokens"' not in (tmp_path / "chat_long.jsonl").read_text()
@@ -0,0 +1,150 @@
+import json
+import time
+
+import pytest
+
+from zerobot.session.manager import Session, SessionManager
+
+
+@pytest.fixture
+def manager(tmp_path) -> SessionManager:
+    m = SessionManager(tmp_path, sessions_dir=tmp_path)
+    return m
+
+
+def _lines(manager: SessionManager, key: str) -> list[dict]:
+    path = manager.store.path(key)
+    return [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+
+
+def test_save_appends_only_new_messages(manager) -> None:
+    session = Session(key="cli:append")
+    session.add_message("user", "hello")
+    manager.save(session)
+    path = manager.store.path(session.key)
+    before = path.read_bytes()
+
+    session.add_message("assistant", "hi")
+    session.last_consolidated = 1
+    manager.save(session)
+
+    after = path.read_bytes()
+    assert after.startswith(before)
+    tail = [json.loads(line) for line in after[len(before):].decode().splitlines()]
+    assert [r.get("_type", r.get("content")) for r in tail] == ["hi", "metadata"]
+
+    manager.invalidate(session.key)
+    loaded = manager.get_or_create(session.key)
+    assert [m["content"] for m in loaded.messages] == ["hello", "hi"]
+    assert loaded.last_consolidated == 1
+    assert loaded.updated_at == session.updated_at
+
+
+def test_clear_rewrites_file(manager) -> None:
+    session = Session(key="cli:clear")
+    session.add_message("user", "one")
+    manager.save(session)
+    session.clear()
+    manager.save(session)
+
+    assert [r["_type"] for r in _lines(manager, session.key)] == ["metadata"]
+
+
+def test_external_change_forces_rewrite(manager) -> None:
+    session = Session(key="cli:external")
+    session.add_message("user", "one")
+    manager.save(session)
+    path = manager.store.path(session.key)
+    path.write_text("")
+
+    session.add_message("user", "two")
+    manager.save(session)
+
+    assert [r.get("content") for r in _lines(manager, session.key)] == ["one", "two", None]
+
+
+def test_stale_metadata_is_compacted(manager) -> None:
+    manager.store.compact_min_records = 3
+    session = Session(key="cli:compact")
+    for i in range(5):
+        session.add_message("user", f"m{i}")
+        manager.save(session)
+
+    records = _lines(manager, session.key)
+    assert sum(r.get("_type") == "metadata" for r in records) <= 3
+    assert [r["content"] for r in records if "content" in r] == [f"m{i}" for i in range(5)]
+
+
+def test_torn_tail_is_skipped_and_repaired(manager) -> None:
+    session = Session(key="cli:torn")
+    session.add_message("user", "kept")
+    manager.save(session)
+    path = manager.store.path(session.key)
+    with open(path, "a") as f:
+        f.write('{"role": "assistant", "cont')
+
+    manager.invalidate(session.key)
+    loaded = manager.get_or_create(session.key)
+    assert [m["content"] for m in loaded.messages] == ["kept"]
+
+    loaded.add_message("assistant", "next")
+    manager.save(loaded)
+    assert [r.get("content") for r in _lines(manager, session.key)] == ["kept", "next", None]
+
+
+def test_list_sessions_reads_trailing_metadata(manager) -> None:
+    session = Session(key="cli:list")
+    session.add_message("user", "a")
+    manager.save(session)
+    session.add_message("user", "b")
+    manager.save(session)
+
+    [info] = manager.list_sessions()
+    assert info["updated_at"] == session.updated_at.isoformat()
+
+
+def test_write_behind_batches_and_flushes(tmp_path) -> None:
+    manager = SessionManager(tmp_path, flush_interval_s=60, sessions_dir=tmp_path)
+    session = Session(key="cli:behind")
+    for i in range(3):
+        session.add_message("user", f"m{i}")
+        manager.save(session)
+
+    path = manager.store.path(session.key)
+    assert not path.exists()
+
+    manager.flush()
+    records = _lines(manager, session.key)
+    assert [r.get("content") for r in records] == ["m0", "m1", "m2", None]
+
+    session.add_message("user", "m3")
+    manager.save(session)
+    manager.close()
+    assert [r.get("content") for r in _lines(manager, session.key)][-2:] == ["m3", None]
+    assert manager._writer is None
+
+
+def test_write_behind_writer_thread_flushes(tmp_path) -> None:
+    manager = SessionManager(tmp_path, flush_interval_s=0.01, sessions_dir=tmp_path)
+    session = Session(key="cli:worker")
+    session.add_message("user", "hi")
+    manager.save(session)
+
+    for _ in range(200):
+        if manager.store.path(session.key).exists():
+            break
+        time.sleep(0.01)
+    assert [r.get("content") for r in _lines(manager, session.key)] == ["hi", None]
+    manager.close()
+
+
+async def test_load_sees_pending_save(tmp_path) -> None:
+    manager = SessionManager(tmp_path, flush_interval_s=60, sessions_dir=tmp_path)
+    session = Session(key="cli:pending")
+    session.add_message("user", "unflushed")
+    manager.save(session)
+    manager.invalidate(session.key)
+
+    loaded = await manager.get_or_create_async(session.key)
+    assert [m["content"] for m in loaded.messages] == ["unflushed"]
+    manager.close()
@@ -0,0 +1,254 @@
+import asyncio
+
+from zerobot.agent.scheduler import ConsolidationScheduler, SessionScheduler
+from zerobot.bus.events import InboundMessage
+from zerobot.session.manager import Session
+
+
+def _msg(chat_id: str, content: str) -> InboundMessage:
+    return InboundMessage(channel="test", sender_id="u", chat_id=chat_id, content=content)
+
+
+async def test_same_session_runs_in_order() -> None:
+    seen: list[str] = []
+
+    async def handler(msg: InboundMessage) -> None:
+        await asyncio.sleep(0.01 if msg.content == "a" else 0)
+        seen.append(msg.content)
+
+    scheduler = SessionScheduler(handler, max_concurrency=4)
+    for content in ("a", "b", "c"):
+        scheduler.submit("test:1", _msg("1", content))
+    await scheduler.join()
+
+    assert seen == ["a", "b", "c"]
+
+
+async def test_different_sessions_run_concurrently() -> None:
+    running = 0
+    peak = 0
+
+    async def handler(msg: InboundMessage) -> None:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+
+    scheduler = SessionScheduler(handler, max_concurrency=2)
+    for i in range(4):
+        scheduler.submit(f"test:{i}", _msg(str(i), "hi"))
+    await scheduler.join()
+
+    assert peak == 2
+
+
+async def test_snapshot_reports_queue_depth() -> None:
+    release = asyncio.Event()
+
+    async def handler(msg: InboundMessage) -> None:
+        await release.wait()
+
+    scheduler = SessionScheduler(handler, max_concurrency=1)
+    scheduler.submit("test:1", _msg("1", "a"))
+    scheduler.submit("test:1", _msg("1", "b"))
+    await asyncio.sleep(0)
+
+    snap = scheduler.snapshot()
+    assert snap["active"] == 1
+    assert snap["sessions"]["test:1"]["queued"] == 1
+    assert snap["sessions"]["test:1"]["running"] is True
+
+    release.set()
+    await scheduler.join()
+    snap = scheduler.snapshot()
+    assert snap["processed"] == 2
+    assert snap["sessions"]["test:1"]["queued"] == 0
+    assert snap["sessions"]["test:1"]["processed"] == 2
+
+
+async def test_idle_session_stats_are_bounded() -> None:
+    async def handler(msg: InboundMessage) -> None:
+        pass
+
+    scheduler = SessionScheduler(handler, max_recent_sessions=2)
+    for i in range(4):
+        scheduler.submit(f"test:{i}", _msg(str(i), "hi"))
+        await scheduler.join()
+
+    snap = scheduler.snapshot()
+    assert list(snap["sessions"]) == ["test:2", "test:3"]
+    assert snap["processed"] == 4
+
+
+async def test_handler_errors_do_not_stop_session() -> None:
+    seen: list[str] = []
+
+    async def handler(msg: InboundMessage) -> None:
+        if msg.content == "boom":
+            raise RuntimeError("boom")
+        seen.append(msg.content)
+
+    scheduler = SessionScheduler(handler)
+    scheduler.submit("test:1", _msg("1", "boom"))
+    scheduler.submit("test:1", _msg("1", "ok"))
+    await scheduler.join()
+
+    assert seen == ["ok"]
+
+
+async def test_consolidation_burst_runs_once() -> None:
+    runs: list[tuple[str, bool]] = []
+
+    async def consolidate(session: Session, archive_all: bool) -> None:
+        runs.append((session.key, archive_all))
+
+    consolidator = ConsolidationScheduler(consolidate, debounce_s=0.02)
+    session = Session(key="test:1")
+    for _ in range(10):
+        consolidator.request(session)
+        await asyncio.sleep(0.005)
+    await consolidator.join()
+
+    assert runs == [("test:1", False)]
+    assert consolidator.snapshot()["requested"] == 10
+
+
+async def test_steady_requests_still_consolidate() -> None:
+    runs = 0
+
+    async def consolidate(session: Session, archive_all: bool) -> None:
+        nonlocal runs
+        runs += 1
+
+    consolidator = ConsolidationScheduler(consolidate, debounce_s=0.03, max_delay_s=0.1)
+    session = Session(key="test:1")
+    for _ in range(30):  # A request every 10 ms, never a quiet period of 30 ms
+        consolidator.request(session)
+        await asyncio.sleep(0.01)
+
+    assert runs >= 2
+    await consolidator.shutdown()
+
+
+async def test_consolidation_request_while_running_reruns_once() -> None:
+    started = asyncio.Event()
+    release = asyncio.Event()
+    runs = 0
+
+    async def consolidate(session: Session, archive_all: bool) -> None:
+        nonlocal runs
+        runs += 1
+        started.set()
+        await release.wait()
+
+    consolidator = ConsolidationScheduler(consolidate, debounce_s=0)
+    session = Session(key="test:1")
+    consolidator.request(session)
+    await started.wait()
+    for _ in range(3):
+        consolidator.request(session)
+    assert consolidator.snapshot()["jobs"] == {"test:1": "running"}
+
+    release.set()
+    await consolidator.join()
+    assert runs == 2
+
+
+async def test_consolidation_respects_global_cap() -> None:
+    running = 0
+    peak = 0
+
+    async def consolidate(session: Session, archive_all: bool) -> None:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    consolidator = ConsolidationScheduler(consolidate, max_concurrency=1, debounce_s=0)
+    for i in range(3):
+        consolidator.request(Session(key=f"test:{i}"))
+    consolidator.archive(Session(key="test:0"))
+    await consolidator.join()
+
+    assert peak == 1
+    assert consolidator.runs == 4
+
+
+async def test_capacity_tracks_slots_and_pending() -> None:
+    release = asyncio.Event()
+
+    async def handler(msg: InboundMessage) -> None:
+        await release.wait()
+
+    scheduler = SessionScheduler(handler, max_concurrency=1, max_pending=1)
+    assert scheduler.has_capacity()
+    scheduler.submit("test:1", _msg("1", "a"))
+    await asyncio.sleep(0)
+    assert not scheduler.has_capacity()
+
+    waiter = asyncio.create_task(scheduler.wait_for_capacity())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+    release.set()
+    await asyncio.wait_for(waiter, timeout=1)
+    await scheduler.join()
+
+
+async def test_busy_chat_backlog_does_not_block_other_chats() -> None:
+    release = asyncio.Event()
+    done: list[str] = []
+
+    async def handler(msg: InboundMessage) -> None:
+        if msg.chat_id == "busy":
+            await release.wait()
+        done.append(msg.chat_id)
+
+    scheduler = SessionScheduler(handler, max_concurrency=4)
+    for i in range(8):
+        scheduler.submit("test:busy", _msg("busy", str(i)))
+    await asyncio.sleep(0)
+
+    assert scheduler.pending_count == 7
+    assert scheduler.has_capacity()
+    scheduler.submit("test:quiet", _msg("quiet", "hi"))
+    await asyncio.sleep(0.01)
+    assert done == ["quiet"]
+
+    release.set()
+    await scheduler.join()
+
+
+async def test_cancel_drops_running_consolidation_job() -> None:
+    started = asyncio.Event()
+
+    async def consolidate(session: Session, archive_all: bool) -> None:
+        started.set()
+        await asyncio.sleep(10)
+
+    consolidator = ConsolidationScheduler(consolidate, debounce_s=0)
+    consolidator.request(Session(key="test:1"))
+    await started.wait()
+
+    assert consolidator.cancel("test:1")
+    await consolidator.join()
+    assert consolidator.snapshot()["jobs"] == {}
+    assert not consolidator.cancel("test:1")
+
+
+async def test_on_idle_runs_after_session_drains() -> None:
+    idle: list[tuple[str, bool]] = []
+
+    async def handler(msg: InboundMessage) -> None:
+        await asyncio.sleep(0)
+
+    async def on_idle(key: str) -> None:
+        idle.append((key, scheduler.is_busy(key)))
+
+    scheduler = SessionScheduler(handler, on_idle=on_idle)
+    scheduler.submit("test:1", _msg("1", "a"))
+    assert scheduler.is_busy("test:1")
+    await scheduler.join()
+
+    assert idle == [("test:1", False)]
@@ -0,0 +1,136 @@
+import json
+
+import pytest
+
+from zerobot.agent.memory_index import MemoryIndex
+from zerobot.session.jsonl_store import JsonlSessionStore
+from zerobot.session.manager import Session, SessionManager
+from zerobot.session.sqlite_store import SqliteSessionStore
+from zerobot.session.store import copy_sessions
+
+
+@pytest.fixture
+def store(tmp_path) -> SqliteSessionStore:
+    s = SqliteSessionStore(tmp_path / "sessions.db")
+    yield s
+    s.close()
+
+
+def _manager(tmp_path, store, **kwargs) -> SessionManager:
+    return SessionManager(tmp_path, store=store, **kwargs)
+
+
+def _rows(store: SqliteSessionStore, key: str) -> list[str]:
+    return [m["content"] for m in store.read_all(key)]
+
+
+def test_roundtrip(tmp_path, store) -> None:
+    manager = _manager(tmp_path, store)
+    session = Session(key="cli:db", metadata={"lang": "en"})
+    session.add_message("user", "hello")
+    session.add_message("assistant", "hi")
+    session.last_consolidated = 1
+    manager.save(session)
+
+    loaded = _manager(tmp_path, store).get_or_create("cli:db")
+    assert [m["content"] for m in loaded.messages] == ["hello", "hi"]
+    assert loaded.metadata == {"lang": "en"}
+    assert loaded.last_consolidated == 1
+    assert loaded.updated_at == session.updated_at
+
+
+def test_appends_then_rewrites_after_clear(tmp_path, store) -> None:
+    manager = _manager(tmp_path, store)
+    session = Session(key="cli:gen")
+    session.add_message("user", "one")
+    manager.save(session)
+    session.add_message("user", "two")
+    manager.save(session)
+    [(_, count, generation)] = store.versions()
+    assert (count, generation) == (2, 0)
+
+    session.clear()
+    session.add_message("user", "three")
+    manager.save(session)
+    assert _rows(store, "cli:gen") == ["three"]
+    assert store.versions()[0][1:] == (1, 1)
+
+
+def test_lazy_tail_and_older_reads(tmp_path, store) -> None:
+    manager = _manager(tmp_path, store)
+    session = Session(key="cli:long")
+    for i in range(300):
+        session.add_message("user", f"m{i}")
+    session.last_consolidated = 300
+    manager.save(session)
+
+    loaded = _manager(tmp_path, store, tail_messages=50).get_or_create("cli:long")
+    assert len(loaded.messages) == 300
+    assert loaded.messages.loaded == 50
+    assert loaded.messages[0]["content"] == "m0"
+    assert [m["content"] for m in loaded.messages.read(100, 102)] == ["m100", "m101"]
+
+
+def test_list_sessions_by_recency(tmp_path, store) -> None:
+    manager = _manager(tmp_path, store)
+    for key in ("a:1", "b:2"):
+        session = Session(key=key)
+        session.add_message("user", key)
+        manager.save(session)
+
+    assert [info["key"] for info in manager.list_sessions()] == ["b:2", "a:1"]
+
+
+def test_write_behind_batch_is_one_transaction(tmp_path, store) -> None:
+    manager = _manager(tmp_path, store, flush_interval_s=60)
+    for i in range(3):
+        session = Session(key=f"cli:{i}")
+        session.add_message("user", f"m{i}")
+        manager.save(session)
+    assert store.list_sessions() == []
+
+    manager.close()
+    assert sorted(info["key"] for info in store.list_sessions()) == ["cli:0", "cli:1", "cli:2"]
+
+
+def test_copy_sessions_from_jsonl(tmp_path, store) -> None:
+    jsonl = SessionManager(tmp_path, sessions_dir=tmp_path / "jsonl")
+    session = Session(key="telegram:42", metadata={"x": 1})
+    session.add_message("user", "old")
+    session.add_message("assistant", "reply")
+    session.last_consolidated = 1
+    jsonl.save(session)
+    # A file written before keys were recorded in the metadata
+    legacy = tmp_path / "jsonl" / "cli_direct.jsonl"
+    legacy.write_text(
+        json.dumps({"_type": "metadata", "created_at": "2026-01-01T00:00:00", "updated_at": "2026-01-01T00:00:00"})
+        + "\n" + json.dumps({"role": "user", "content": "legacy"}) + "\n"
+    )
+
+    counts = copy_sessions(JsonlSessionStore(tmp_path / "jsonl"), store)
+    assert counts == {"sessions": 2, "messages": 3, "skipped": 0, "failed": 0}
+    loaded = _manager(tmp_path, store).get_or_create("telegram:42")
+    assert [m["content"] for m in loaded.messages] == ["old", "reply"]
+    assert (loaded.metadata, loaded.last_consolidated) == ({"x": 1}, 1)
+    assert _rows(store, "cli:direct") == ["legacy"]
+
+    again = copy_sessions(JsonlSessionStore(tmp_path / "jsonl"), store)
+    assert again["skipped"] == 2
+    assert copy_sessions(JsonlSessionStore(tmp_path / "jsonl"), store, overwrite=True)["sessions"] == 2
+    assert _rows(store, "telegram:42") == ["old", "reply"]
+
+
+def test_memory_index_reads_session_db(tmp_path, store) -> None:
+    manager = _manager(tmp_path, store)
+    session = Session(key="cli:search")
+    session.add_message("user", "the quokka is a small marsupial")
+    manager.save(session)
+
+    index = MemoryIndex(tmp_path, session_db=store)
+    [hit] = index.search("quokka")
+    assert hit.ref == "cli:search"
+
+    session.clear()
+    session.add_message("user", "nothing to see")
+    manager.save(session)
+    assert index.search("quokka") == []
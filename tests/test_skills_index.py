@@ -0,0 +1,96 @@
+import os
+import shutil
+from pathlib import Path
+
+from zerobot.agent.skills import SkillsLoader
+
+
+def _write_skill(root: Path, name: str, body: str) -> Path:
+    path = root / name / "SKILL.md"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(body, encoding="utf-8")
+    return path
+
+
+SKILL = """---
+name: weather
+description: Check the weather
+metadata: {"zerobot": {"always": true, "requires": {"bins": ["definitely-missing-bin"]}}}
+---
+
+Use curl.
+"""
+
+
+def _loader(tmp_path: Path) -> SkillsLoader:
+    builtin = tmp_path / "builtin"
+    builtin.mkdir()
+    return SkillsLoader(tmp_path / "ws", builtin_skills_dir=builtin, rescan_interval_s=0)
+
+
+def test_skills_are_parsed_once(tmp_path, monkeypatch) -> None:
+    loader = _loader(tmp_path)
+    _write_skill(loader.workspace_skills, "weather", SKILL)
+    _write_skill(loader.workspace_skills, "notes", "---\ndescription: Take notes\n---\nbody")
+
+    parsed: list[str] = []
+    original = loader._parse_entry
+
+    def counting(name, *args):
+        parsed.append(name)
+        return original(name, *args)
+
+    monkeypatch.setattr(loader, "_parse_entry", counting)
+    which_calls = 0
+    real_which = shutil.which
+
+    def counting_which(name):
+        nonlocal which_calls
+        which_calls += 1
+        return real_which(name)
+
+    monkeypatch.setattr(shutil, "which", counting_which)
+
+    for _ in range(3):
+        summary = loader.build_skills_summary()
+        loader.get_always_skills()
+        loader.list_skills()
+
+    assert sorted(parsed) == ["notes", "weather"]
+    assert which_calls == 1
+    assert "<requires>CLI: definitely-missing-bin</requires>" in summary
+    assert loader.get_always_skills() == []
+    assert [s["name"] for s in loader.list_skills()] == ["notes"]
+
+
+def test_edited_skill_is_reparsed(tmp_path) -> None:
+    loader = _loader(tmp_path)
+    path = _write_skill(loader.workspace_skills, "notes", "---\ndescription: Take notes\n---\nbody")
+    version = loader.refresh()
+    assert "Take notes" in loader.build_skills_summary()
+
+    path.write_text("---\ndescription: Write things down\n---\nbody", encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert loader.refresh() != version
+    assert "Write things down" in loader.build_skills_summary()
+
+
+def test_workspace_skill_overrides_builtin(tmp_path) -> None:
+    loader = _loader(tmp_path)
+    _write_skill(loader.builtin_skills, "notes", "builtin")
+    _write_skill(loader.workspace_skills, "notes", "workspace")
+
+    assert loader.load_skill("notes") == "workspace"
+    assert loader.list_skills() == [
+        {"name": "notes", "path": str(loader.workspace_skills / "notes" / "SKILL.md"), "source": "workspace"}
+    ]
+
+
+def test_new_skill_is_found_before_rescan_interval(tmp_path) -> None:
+    loader = SkillsLoader(tmp_path / "ws", builtin_skills_dir=tmp_path / "none", rescan_interval_s=3600)
+    loader.refresh()
+    _write_skill(loader.workspace_skills, "late", "hello")
+
+    assert loader.load_skill("late") == "hello"
@@ -0,0 +1,53 @@
+from typing import Any
+
+from zerobot.agent.streaming import StreamRelay
+from zerobot.bus.events import OutboundMessage
+from zerobot.providers.base import LLMProvider, LLMResponse
+
+
+class StaticProvider(LLMProvider):
+    async def chat(self, messages: list[dict[str, Any]], tools=None, model=None,
+                   max_tokens: int = 4096, temperature: float = 0.7) -> LLMResponse:
+        return LLMResponse(content="hello")
+
+    def get_default_model(self) -> str:
+        return "static"
+
+
+async def test_default_chat_stream_falls_back_to_chat() -> None:
+    chunks = [c async for c in StaticProvider().chat_stream(messages=[])]
+
+    assert [c.content for c in chunks] == ["hello", ""]
+    assert chunks[-1].response is not None
+    assert chunks[-1].response.content == "hello"
+
+
+async def test_relay_publishes_full_text_and_throttles() -> None:
+    sent: list[OutboundMessage] = []
+
+    async def publish(msg: OutboundMessage) -> None:
+        sent.append(msg)
+
+    relay = StreamRelay(publish, channel="telegram", chat_id="1", interval_s=60)
+    await relay.push("Hel")
+    await relay.push("lo")
+
+    assert len(sent) == 1
+    assert sent[0].partial is True
+    assert sent[0].content == "Hel"
+    assert sent[0].stream_id == relay.stream_id
+    assert relay.started
+
+
+async def test_relay_begin_resets_text() -> None:
+    sent: list[OutboundMessage] = []
+
+    async def publish(msg: OutboundMessage) -> None:
+        sent.append(msg)
+
+    relay = StreamRelay(publish, channel="telegram", chat_id="1", interval_s=0)
+    await relay.push("Searching")
+    relay.begin()
+    await relay.push("Answer")
+
+    assert [m.content for m in sent] == ["Searching", "Answer"]
@@ -0,0 +1,88 @@
+import asyncio
+from typing import Any
+
+from zerobot.agent.tools.base import Tool
+from zerobot.agent.tools.filesystem import ReadFileTool, WriteFileTool
+from zerobot.agent.tools.registry import ToolRegistry
+
+
+class SleepTool(Tool):
+    """Read-only tool that records start/finish order."""
+
+    def __init__(self, name: str, log: list[str], read_only: bool = True):
+        self._name = name
+        self._log = log
+        self._read_only = read_only
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def description(self) -> str:
+        return "sleep"
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {"type": "object", "properties": {"delay": {"type": "number"}}}
+
+    @property
+    def read_only(self) -> bool:
+        return self._read_only
+
+    async def execute(self, delay: float = 0.0, **kwargs: Any) -> str:
+        self._log.append(f"start:{self._name}")
+        await asyncio.sleep(delay)
+        self._log.append(f"end:{self._name}")
+        return f"{self._name}:{delay}"
+
+
+async def test_read_only_calls_run_in_parallel_and_keep_order() -> None:
+    log: list[str] = []
+    reg = ToolRegistry()
+    reg.register(SleepTool("fetch", log))
+
+    calls = [("fetch", {"delay": 0.05}), ("fetch", {"delay": 0.0}), ("fetch", {"delay": 0.02})]
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    results = await reg.execute_many(calls)
+    elapsed = loop.time() - started
+
+    assert results == ["fetch:0.05", "fetch:0.0", "fetch:0.02"]
+    assert elapsed < 0.07
+
+
+async def test_mutating_tool_without_key_is_a_barrier() -> None:
+    log: list[str] = []
+    reg = ToolRegistry()
+    reg.register(SleepTool("fetch", log))
+    reg.register(SleepTool("exec", log, read_only=False))
+
+    await reg.execute_many([("fetch", {"delay": 0.01}), ("exec", {}), ("fetch", {})])
+
+    assert log == ["start:fetch", "end:fetch", "start:exec", "end:exec", "start:fetch", "end:fetch"]
+
+
+def test_same_path_write_conflicts_with_read(tmp_path) -> None:
+    reg = ToolRegistry()
+    reg.register(ReadFileTool())
+    reg.register(WriteFileTool())
+    a, b = str(tmp_path / "a.txt"), str(tmp_path / "b.txt")
+
+    batches = reg._plan_batches([
+        ("read_file", {"path": a}),
+        ("read_file", {"path": b}),
+        ("write_file", {"path": b, "content": "x"}),
+        ("write_file", {"path": a, "content": "y"}),
+    ])
+
+    assert batches == [[0, 1], [2, 3]]
+
+
+def test_unknown_tool_runs_alone() -> None:
+    reg = ToolRegistry()
+    reg.register(ReadFileTool())
+
+    batches = reg._plan_batches([("read_file", {"path": "x"}), ("nope", {}), ("read_file", {"path": "y"})])
+
+    assert batches == [[0], [1], [2]]
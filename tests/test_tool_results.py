@@ -0,0 +1,51 @@
+from zerobot.agent.tools.results import ReadToolResultTool, ToolResultStore
+
+
+def test_short_results_pass_through() -> None:
+    store = ToolResultStore(inline_chars=100, stale_chars=20)
+
+    assert store.add("c1", "ok") == "ok"
+    messages = [{"role": "tool", "tool_call_id": "c1", "content": "ok"}]
+    assert store.compact(messages) == 0
+
+
+def test_large_result_is_excerpted_and_pageable() -> None:
+    store = ToolResultStore(inline_chars=100, stale_chars=20)
+    full = "".join(f"{i:04d}" for i in range(100))  # 400 chars
+
+    excerpt = store.add("c1", full)
+
+    assert excerpt.startswith(full[:100])
+    assert 'handle "result-1"' in excerpt
+    assert "offset=100" in excerpt
+    assert store.read("result-1", offset=100, length=50).startswith(full[100:150])
+    assert store.read("result-1", offset=350) == full[350:]
+    assert store.read("result-9").startswith("Error")
+
+
+def test_compact_shrinks_seen_results_once() -> None:
+    store = ToolResultStore(inline_chars=500, stale_chars=20)
+    full = "x" * 400
+    messages = [
+        {"role": "user", "content": "hi"},
+        {"role": "tool", "tool_call_id": "c1", "name": "read_file", "content": store.add("c1", full)},
+    ]
+
+    saved = store.compact(messages)
+
+    assert saved > 0
+    assert messages[1]["content"].startswith("x" * 20)
+    assert "result-1" in messages[1]["content"]
+    assert messages[1]["name"] == "read_file"
+    assert store.compact(messages) == 0
+
+
+async def test_reader_uses_store_of_current_task() -> None:
+    tool = ReadToolResultTool()
+    assert (await tool.execute(handle="result-1")).startswith("Error")
+
+    store = ToolResultStore(inline_chars=10, stale_chars=5)
+    store.add("c1", "abcdefghijklmnop")
+    tool.set_store(store)
+
+    assert (await tool.execute(handle="result-1", offset=10)) == "klmnop"
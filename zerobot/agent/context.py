@@ -3,11 +3,29 @@
 import base64
 import mimetypes
 import platform
+import time
+from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from zerobot.agent.memory import MemoryStore
 from zerobot.agent.skills import SkillsLoader
+from zerobot.utils.helpers import file_signature
+
+
+@dataclass
+class ContextBudget:
+    """Token budget for a single LLM request."""
+    window: int  # Model input context size
+    max_output: int  # Reserved for the reply
+    tool_reserve: int = 8000  # Reserved for tool calls/results produced during the turn
+    max_history: int = 16000  # Cap on history even when the window allows more
+    
+    def history_tokens(self, fixed: int) -> int:
+        """Tokens left for history once the fixed parts (system prompt, tools, message) are counted."""
+        free = self.window - self.max_output - self.tool_reserve - fixed
+        return max(0, min(self.max_history, free))
 
 
 class ContextBuilder:
@@ -16,41 +34,101 @@ class ContextBuilder:
     
     Assembles bootstrap files, memory, skills, and conversation history
     into a coherent prompt for the LLM.
+
+    The system prompt is split into a stable prefix (identity, bootstrap
+    files, memory, skills) and a small volatile suffix (current time and
+    session). Prefix sections are cached and only rebuilt when the files
+    they come from change (mtime/size), so the prefix stays byte-identical
+    across turns.
+
+    With prompt_caching enabled the volatile suffix is moved out of the
+    system prompt into the current user message, so the system prompt and
+    all earlier history form a stable prefix that providers can cache.
     """
     
     BOOTSTRAP_FILES = ["AGENTS.md", "SOUL.md", "USER.md", "TOOLS.md", "IDENTITY.md"]
     
-    def __init__(self, workspace: Path):
+    def __init__(
+        self,
+        workspace: Path,
+        skills: SkillsLoader | None = None,
+        prompt_caching: bool = False,
+        memory_inline_tokens: int = 2000,
+        memory_top_k: int = 12,
+    ):
         self.workspace = workspace
-        self.memory = MemoryStore(workspace)
-        self.skills = SkillsLoader(workspace)
+        self.prompt_caching = prompt_caching
+        self.memory = MemoryStore(workspace, inline_tokens=memory_inline_tokens, top_k=memory_top_k)
+        self.skills = skills or SkillsLoader(workspace)
+        self._identity = self._get_identity()
+        self._sections: dict[str, tuple[Any, str]] = {}  # section -> (signature, content)
     
     def build_system_prompt(self, skill_names: list[str] | None = None) -> str:
         """
-        Build the system prompt from bootstrap files, memory, and skills.
+        Build the stable part of the system prompt from bootstrap files, memory, and skills.
+
+        Volatile details (time, session) are not included; see build_runtime_context().
         
         Args:
             skill_names: Optional list of skills to include.
         
         Returns:
-            Complete system prompt.
+            System prompt prefix.
         """
-        parts = []
-        
-        # Core identity
-        parts.append(self._get_identity())
+        parts = [self._identity]
         
         # Bootstrap files
-        bootstrap = self._load_bootstrap_files()
+        bootstrap = self._cached_section(
+            "bootstrap",
+            tuple(file_signature(self.workspace / f) for f in self.BOOTSTRAP_FILES),
+            self._load_bootstrap_files,
+        )
         if bootstrap:
             parts.append(bootstrap)
         
         # Memory context
-        memory = self.memory.get_memory_context()
+        memory = self._cached_section(
+            "memory", file_signature(self.memory.memory_file), self.memory.get_memory_context
+        )
         if memory:
             parts.append(f"# Memory\n\n{memory}")
         
         # Skills - progressive loading
+        skills = self._cached_section("skills", self.skills.refresh(), self._build_skills_section)
+        if skills:
+            parts.append(skills)
+        
+        return "\n\n---\n\n".join(parts)
+    
+    def build_runtime_context(
+        self,
+        channel: str | None = None,
+        chat_id: str | None = None,
+        query: str | None = None,
+    ) -> str:
+        """Build the volatile suffix of the system prompt (time, session, memory relevant to `query`)."""
+        now = datetime.now().strftime("%Y-%m-%d %H:%M (%A)")
+        tz = time.strftime("%Z") or "UTC"
+        context = f"## Current Time\n{now} ({tz})"
+        if channel and chat_id:
+            context += f"\n\n## Current Session\nChannel: {channel}\nChat ID: {chat_id}"
+        if query and (memory := self.memory.get_relevant_context(query)):
+            context += f"\n\n{memory}"
+        return context
+    
+    def _cached_section(self, key: str, signature: Any, build: Callable[[], str]) -> str:
+        """Return a cached prompt section, rebuilding it when its signature changes."""
+        cached = self._sections.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        content = build()
+        self._sections[key] = (signature, content)
+        return content
+    
+    def _build_skills_section(self) -> str:
+        """Build the always-loaded skills and skills summary sections."""
+        parts = []
+        
         # 1. Always-loaded skills: include full content
         always_skills = self.skills.get_always_skills()
         if always_skills:
@@ -72,10 +150,6 @@ Skills with available="false" need dependencies installed first - you can try in
     
     def _get_identity(self) -> str:
         """Get the core identity section."""
-        from datetime import datetime
-        import time as _time
-        now = datetime.now().strftime("%Y-%m-%d %H:%M (%A)")
-        tz = _time.strftime("%Z") or "UTC"
         workspace_path = str(self.workspace.expanduser().resolve())
         system = platform.system()
         runtime = f"{'macOS' if system == 'Darwin' else system} {platform.machine()}, Python {platform.python_version()}"
@@ -89,16 +163,13 @@ You are zerobot, a helpful AI assistant. You have access to tools that allow you
 - Send messages to users on chat channels
 - Spawn subagents for complex background tasks
 
-## Current Time
-{now} ({tz})
-
 ## Runtime
 {runtime}
 
 ## Workspace
 Your workspace is at: {workspace_path}
 - Long-term memory: {workspace_path}/memory/MEMORY.md
-- History log: {workspace_path}/memory/HISTORY.md (grep-searchable)
+- History log: {workspace_path}/memory/HISTORY.md (searchable with memory_search)
 - Custom skills: {workspace_path}/skills/{{skill-name}}/SKILL.md
 
 IMPORTANT: When responding to direct questions or conversations, reply directly with your text response.
@@ -107,7 +178,7 @@ For normal conversation, just respond with text - do not call the message tool.
 
 Always be helpful, accurate, and concise. When using tools, think step by step: what you know, what you need, and why you chose this tool.
 When remembering something important, write to {workspace_path}/memory/MEMORY.md
-To recall past events, grep {workspace_path}/memory/HISTORY.md"""
+To recall past events or earlier conversations, use the memory_search tool"""
     
     def _load_bootstrap_files(self) -> str:
         """Load all bootstrap files from workspace."""
@@ -146,10 +217,13 @@ To recall past events, grep {workspace_path}/memory/HISTORY.md"""
         """
         messages = []
 
-        # System prompt
+        # System prompt: stable prefix first, volatile details last
         system_prompt = self.build_system_prompt(skill_names)
-        if channel and chat_id:
-            system_prompt += f"\n\n## Current Session\nChannel: {channel}\nChat ID: {chat_id}"
+        runtime = self.build_runtime_context(channel, chat_id, query=current_message)
+        if self.prompt_caching:
+            current_message = f"{runtime}\n\n---\n\n{current_message}"
+        else:
+            system_prompt += "\n\n---\n\n" + runtime
         messages.append({"role": "system", "content": system_prompt})
 
         # History
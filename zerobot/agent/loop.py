@@ -11,8 +11,9 @@ from loguru import logger
 
 from zerobot.bus.events import InboundMessage, OutboundMessage
 from zerobot.bus.queue import MessageBus
-from zerobot.providers.base import LLMProvider
-from zerobot.agent.context import ContextBuilder
+from zerobot.providers.base import LLMProvider, LLMResponse
+from zerobot.providers.rate_limit import llm_priority
+from zerobot.agent.context import ContextBudget, ContextBuilder
 from zerobot.agent.tools.registry import ToolRegistry
 from zerobot.agent.tools.filesystem import ReadFileTool, WriteFileTool, EditFileTool, ListDirTool
 from zerobot.agent.tools.shell import ExecTool
@@ -21,9 +22,17 @@ from zerobot.agent.tools.message import MessageTool
 from zerobot.agent.tools.spawn import SpawnTool
 from zerobot.agent.tools.cron import CronTool
 from zerobot.agent.tools.universe import UniverseHelpTool
-from zerobot.agent.memory import MemoryStore
+from zerobot.agent.tools.results import ReadToolResultTool, ToolResultStore
+from zerobot.agent.tools.memory import MemorySearchTool
+from zerobot.agent.memory_index import MemoryIndex
+from zerobot.agent.router import ModelRouter, Route
+from zerobot.agent.scheduler import ConsolidationScheduler, SessionScheduler
+from zerobot.agent.streaming import StreamRelay
 from zerobot.agent.subagent import SubagentManager
+from zerobot.session.log import take
 from zerobot.session.manager import Session, SessionManager
+from zerobot.session.sqlite_store import SqliteSessionStore
+from zerobot.utils.helpers import estimate_tokens
 
 
 class AgentLoop:
@@ -48,6 +57,24 @@ class AgentLoop:
         temperature: float = 0.7,
         max_tokens: int = 4096,
         memory_window: int = 50,
+        consolidation_model: str | None = None,
+        router_model: str | None = None,
+        router_chat_max_chars: int = 280,
+        consolidation_debounce_s: float = 5.0,
+        consolidation_max_delay_s: float = 60.0,
+        max_concurrent_consolidations: int = 1,
+        context_window_tokens: int = 0,
+        max_history_tokens: int = 16000,
+        tool_reserve_tokens: int = 8000,
+        max_concurrent_turns: int = 4,
+        max_parallel_tools: int = 4,
+        tool_result_inline_chars: int = 6000,
+        tool_result_stale_chars: int = 600,
+        stream_responses: bool = True,
+        stream_interval_s: float = 1.0,
+        prompt_caching: bool = True,
+        memory_inline_tokens: int = 2000,
+        memory_top_k: int = 12,
         brave_api_key: str | None = None,
         exec_config: "ExecToolConfig | None" = None,
         cron_service: "CronService | None" = None,
@@ -67,13 +94,31 @@ class AgentLoop:
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.memory_window = memory_window
+        self.consolidation_model = consolidation_model
+        self.router = ModelRouter(self.model, router_model, chat_max_chars=router_chat_max_chars)
+        self.max_parallel_tools = max_parallel_tools
+        self.tool_result_inline_chars = tool_result_inline_chars
+        self.tool_result_stale_chars = tool_result_stale_chars
+        self.stream_responses = stream_responses
+        self.stream_interval_s = stream_interval_s
         self.brave_api_key = brave_api_key
         self.exec_config = exec_config or ExecToolConfig()
         self.cron_service = cron_service
         self.restrict_to_workspace = restrict_to_workspace
         self.universe_config = universe_config or UniverseConfig()
 
-        self.context = ContextBuilder(workspace)
+        self.context = ContextBuilder(
+            workspace,
+            prompt_caching=prompt_caching,
+            memory_inline_tokens=memory_inline_tokens,
+            memory_top_k=memory_top_k,
+        )
+        self.context_budget = ContextBudget(
+            window=context_window_tokens or provider.get_context_window(self.model) or 32768,
+            max_output=max_tokens,
+            tool_reserve=tool_reserve_tokens,
+            max_history=max_history_tokens,
+        )
         self.sessions = session_manager or SessionManager(workspace)
         self.tools = ToolRegistry()
         self.subagents = SubagentManager(
@@ -83,11 +128,27 @@ class AgentLoop:
             model=self.model,
             temperature=self.temperature,
             max_tokens=self.max_tokens,
+            max_parallel_tools=max_parallel_tools,
             brave_api_key=brave_api_key,
             exec_config=self.exec_config,
             restrict_to_workspace=restrict_to_workspace,
+            skills=self.context.skills,
+            tool_result_inline_chars=tool_result_inline_chars,
+            tool_result_stale_chars=tool_result_stale_chars,
         )
         
+        self.scheduler = SessionScheduler(
+            self._handle_inbound,
+            max_concurrency=max_concurrent_turns,
+            on_idle=lambda key: self.bus.notify_inbound(),
+        )
+        self.consolidator = ConsolidationScheduler(
+            self._run_consolidation,
+            max_concurrency=max_concurrent_consolidations,
+            debounce_s=consolidation_debounce_s,
+            max_delay_s=consolidation_max_delay_s,
+        )
+
         self._running = False
         self._mcp_servers = mcp_servers or {}
         self._mcp_stack: AsyncExitStack | None = None
@@ -128,6 +189,18 @@ class AgentLoop:
 
         # Universe delegation (public network)
         self.tools.register(UniverseHelpTool())
+
+        # Paging through long tool results kept out of the transcript
+        self.tools.register(ReadToolResultTool())
+
+        # Indexed search over HISTORY.md and past sessions
+        store = self.sessions.store
+        index = MemoryIndex(
+            self.workspace,
+            self.sessions.sessions_dir,
+            session_db=store if isinstance(store, SqliteSessionStore) else None,
+        )
+        self.tools.register(MemorySearchTool(index))
     
     async def _connect_mcp(self) -> None:
         """Connect to configured MCP servers (one-time, lazy)."""
@@ -153,15 +226,74 @@ class AgentLoop:
             if isinstance(cron_tool, CronTool):
                 cron_tool.set_context(channel, chat_id)
 
-    async def _run_agent_loop(self, initial_messages: list[dict]) -> tuple[str | None, list[str], list[str]]:
+    async def _chat(
+        self, messages: list[dict], stream: StreamRelay | None = None, model: str | None = None
+    ) -> LLMResponse:
+        """Call the LLM, relaying streamed text to the channel when a relay is given."""
+        if stream is None:
+            return await self.provider.chat(
+                messages=messages,
+                tools=self.tools.get_definitions(),
+                model=model or self.model,
+                temperature=self.temperature,
+                max_tokens=self.max_tokens,
+            )
+
+        stream.begin()
+        response: LLMResponse | None = None
+        async for chunk in self.provider.chat_stream(
+            messages=messages,
+            tools=self.tools.get_definitions(),
+            model=model or self.model,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+        ):
+            if chunk.content:
+                await stream.push(chunk.content)
+            if chunk.response is not None:
+                response = chunk.response
+        return response or LLMResponse(content=None)
+
+    def _history_budget(self, current_message: str) -> int:
+        """Tokens available for history in a request carrying this message."""
+        fixed = (
+            estimate_tokens(self.context.build_system_prompt())
+            + estimate_tokens(json.dumps(self.tools.get_definitions(), ensure_ascii=False))
+            + estimate_tokens(current_message)
+        )
+        return self.context_budget.history_tokens(fixed)
+
+    @staticmethod
+    def _log_usage(usage: dict[str, int]) -> None:
+        """Log token usage, including prompt-cache hits when the provider reports them."""
+        if not usage:
+            return
+        prompt = usage.get("prompt_tokens") or 0
+        cached = usage.get("cached_tokens", 0)
+        ratio = f" ({cached / prompt:.0%} cached)" if prompt and cached else ""
+        logger.debug(
+            f"LLM usage: prompt={prompt}{ratio}, completion={usage.get('completion_tokens', 0)}, "
+            f"cache_write={usage.get('cache_creation_tokens', 0)}"
+        )
+
+    async def _run_agent_loop(
+        self,
+        initial_messages: list[dict],
+        stream: StreamRelay | None = None,
+        route: Route | None = None,
+    ) -> tuple[str | None, list[str], list[str]]:
         """
         Run the agent iteration loop.
 
         Args:
             initial_messages: Starting messages for the LLM conversation.
+            stream: Optional relay that publishes partial text while the LLM responds.
+            route: Model routing for the turn (default: the main model). A turn
+                started on the small model moves to the main model as soon as
+                the small model's answer is unusable, e.g. because it needs tools.
 
         Returns:
-            Tuple of (final_content, list_of_tools_used).
+            Tuple of (final_content, list_of_tools_used, tool_errors).
         """
         messages = initial_messages
         iteration = 0
@@ -169,18 +301,29 @@ class AgentLoop:
         tools_used: list[str] = []
         tool_errors: list[str] = []
 
+        results_store = ToolResultStore(
+            inline_chars=self.tool_result_inline_chars,
+            stale_chars=self.tool_result_stale_chars,
+        )
+        if isinstance(reader := self.tools.get("read_tool_result"), ReadToolResultTool):
+            reader.set_store(results_store)
+
+        route = route or Route("turn", self.model, "default")
         while iteration < self.max_iterations:
             iteration += 1
 
-            response = await self.provider.chat(
-                messages=messages,
-                tools=self.tools.get_definitions(),
-                model=self.model,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-            )
+            # A small-model answer may still be rejected, so it isn't streamed
+            response = await self._chat(messages, None if route.small else stream, route.model)
+            if route.small and (problem := self.router.check_turn(response)):
+                route = self.router.escalate(route, response.usage, problem)
+                response = await self._chat(messages, stream, route.model)
+            self.router.record(route, response.usage)
+            self._log_usage(response.usage)
 
             if response.has_tool_calls:
+                # The model has now seen earlier results in full; keep only excerpts
+                if saved := results_store.compact(messages):
+                    logger.debug(f"Compacted earlier tool results: {saved} characters")
                 tool_call_dicts = [
                     {
                         "id": tc.id,
@@ -201,15 +344,18 @@ class AgentLoop:
                     tools_used.append(tool_call.name)
                     args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
                     logger.info(f"Tool call: {tool_call.name}({args_str[:200]})")
-                    result = await self.tools.execute(tool_call.name, tool_call.arguments)
+                results = await self.tools.execute_many(
+                    [(tc.name, tc.arguments) for tc in response.tool_calls],
+                    max_concurrency=self.max_parallel_tools,
+                )
+                for tool_call, result in zip(response.tool_calls, results):
                     if isinstance(result, str) and result.startswith("Error:"):
                         # Keep a small sample for auto-delegation heuristics.
                         if len(tool_errors) < 3:
                             tool_errors.append(result[:200])
                     messages = self.context.add_tool_result(
-                        messages, tool_call.id, tool_call.name, result
+                        messages, tool_call.id, tool_call.name, results_store.add(tool_call.id, result)
                     )
-                messages.append({"role": "user", "content": "Reflect on the results and decide next steps."})
             else:
                 final_content = response.content
                 break
@@ -217,30 +363,65 @@ class AgentLoop:
         return final_content, tools_used, tool_errors
 
     async def run(self) -> None:
-        """Run the agent loop, processing messages from the bus."""
+        """Run the agent loop, dispatching messages from the bus to per-session workers."""
         self._running = True
         await self._connect_mcp()
-        logger.info("Agent loop started")
+        logger.info(f"Agent loop started (max concurrent turns: {self.scheduler.max_concurrency})")
 
-        while self._running:
-            try:
-                msg = await asyncio.wait_for(
-                    self.bus.consume_inbound(),
-                    timeout=1.0
-                )
+        try:
+            while self._running:
                 try:
-                    response = await self._process_message(msg)
-                    if response:
-                        await self.bus.publish_outbound(response)
-                except Exception as e:
-                    logger.error(f"Error processing message: {e}")
-                    await self.bus.publish_outbound(OutboundMessage(
-                        channel=msg.channel,
-                        chat_id=msg.chat_id,
-                        content=f"Sorry, I encountered an error: {str(e)}"
-                    ))
-            except asyncio.TimeoutError:
-                continue
+                    # Leave the backlog on the bus, where it is prioritized and bounded;
+                    # a chat's next message waits there until its current turn is done
+                    await asyncio.wait_for(self.scheduler.wait_for_capacity(), timeout=1.0)
+                    msg = await asyncio.wait_for(
+                        self.bus.consume_inbound(ready=self._is_dispatchable),
+                        timeout=1.0
+                    )
+                except asyncio.TimeoutError:
+                    continue
+                self.scheduler.submit(self._get_turn_key(msg), msg)
+        finally:
+            await self.scheduler.shutdown()
+            await self.consolidator.shutdown()
+            await asyncio.to_thread(self.sessions.close)
+            self.router.log_summary()
+
+    def _is_dispatchable(self, msg: InboundMessage) -> bool:
+        """Whether a message's session has no turn running or queued."""
+        return not self.scheduler.is_busy(self._get_turn_key(msg))
+
+    @staticmethod
+    def _get_turn_key(msg: InboundMessage) -> str:
+        """Get the session key a message's turn is ordered under."""
+        # System messages carry the origin session as "channel:chat_id"
+        if msg.channel == "system" and ":" in msg.chat_id:
+            return msg.chat_id
+        return msg.session_key
+
+    async def _handle_inbound(self, msg: InboundMessage) -> None:
+        """Process one inbound message and publish the response."""
+        stream = None
+        if self.stream_responses and msg.channel != "system":
+            stream = StreamRelay(
+                self.bus.publish_outbound,
+                channel=msg.channel,
+                chat_id=msg.chat_id,
+                metadata=msg.metadata,
+                interval_s=self.stream_interval_s,
+            )
+        try:
+            response = await self._process_message(msg, stream=stream)
+            if response:
+                await self.bus.publish_outbound(response)
+        except Exception as e:
+            logger.error(f"Error processing message: {e}")
+            await self.bus.publish_outbound(OutboundMessage(
+                channel=msg.channel,
+                chat_id=msg.chat_id,
+                content=f"Sorry, I encountered an error: {str(e)}",
+                stream_id=stream.stream_id if stream and stream.started else None,
+            ))
     
     async def close_mcp(self) -> None:
         """Close MCP connections."""
@@ -256,13 +437,19 @@ class AgentLoop:
         self._running = False
         logger.info("Agent loop stopping")
     
-    async def _process_message(self, msg: InboundMessage, session_key: str | None = None) -> OutboundMessage | None:
+    async def _process_message(
+        self,
+        msg: InboundMessage,
+        session_key: str | None = None,
+        stream: StreamRelay | None = None,
+    ) -> OutboundMessage | None:
         """
         Process a single inbound message.
         
         Args:
             msg: The inbound message to process.
             session_key: Override session key (used by process_direct).
+            stream: Optional relay for streaming partial text to the channel.
         
         Returns:
             The response message, or None if no response needed.
@@ -275,41 +462,43 @@ class AgentLoop:
         logger.info(f"Processing message from {msg.channel}:{msg.sender_id}: {preview}")
         
         key = session_key or msg.session_key
-        session = self.sessions.get_or_create(key)
+        session = await self.sessions.get_or_create_async(key)
         
         # Handle slash commands
         cmd = msg.content.strip().lower()
         if cmd == "/new":
-            # Capture messages before clearing (avoid race condition with background task)
-            messages_to_archive = session.messages.copy()
+            # Capture messages before clearing (avoid race condition with background task).
+            # Already consolidated ones are in HISTORY.md and need not be loaded again.
+            messages_to_archive = await asyncio.to_thread(
+                take, session.messages, session.last_consolidated, len(session.messages)
+            )
+            # A pending pass over the old messages is superseded by the archive below
+            self.consolidator.cancel(session.key)
             session.clear()
             self.sessions.save(session)
             self.sessions.invalidate(session.key)
 
-            async def _consolidate_and_cleanup():
-                temp_session = Session(key=session.key)
-                temp_session.messages = messages_to_archive
-                await self._consolidate_memory(temp_session, archive_all=True)
-
-            asyncio.create_task(_consolidate_and_cleanup())
+            temp_session = Session(key=session.key, messages=messages_to_archive)
+            self.consolidator.archive(temp_session)
             return OutboundMessage(channel=msg.channel, chat_id=msg.chat_id,
                                   content="New session started. Memory consolidation in progress.")
         if cmd == "/help":
             return OutboundMessage(channel=msg.channel, chat_id=msg.chat_id,
                                   content="🐈 zerobot commands:\n/new — Start a new conversation\n/help — Show available commands")
         
-        if len(session.messages) > self.memory_window:
-            asyncio.create_task(self._consolidate_memory(session))
+        if len(session.messages) - session.last_consolidated > self.memory_window:
+            self.consolidator.request(session)
 
         self._set_tool_context(msg.channel, msg.chat_id)
         initial_messages = self.context.build_messages(
-            history=session.get_history(max_messages=self.memory_window),
+            history=await session.get_history_async(max_tokens=self._history_budget(msg.content)),
             current_message=msg.content,
             media=msg.media if msg.media else None,
             channel=msg.channel,
             chat_id=msg.chat_id,
         )
-        final_content, tools_used, tool_errors = await self._run_agent_loop(initial_messages)
+        route = self.router.route("turn", msg.content, media=bool(msg.media))
+        final_content, tools_used, tool_errors = await self._run_agent_loop(initial_messages, stream, route)
 
         # Auto-delegate to public universe when locally blocked (opt-in).
         final_content = await self._maybe_delegate_public(msg.content, final_content, tool_errors)
@@ -330,6 +519,7 @@ class AgentLoop:
             chat_id=msg.chat_id,
             content=final_content,
             metadata=msg.metadata or {},  # Pass through for channel-specific needs (e.g. Slack thread_ts)
+            stream_id=stream.stream_id if stream and stream.started else None,
         )
     
     async def _process_system_message(self, msg: InboundMessage) -> OutboundMessage | None:
@@ -352,10 +542,10 @@ class AgentLoop:
             origin_chat_id = msg.chat_id
         
         session_key = f"{origin_channel}:{origin_chat_id}"
-        session = self.sessions.get_or_create(session_key)
+        session = await self.sessions.get_or_create_async(session_key)
         self._set_tool_context(origin_channel, origin_chat_id)
         initial_messages = self.context.build_messages(
-            history=session.get_history(max_messages=self.memory_window),
+            history=await session.get_history_async(max_tokens=self._history_budget(msg.content)),
             current_message=msg.content,
             channel=origin_channel,
             chat_id=origin_chat_id,
@@ -568,21 +758,45 @@ class AgentLoop:
                 f"LOCAL_RESPONSE:\n{local_answer or ''}\n\n"
                 f"TOOL_ERRORS:\n{'; '.join(tool_errors)}\n"
             )
-            resp = await self.provider.chat(
+            data, _ = await self._routed_json(
+                self.router.route("classification"),
+                list,
                 messages=[{"role": "user", "content": prompt}],
                 tools=None,
-                model=self.model,
                 temperature=0.0,
                 max_tokens=128,
             )
-            content = (resp.content or "").strip()
-            data = json_repair.loads(content)
             if isinstance(data, list):
                 return [str(x) for x in data if isinstance(x, str)]
         except Exception:
             return []
         return []
 
+    async def _routed_json(self, route: Route, expect: type, **kwargs: Any) -> tuple[Any, str]:
+        """
+        Ask for a JSON answer on the routed model.
+
+        A small-model answer that isn't JSON of the `expect` type is redone
+        on the main model.
+
+        Returns:
+            The parsed answer (None if unusable) and the raw text.
+        """
+        while True:
+            response = await self.provider.chat(model=route.model, **kwargs)
+            text = (response.content or "").strip()
+            if text.startswith("```"):
+                text = text.split("\n", 1)[-1].rsplit("```", 1)[0].strip()
+            result = json_repair.loads(text) if text and response.finish_reason != "error" else None
+            if isinstance(result, expect) or not route.small:
+                self.router.record(route, response.usage)
+                return (result if isinstance(result, expect) else None), text
+            if response.finish_reason == "error":
+                problem = "error response"
+            else:
+                problem = f"not a JSON {expect.__name__}" if text else "empty answer"
+            route = self.router.escalate(route, response.usage, problem)
+
     async def _auto_pull_knowledge(self, provider_node: str, cap: str | None) -> None:
         uc = self.universe_config
         token = uc.public_registry_token or None
@@ -619,6 +833,15 @@ class AgentLoop:
         except Exception as e:
             logger.warning(f"auto knowledge pull failed: {e}")
     
+    async def _run_consolidation(self, session: Session, archive_all: bool) -> None:
+        """Consolidation job body: consolidate, then persist the session's progress."""
+        with llm_priority("background"):
+            await self._consolidate_memory(session, archive_all=archive_all)
+        # archive_all runs on a detached copy, and a session replaced by /new
+        # meanwhile is stale; saving either would resurrect the cleared session
+        if not archive_all and self.sessions.is_current(session):
+            self.sessions.save(session)
+
     async def _consolidate_memory(self, session, archive_all: bool = False) -> None:
         """Consolidate old messages into MEMORY.md + HISTORY.md.
 
@@ -626,7 +849,7 @@ class AgentLoop:
             archive_all: If True, clear all messages and reset session (for /new command).
                        If False, only write to files without modifying session.
         """
-        memory = MemoryStore(self.workspace)
+        memory = self.context.memory
 
         if archive_all:
             old_messages = session.messages
@@ -643,7 +866,11 @@ class AgentLoop:
                 logger.debug(f"Session {session.key}: No new messages to consolidate (last_consolidated={session.last_consolidated}, total={len(session.messages)})")
                 return
 
-            old_messages = session.messages[session.last_consolidated:-keep_count]
+            # Fix the range now: messages may arrive while the LLM call is in flight
+            consolidate_until = len(session.messages) - keep_count
+            old_messages = await asyncio.to_thread(
+                take, session.messages, session.last_consolidated, consolidate_until
+            )
             if not old_messages:
                 return
             logger.info(f"Memory consolidation started: {len(session.messages)} total, {len(old_messages)} new to consolidate, {keep_count} keep")
@@ -655,16 +882,25 @@ class AgentLoop:
             tools = f" [tools: {', '.join(m['tools_used'])}]" if m.get("tools_used") else ""
             lines.append(f"[{m.get('timestamp', '?')[:16]}] {m['role'].upper()}{tools}: {m['content']}")
         conversation = "\n".join(lines)
-        current_memory = memory.read_long_term()
+        # Only show the entries the conversation touches once memory is too big to send whole
+        entries = memory.search(conversation, 40) if memory.is_large() else memory.get_entries()
+        sections = sorted({e.section for e in memory.get_entries() if e.section})
 
         prompt = f"""You are a memory consolidation agent. Process this conversation and return a JSON object with exactly two keys:
 
-1. "history_entry": A paragraph (2-5 sentences) summarizing the key events/decisions/topics. Start with a timestamp like [YYYY-MM-DD HH:MM]. Include enough detail to be useful when found by grep search later.
+1. "history_entry": A paragraph (2-5 sentences) summarizing the key events/decisions/topics. Start with a timestamp like [YYYY-MM-DD HH:MM]. Include enough detail to be useful when found by search later.
+
+2. "memory_ops": A list of changes to long-term memory, one short self-contained fact per entry. Record new facts: user location, preferences, personal info, habits, project context, technical decisions, tools/services used. Each item is one of:
+   {{"op": "add", "section": "<section name>", "text": "<fact>"}}
+   {{"op": "update", "id": "<entry id>", "text": "<corrected fact>"}}
+   {{"op": "delete", "id": "<entry id>"}}
+   Update or delete entries that the conversation shows are outdated or wrong. If nothing new, return an empty list.
 
-2. "memory_update": The updated long-term memory content. Add any new facts: user location, preferences, personal info, habits, project context, technical decisions, tools/services used. If nothing new, return the existing content unchanged.
+## Existing Memory Sections
+{", ".join(sections) or "(none)"}
 
-## Current Long-term Memory
-{current_memory or "(empty)"}
+## Related Long-term Memory Entries
+{memory.format_entries(entries, with_ids=True) or "(empty)"}
 
 ## Conversation to Process
 {conversation}
@@ -672,34 +908,35 @@ class AgentLoop:
 Respond with ONLY valid JSON, no markdown fences."""
 
         try:
-            response = await self.provider.chat(
+            result, text = await self._routed_json(
+                self.router.route("consolidation", model=self.consolidation_model),
+                dict,
                 messages=[
                     {"role": "system", "content": "You are a memory consolidation agent. Respond only with valid JSON."},
                     {"role": "user", "content": prompt},
                 ],
-                model=self.model,
             )
-            text = (response.content or "").strip()
             if not text:
                 logger.warning("Memory consolidation: LLM returned empty response, skipping")
                 return
-            if text.startswith("```"):
-                text = text.split("\n", 1)[-1].rsplit("```", 1)[0].strip()
-            result = json_repair.loads(text)
-            if not isinstance(result, dict):
+            if result is None:
                 logger.warning(f"Memory consolidation: unexpected response type, skipping. Response: {text[:200]}")
                 return
 
             if entry := result.get("history_entry"):
                 memory.append_history(entry)
-            if update := result.get("memory_update"):
-                if update != current_memory:
+            if isinstance(ops := result.get("memory_ops"), list) and ops:
+                applied = memory.apply_ops(ops)
+                logger.debug(f"Memory consolidation: applied {applied}")
+            elif isinstance(update := result.get("memory_update"), str) and update.strip():
+                # Older prompt format: a full rewrite of MEMORY.md
+                if update != memory.read_long_term():
                     memory.write_long_term(update)
 
             if archive_all:
                 session.last_consolidated = 0
             else:
-                session.last_consolidated = len(session.messages) - keep_count
+                session.last_consolidated = consolidate_until
             logger.info(f"Memory consolidation done: {len(session.messages)} messages, last_consolidated={session.last_consolidated}")
         except Exception as e:
             logger.error(f"Memory consolidation failed: {e}")
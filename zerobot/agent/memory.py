@@ -1,17 +1,54 @@
 """Memory system for persistent agent memory."""
 
+import hashlib
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
-from zerobot.utils.helpers import ensure_dir
+from zerobot.utils.helpers import ensure_dir, estimate_tokens
+
+# CJK characters are matched one at a time, other scripts as whole words
+_WIDE = "\u2e80-\u9fff\uac00-\ud7af\uf900-\ufaff"
+_TOKEN = re.compile(rf"[{_WIDE}]|[^\W{_WIDE}]+")
+_BULLET = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+")
+
+
+@dataclass
+class MemoryEntry:
+    """One addressable fact in MEMORY.md (a bullet item or paragraph)."""
+    id: str  # Short content hash, stable while the text is unchanged
+    section: str  # Nearest heading above the entry ("" if none)
+    text: str  # Entry text without the bullet marker
+
+
+@dataclass
+class _Block:
+    kind: str  # "heading", "entry" or "other"
+    section: str
+    lines: list[str]
+    entry: MemoryEntry | None = None
 
 
 class MemoryStore:
-    """Two-layer memory: MEMORY.md (long-term facts) + HISTORY.md (grep-searchable log)."""
+    """
+    Two-layer memory: MEMORY.md (long-term facts) + HISTORY.md (searchable event log).
 
-    def __init__(self, workspace: Path):
+    MEMORY.md is read as a list of entries (bullet items and paragraphs,
+    grouped under headings). While it is small it goes into the prompt in
+    full; once it grows past `inline_tokens`, only the entries most relevant
+    to the current message are retrieved (BM25) so the prompt stays flat.
+    """
+
+    def __init__(self, workspace: Path, inline_tokens: int = 2000, top_k: int = 12):
         self.memory_dir = ensure_dir(workspace / "memory")
         self.memory_file = self.memory_dir / "MEMORY.md"
         self.history_file = self.memory_dir / "HISTORY.md"
+        self.inline_tokens = inline_tokens
+        self.top_k = top_k
+        self._parsed: tuple[Any, str, list[_Block], _BM25 | None] | None = None
 
     def read_long_term(self) -> str:
         if self.memory_file.exists():
@@ -25,6 +62,199 @@ class MemoryStore:
         with open(self.history_file, "a", encoding="utf-8") as f:
             f.write(entry.rstrip() + "\n\n")
 
+    def is_large(self) -> bool:
+        """Whether MEMORY.md is too big to put in the prompt in full."""
+        return estimate_tokens(self._load()[1]) > self.inline_tokens
+
     def get_memory_context(self) -> str:
-        long_term = self.read_long_term()
-        return f"## Long-term Memory\n{long_term}" if long_term else ""
+        """Memory for the stable system prompt: the full file, or a pointer when it is large."""
+        _, long_term, blocks, _ = self._load()
+        if not long_term:
+            return ""
+        if not self.is_large():
+            return f"## Long-term Memory\n{long_term}"
+        count = sum(1 for b in blocks if b.kind == "entry")
+        return (
+            f"## Long-term Memory\nLong-term memory has {count} entries. "
+            f"The ones most relevant to the current message are shown with it; "
+            f"read {self.memory_file} for the rest."
+        )
+
+    def get_relevant_context(self, query: str) -> str:
+        """Top-k entries for a message, or "" when the full memory is already in the prompt."""
+        if not self.is_large():
+            return ""
+        entries = self.search(query, self.top_k)
+        if not entries:
+            return ""
+        return f"## Relevant Long-term Memory\n{self.format_entries(entries)}"
+
+    def get_entries(self) -> list[MemoryEntry]:
+        """All entries of MEMORY.md in file order."""
+        return [b.entry for b in self._load()[2] if b.entry]
+
+    def search(self, query: str, k: int) -> list[MemoryEntry]:
+        """
+        Find the entries most relevant to a query.
+
+        Returns:
+            Up to k entries in file order.
+        """
+        _, _, blocks, index = self._load()
+        entries = [b.entry for b in blocks if b.entry]
+        if index is None:
+            return []
+        hits = sorted(index.top(_tokenize(query), k))
+        return [entries[i] for i in hits]
+
+    @staticmethod
+    def format_entries(entries: list[MemoryEntry], with_ids: bool = False) -> str:
+        """Render entries grouped by section."""
+        lines: list[str] = []
+        section = None
+        for e in entries:
+            if e.section != section:
+                section = e.section
+                if section:
+                    lines.append(f"### {section}")
+            prefix = f"[{e.id}] " if with_ids else ""
+            lines.append(f"- {prefix}{e.text}")
+        return "\n".join(lines)
+
+    def apply_ops(self, ops: list[dict[str, Any]]) -> dict[str, int]:
+        """
+        Apply add/update/delete operations to MEMORY.md.
+
+        Each op is {"op": "add", "section": ..., "text": ...},
+        {"op": "update", "id": ..., "text": ...} or {"op": "delete", "id": ...}.
+        Unknown ids and malformed ops are skipped.
+
+        Returns:
+            Count of applied operations per kind.
+        """
+        blocks = list(self._load()[2])
+        applied = Counter()
+        by_id = {b.entry.id: b for b in blocks if b.entry}
+
+        for op in ops:
+            if not isinstance(op, dict):
+                continue
+            kind = op.get("op")
+            text = " ".join(str(op.get("text") or "").split())
+            target = by_id.get(str(op.get("id")))
+            pos = next((i for i, b in enumerate(blocks) if b is target), None)
+            if kind == "delete" and pos is not None:
+                del blocks[pos]
+            elif kind == "update" and pos is not None and text:
+                blocks[pos] = _entry_block(target.section, text)
+            elif kind == "add" and text:
+                section = str(op.get("section") or "").strip().lstrip("#").strip()
+                _insert_entry(blocks, section, text)
+            else:
+                continue
+            applied[kind] += 1
+
+        if applied:
+            content = "\n".join(line for b in blocks for line in b.lines).strip() + "\n"
+            self.write_long_term(content)
+        return dict(applied)
+
+    def _load(self) -> tuple[Any, str, list[_Block], "_BM25 | None"]:
+        """Parse MEMORY.md, reusing the previous parse while the file is unchanged."""
+        try:
+            st = self.memory_file.stat()
+            signature = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            signature = None
+        if self._parsed is None or self._parsed[0] != signature:
+            content = self.read_long_term() if signature else ""
+            blocks = _parse_blocks(content)
+            docs = [_tokenize(f"{b.section} {b.entry.text}") for b in blocks if b.entry]
+            self._parsed = (signature, content, blocks, _BM25(docs) if docs else None)
+        return self._parsed
+
+
+def _tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def _entry_id(text: str) -> str:
+    return hashlib.sha1(" ".join(text.split()).encode("utf-8")).hexdigest()[:6]
+
+
+def _entry_block(section: str, text: str) -> _Block:
+    return _Block("entry", section, [f"- {text}"], MemoryEntry(_entry_id(text), section, text))
+
+
+def _parse_blocks(content: str) -> list[_Block]:
+    """Split markdown into headings, entries (bullets/paragraphs) and other lines."""
+    blocks: list[_Block] = []
+    section = ""
+    current: _Block | None = None
+    in_fence = False
+
+    for line in content.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("```"):
+            in_fence = not in_fence
+        if not in_fence and stripped.startswith("#"):
+            section = stripped.lstrip("#").strip()
+            blocks.append(_Block("heading", section, [line]))
+            current = None
+        elif not stripped:
+            blocks.append(_Block("other", section, [line]))
+            current = None
+        elif current is not None and (in_fence or not _BULLET.match(line)):
+            current.lines.append(line)  # Continuation of the current entry
+        else:
+            current = _Block("entry", section, [line])
+            blocks.append(current)
+
+    for b in blocks:
+        if b.kind == "entry":
+            text = " ".join(_BULLET.sub("", "\n".join(b.lines), count=1).split())
+            b.entry = MemoryEntry(_entry_id(text), b.section, text)
+    return blocks
+
+
+def _insert_entry(blocks: list[_Block], section: str, text: str) -> None:
+    """Insert a new entry at the end of a section, creating the section if needed."""
+    new = _entry_block(section, text)
+    last = None
+    for i, b in enumerate(blocks):
+        if b.section == section and b.kind in ("heading", "entry"):
+            last = i
+    if last is not None:
+        blocks.insert(last + 1, new)
+        return
+    if section:
+        blocks.extend([_Block("other", section, [""]), _Block("heading", section, [f"## {section}"])])
+    blocks.append(new)
+
+
+class _BM25:
+    """Minimal Okapi BM25 over tokenized documents."""
+
+    def __init__(self, docs: list[list[str]], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.doc_len = [len(d) for d in docs]
+        self.avgdl = sum(self.doc_len) / len(docs) or 1.0
+        self.postings: dict[str, list[tuple[int, int]]] = {}
+        for i, doc in enumerate(docs):
+            for term, tf in Counter(doc).items():
+                self.postings.setdefault(term, []).append((i, tf))
+        n = len(docs)
+        self.idf = {
+            term: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5))
+            for term, p in self.postings.items()
+        }
+
+    def top(self, query: list[str], k: int) -> list[int]:
+        """Indices of the k best-scoring documents (only those matching at least one term)."""
+        scores: dict[int, float] = {}
+        for term in set(query):
+            for i, tf in self.postings.get(term, ()):
+                norm = tf + self.k1 * (1 - self.b + self.b * self.doc_len[i] / self.avgdl)
+                scores[i] = scores.get(i, 0.0) + self.idf[term] * tf * (self.k1 + 1) / norm
+        return sorted(scores, key=lambda i: (-scores[i], i))[:k]
@@ -0,0 +1,313 @@
+"""Full-text index over HISTORY.md and past session transcripts (SQLite FTS5)."""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+from loguru import logger
+
+from zerobot.session.archive import SessionArchive
+from zerobot.session.sqlite_store import SqliteSessionStore
+
+# History entries start with a timestamp like "[2026-01-31 14:05]"
+_HISTORY_TS = re.compile(r"^\[(\d{4}-\d{2}-\d{2})[ T](\d{2}:\d{2})")
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    position INTEGER NOT NULL,  -- HISTORY.md: bytes indexed; sessions: messages indexed
+    marker TEXT NOT NULL DEFAULT '',  -- session files: digest of the bytes before byte_offset; SQLite: generation
+    byte_offset INTEGER NOT NULL DEFAULT 0,  -- session files: bytes indexed
+    inode INTEGER NOT NULL DEFAULT 0  -- session files: the file indexed (rewrites replace it)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS docs USING fts5(
+    content,
+    source UNINDEXED,  -- "history" or "session"
+    ref UNINDEXED,     -- session key, or "HISTORY.md"
+    ts UNINDEXED,      -- "YYYY-MM-DD HH:MM..." (sortable)
+    role UNINDEXED,
+    path UNINDEXED
+);
+"""
+
+
+@dataclass
+class SearchHit:
+    """One search result."""
+    source: str
+    ref: str
+    timestamp: str
+    role: str
+    snippet: str
+    score: float
+
+
+class MemoryIndex:
+    """
+    Incrementally maintained search index over the agent's past.
+
+    Indexes HISTORY.md entries and the user/assistant messages of every
+    session file (or session database). Each refresh only reads what was
+    appended since the last one (files are reindexed if they shrink or are
+    rewritten from scratch: a session file is reindexed when its inode
+    changes or the bytes before the indexed offset are no longer the same).
+    """
+
+    def __init__(
+        self,
+        workspace: Path,
+        sessions_dir: Path | None = None,
+        db_path: Path | None = None,
+        session_db: SqliteSessionStore | None = None,
+    ):
+        self.history_file = workspace / "memory" / "HISTORY.md"
+        self.sessions_dir = sessions_dir
+        self.session_db = session_db
+        self.db_path = db_path or workspace / "memory" / ".search.db"
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript(_SCHEMA)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(files)")}
+        for column in ("byte_offset", "inode"):
+            if column not in columns:  # Index created by an older version
+                conn.execute(f"ALTER TABLE files ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0")
+        return conn
+
+    def refresh(self) -> int:
+        """
+        Bring the index up to date with HISTORY.md and the session files.
+
+        Returns:
+            Number of newly indexed documents.
+        """
+        with self._lock, closing(self._connect()) as conn, conn:
+            known = {
+                row[0]: row[1:]
+                for row in conn.execute("SELECT path, mtime_ns, size, position, marker, byte_offset, inode FROM files")
+            }
+            added = 0
+            seen: set[str] = set()
+
+            paths = [(self.history_file, "history")]
+            if self.sessions_dir and self.sessions_dir.is_dir():
+                paths += [(p, "session") for p in sorted(self.sessions_dir.glob("*.jsonl"))]
+                # Archived session files stay searchable; they are picked up again once restored
+                archive = SessionArchive(self.sessions_dir / "archive")
+                seen.update(str(self.sessions_dir / name) for name in archive.entries())
+
+            for path, kind in paths:
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                key = str(path)
+                seen.add(key)
+                mtime_ns, size, position, marker, offset, inode = known.get(key, (None, None, 0, "", 0, 0))
+                if (mtime_ns, size) == (st.st_mtime_ns, st.st_size):
+                    continue
+                if kind == "history":
+                    added += self._index_history(conn, path, position, st.st_size)
+                else:
+                    added += self._index_session(conn, path, st, position, marker, offset, inode)
+                conn.execute(
+                    "UPDATE files SET mtime_ns = ?, size = ? WHERE path = ?",
+                    (st.st_mtime_ns, st.st_size, key),
+                )
+
+            if self.session_db:
+                for session_key, count, generation in self.session_db.versions():
+                    key = f"sqlite:{session_key}"
+                    seen.add(key)
+                    _, _, position, marker, _, _ = known.get(key, (None, None, 0, "", 0, 0))
+                    if (position, marker) != (count, str(generation)):
+                        added += self._index_stored(conn, key, session_key, position, marker, count, str(generation))
+
+            for key in known.keys() - seen:
+                conn.execute("DELETE FROM docs WHERE path = ?", (key,))
+                conn.execute("DELETE FROM files WHERE path = ?", (key,))
+        if added:
+            logger.debug(f"Memory index: {added} new documents")
+        return added
+
+    def _index_history(self, conn: sqlite3.Connection, path: Path, position: int, size: int) -> int:
+        if size < position:
+            position = self._reset(conn, path)
+        with open(path, "rb") as f:
+            f.seek(position)
+            data = f.read()
+        # Entries are separated by a blank line; leave a partially written tail for next time
+        end = data.rfind(b"\n\n")
+        if end < 0:
+            self._set_position(conn, path, position)
+            return 0
+        complete = data[:end + 2]
+
+        rows = []
+        for entry in complete.decode("utf-8", errors="replace").split("\n\n"):
+            entry = entry.strip()
+            if not entry:
+                continue
+            m = _HISTORY_TS.match(entry)
+            ts = f"{m.group(1)} {m.group(2)}" if m else ""
+            rows.append((entry, "history", "HISTORY.md", ts, "", str(path)))
+        conn.executemany("INSERT INTO docs (content, source, ref, ts, role, path) VALUES (?, ?, ?, ?, ?, ?)", rows)
+        self._set_position(conn, path, position + len(complete))
+        return len(rows)
+
+    def _index_session(
+        self,
+        conn: sqlite3.Connection,
+        path: Path,
+        st: os.stat_result,
+        position: int,
+        marker: str,
+        offset: int,
+        inode: int,
+    ) -> int:
+        with open(path, "rb") as f:
+            # Sessions only append in place; a cleared or compacted session is a new (or rewritten) file
+            if inode != st.st_ino or st.st_size < offset or _tail_digest(f, offset) != marker:
+                position = offset = self._reset(conn, path)
+            f.seek(offset)
+            data = f.read()
+            # Leave a partially written last line for next time
+            end = data.rfind(b"\n") + 1
+            digest = _tail_digest(f, offset + end)
+        messages = []
+        for line in data[:end].decode("utf-8", errors="replace").splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("_type") != "metadata":
+                messages.append(record)
+
+        rows = _session_rows(messages, path.stem.replace("_", ":", 1), str(path))
+        conn.executemany("INSERT INTO docs (content, source, ref, ts, role, path) VALUES (?, ?, ?, ?, ?, ?)", rows)
+        self._set_position(conn, path, position + len(messages), digest, offset + end, st.st_ino)
+        return len(rows)
+
+    def _index_stored(
+        self,
+        conn: sqlite3.Connection,
+        key: str,
+        session_key: str,
+        position: int,
+        marker: str,
+        count: int,
+        generation: str,
+    ) -> int:
+        # A new generation means the messages were rewritten (e.g. the session was cleared)
+        if marker != generation or count < position:
+            position = self._reset(conn, key)
+        rows = _session_rows(self.session_db.read_range(session_key, position, count), session_key, key)
+        conn.executemany("INSERT INTO docs (content, source, ref, ts, role, path) VALUES (?, ?, ?, ?, ?, ?)", rows)
+        self._set_position(conn, key, count, generation)
+        return len(rows)
+
+    def _reset(self, conn: sqlite3.Connection, path: Path | str) -> int:
+        """Forget everything indexed from a file (it was truncated or rewritten)."""
+        conn.execute("DELETE FROM docs WHERE path = ?", (str(path),))
+        return 0
+
+    def _set_position(
+        self,
+        conn: sqlite3.Connection,
+        path: Path | str,
+        position: int,
+        marker: str = "",
+        offset: int = 0,
+        inode: int = 0,
+    ) -> None:
+        conn.execute(
+            "INSERT INTO files (path, mtime_ns, size, position, marker, byte_offset, inode) "
+            "VALUES (?, 0, 0, ?, ?, ?, ?) "
+            "ON CONFLICT(path) DO UPDATE SET position = excluded.position, marker = excluded.marker, "
+            "byte_offset = excluded.byte_offset, inode = excluded.inode",
+            (str(path), position, marker, offset, inode),
+        )
+
+    def search(
+        self,
+        query: str,
+        source: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        limit: int = 10,
+    ) -> list[SearchHit]:
+        """
+        Search history entries and past messages, best matches first.
+
+        Args:
+            query: Free-text query. All terms must match; if nothing does,
+                results matching any term are returned instead.
+            source: Optional "history" or "session".
+            since: Optional inclusive start date (YYYY-MM-DD).
+            until: Optional inclusive end date (YYYY-MM-DD).
+            limit: Maximum number of results.
+
+        Returns:
+            Ranked hits with highlighted snippets.
+        """
+        terms = _TERM.findall(query)
+        if not terms:
+            return []
+        self.refresh()
+
+        filters, params = [], []
+        if source:
+            filters.append("source = ?")
+            params.append(source)
+        if since:
+            filters.append("substr(ts, 1, 10) >= ?")
+            params.append(since)
+        if until:
+            filters.append("substr(ts, 1, 10) <= ?")
+            params.append(until)
+        where = "".join(f" AND {f}" for f in filters)
+        sql = (
+            "SELECT source, ref, ts, role, snippet(docs, 0, '[', ']', '…', 16), bm25(docs) AS score "
+            f"FROM docs WHERE docs MATCH ?{where} ORDER BY score LIMIT ?"
+        )
+
+        with closing(self._connect()) as conn:
+            for op in (" AND ", " OR "):
+                match = op.join(f'"{t}"' for t in terms)
+                rows = conn.execute(sql, (match, *params, limit)).fetchall()
+                if rows or len(terms) == 1:
+                    break
+        return [SearchHit(*row) for row in rows]
+
+
+def _tail_digest(f: BinaryIO, offset: int, length: int = 64) -> str:
+    """Digest of the bytes just before `offset`, to tell an appended file from a rewritten one."""
+    start = max(0, offset - length)
+    f.seek(start)
+    return hashlib.sha1(f.read(offset - start)).hexdigest()[:16]
+
+
+def _session_rows(messages: list[dict], session_key: str, path: str) -> list[tuple[str, ...]]:
+    """Index rows for the user/assistant messages of a session."""
+    rows = []
+    for m in messages:
+        content = m.get("content")
+        if m.get("role") not in ("user", "assistant") or not isinstance(content, str) or not content.strip():
+            continue
+        ts = (m.get("timestamp") or "").replace("T", " ")
+        rows.append((content, "session", session_key, ts, m["role"], path))
+    return rows
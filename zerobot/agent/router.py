@@ -0,0 +1,170 @@
+"""Rule-based model routing: cheap calls go to a small model, with escalation to the main one."""
+
+import re
+from dataclasses import dataclass
+from typing import Any
+
+from loguru import logger
+
+from zerobot.providers.base import LLMResponse
+
+# Call types the router knows about
+CALL_TYPES = ("turn", "consolidation", "classification")
+
+# Messages that point at work (links, code) rather than conversation
+_TASK_HINTS = re.compile(r"https?://|```|\bwww\.")
+
+
+@dataclass
+class Route:
+    """Where one LLM call goes."""
+    call_type: str
+    model: str
+    reason: str
+    small: bool = False  # On the small model: check the answer and escalate if it's unusable
+
+
+@dataclass
+class RouteStats:
+    calls: int = 0
+    small: int = 0  # Calls answered by the small model
+    escalated: int = 0  # Small-model answers rejected and redone on the main model
+    saved_usd: float = 0.0  # Estimated, from LiteLLM's price map; negative if escalations cost more
+
+
+def token_prices(model: str) -> tuple[float, float] | None:
+    """(input, output) USD per token from LiteLLM's model map, if it knows the model."""
+    try:
+        import litellm
+    except ImportError:
+        return None
+    for key in (model, model.split("/", 1)[-1], model.rsplit("/", 1)[-1]):
+        info = litellm.model_cost.get(key)
+        if info and info.get("input_cost_per_token") is not None:
+            return float(info["input_cost_per_token"]), float(info.get("output_cost_per_token") or 0.0)
+    return None
+
+
+class ModelRouter:
+    """
+    Picks a model per LLM call.
+
+    With a `small_model` configured, memory consolidation, capability
+    classification and short chit-chat turns (no media, no links or code,
+    at most `chat_max_chars`) go to it; everything else goes to the main
+    model. Callers check a small-model answer and, when it is unusable
+    (invalid JSON, an error, or a turn that turns out to need tools),
+    redo the call on the main model via escalate().
+    """
+
+    def __init__(
+        self,
+        main_model: str,
+        small_model: str | None = None,
+        chat_max_chars: int = 280,
+        prices: dict[str, tuple[float, float]] | None = None,
+    ):
+        self.main_model = main_model
+        self.small_model = small_model if small_model and small_model != main_model else None
+        self.chat_max_chars = chat_max_chars
+        self.stats = {call_type: RouteStats() for call_type in CALL_TYPES}
+        self._prices = dict(prices or {})
+
+    def route(self, call_type: str, text: str = "", media: bool = False, model: str | None = None) -> Route:
+        """
+        Choose the model for a call.
+
+        Args:
+            call_type: One of CALL_TYPES.
+            text: For turns, the user's message.
+            media: For turns, whether the message carries attachments.
+            model: A model configured for this call type, which always wins.
+        """
+        if model:
+            route = Route(call_type, model, "configured")
+        elif not self.small_model:
+            route = Route(call_type, self.main_model, "no small model")
+        elif call_type != "turn":
+            route = Route(call_type, self.small_model, call_type, small=True)
+        elif media:
+            route = Route(call_type, self.main_model, "media")
+        elif len(text) > self.chat_max_chars:
+            route = Route(call_type, self.main_model, "long message")
+        elif _TASK_HINTS.search(text):
+            route = Route(call_type, self.main_model, "links or code")
+        else:
+            route = Route(call_type, self.small_model, "chit-chat", small=True)
+        logger.debug(f"Router: {call_type} -> {route.model} ({route.reason})")
+        return route
+
+    @staticmethod
+    def check_turn(response: LLMResponse) -> str | None:
+        """Why a small model's turn response can't be used as the reply (None if it can)."""
+        if response.finish_reason == "error":
+            return "error response"
+        if response.has_tool_calls:
+            return "needs tools"
+        if response.finish_reason == "length":
+            return "truncated"
+        if not (response.content or "").strip():
+            return "empty answer"
+        return None
+
+    def record(self, route: Route, usage: dict[str, int] | None = None) -> None:
+        """Count a completed call, logging the estimated saving of small-model answers."""
+        stats = self.stats.setdefault(route.call_type, RouteStats())
+        stats.calls += 1
+        if not route.small:
+            return
+        stats.small += 1
+        saved = self._cost(self.main_model, usage)
+        small_cost = self._cost(route.model, usage)
+        if saved is None or small_cost is None:
+            logger.info(f"Router: {route.call_type} answered by {route.model} ({route.reason})")
+            return
+        saved -= small_cost
+        stats.saved_usd += saved
+        logger.info(
+            f"Router: {route.call_type} answered by {route.model} ({route.reason}), "
+            f"~${saved:.5f} saved vs {self.main_model}"
+        )
+
+    def escalate(self, route: Route, usage: dict[str, int] | None, problem: str) -> Route:
+        """Reject a small-model answer; returns the main-model route to redo the call on."""
+        stats = self.stats.setdefault(route.call_type, RouteStats())
+        stats.escalated += 1
+        if (wasted := self._cost(route.model, usage)) is not None:
+            stats.saved_usd -= wasted
+        logger.info(f"Router: escalating {route.call_type} from {route.model} to {self.main_model}: {problem}")
+        return Route(route.call_type, self.main_model, f"escalated: {problem}")
+
+    def _cost(self, model: str, usage: dict[str, int] | None) -> float | None:
+        if not usage:
+            return None
+        if model not in self._prices:
+            self._prices[model] = token_prices(model)
+        prices = self._prices[model]
+        if prices is None:
+            return None
+        return usage.get("prompt_tokens", 0) * prices[0] + usage.get("completion_tokens", 0) * prices[1]
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            call_type: {
+                "calls": s.calls,
+                "small": s.small,
+                "escalated": s.escalated,
+                "saved_usd": round(s.saved_usd, 5),
+            }
+            for call_type, s in self.stats.items()
+        }
+
+    def log_summary(self) -> None:
+        if not self.small_model:
+            return
+        for call_type, s in self.snapshot().items():
+            if s["calls"]:
+                logger.info(
+                    f"Router {call_type}: {s['small']}/{s['calls']} on {self.small_model}, "
+                    f"{s['escalated']} escalated, ~${s['saved_usd']:.4f} saved"
+                )
@@ -0,0 +1,320 @@
+"""Session-aware schedulers for agent turns and background memory consolidation."""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from loguru import logger
+
+from zerobot.bus.events import InboundMessage
+from zerobot.session.manager import Session
+
+
+@dataclass
+class SessionQueueStats:
+    """Queue statistics for one session."""
+    queued: int = 0  # Turns waiting to run
+    running: bool = False
+    processed: int = 0
+    last_wait_s: float = 0.0  # Time the last turn spent waiting for a slot
+    max_wait_s: float = 0.0
+
+
+@dataclass
+class _PendingTurn:
+    msg: InboundMessage
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class SessionScheduler:
+    """
+    Runs agent turns concurrently across sessions.
+
+    Turns that share a session key are executed strictly in arrival order,
+    one at a time. Turns for different sessions run concurrently, bounded
+    by a global concurrency limit.
+
+    The dispatcher should only submit while has_capacity() holds, and only
+    for sessions that are not is_busy(), so that backlog stays in the
+    (bounded, prioritized) message bus rather than in the per-session
+    queues here. `on_idle` is awaited with the key whenever a session's
+    queue has drained, so the dispatcher can pick up its next message.
+
+    Stats of idle sessions are kept for the `max_recent_sessions` most
+    recently active ones, next to totals over all turns.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[InboundMessage], Awaitable[None]],
+        max_concurrency: int = 4,
+        max_pending: int | None = None,
+        on_idle: Callable[[str], Awaitable[None]] | None = None,
+        max_recent_sessions: int = 100,
+    ):
+        self._handler = handler
+        self._on_idle = on_idle
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_pending = max_pending if max_pending is not None else self.max_concurrency * 2
+        self._changed = asyncio.Condition()
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._queues: dict[str, deque[_PendingTurn]] = {}
+        self._workers: dict[str, asyncio.Task[None]] = {}
+        self._stats: OrderedDict[str, SessionQueueStats] = OrderedDict()  # Least recently active first
+        self.max_recent_sessions = max_recent_sessions
+        self._active = 0
+        self.processed = 0
+        self.total_wait_s = 0.0
+        self.max_wait_s = 0.0
+
+    def submit(self, key: str, msg: InboundMessage) -> None:
+        """Queue a turn for a session, starting its worker if needed."""
+        self._queues.setdefault(key, deque()).append(_PendingTurn(msg))
+        stats = self._stats.setdefault(key, SessionQueueStats())
+        stats.queued += 1
+
+        if key not in self._workers:
+            self._workers[key] = asyncio.create_task(self._drain(key))
+
+    async def _drain(self, key: str) -> None:
+        """Process a session's queue until it is empty."""
+        queue = self._queues[key]
+        stats = self._stats[key]
+        try:
+            while queue:
+                turn = queue[0]
+                async with self._slots:
+                    queue.popleft()
+                    stats.queued -= 1
+                    wait = time.monotonic() - turn.enqueued_at
+                    stats.last_wait_s = wait
+                    stats.max_wait_s = max(stats.max_wait_s, wait)
+                    self.total_wait_s += wait
+                    self.max_wait_s = max(self.max_wait_s, wait)
+                    if wait > 1.0:
+                        logger.debug(f"Session {key}: turn waited {wait:.2f}s for a slot")
+
+                    stats.running = True
+                    self._active += 1
+                    try:
+                        await self._handler(turn.msg)
+                    except Exception as e:
+                        logger.error(f"Unhandled error in session {key}: {e}")
+                    finally:
+                        stats.running = False
+                        stats.processed += 1
+                        self.processed += 1
+                        self._active -= 1
+                        async with self._changed:
+                            self._changed.notify_all()
+        finally:
+            self._workers.pop(key, None)
+            if not queue:
+                self._queues.pop(key, None)
+                self._trim_stats(key)
+        if self._on_idle is not None:
+            await self._on_idle(key)
+
+    def _trim_stats(self, key: str) -> None:
+        """Mark a drained session as most recently active and forget the oldest idle ones."""
+        self._stats.move_to_end(key)
+        excess = len(self._stats) - self.max_recent_sessions
+        for idle in list(self._stats):
+            if excess <= 0:
+                break
+            if idle not in self._queues:
+                del self._stats[idle]
+                excess -= 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get current scheduler state (active turns, wait totals and per-session queues)."""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "active": self._active,
+            "queued": sum(len(q) for q in self._queues.values()),
+            "processed": self.processed,
+            "avg_wait_s": round(self.total_wait_s / self.processed, 3) if self.processed else 0.0,
+            "max_wait_s": round(self.max_wait_s, 3),
+            "sessions": {
+                key: {
+                    "queued": s.queued,
+                    "running": s.running,
+                    "processed": s.processed,
+                    "last_wait_s": round(s.last_wait_s, 3),
+                    "max_wait_s": round(s.max_wait_s, 3),
+                }
+                for key, s in self._stats.items()
+            },
+        }
+
+    def has_capacity(self) -> bool:
+        """Whether a turn submitted now could start soon (a slot is free and few turns are waiting for one)."""
+        return self._active < self.max_concurrency and self.waiting_count < self.max_pending
+
+    async def wait_for_capacity(self) -> None:
+        """Wait until has_capacity() holds."""
+        async with self._changed:
+            await self._changed.wait_for(self.has_capacity)
+
+    def is_busy(self, key: str) -> bool:
+        """Whether a session has a turn running or queued."""
+        return key in self._workers
+
+    @property
+    def active_count(self) -> int:
+        """Number of turns currently running."""
+        return self._active
+
+    @property
+    def pending_count(self) -> int:
+        """Number of turns waiting to run."""
+        return sum(len(q) for q in self._queues.values())
+
+    @property
+    def waiting_count(self) -> int:
+        """Number of pending turns waiting for a slot (not behind their session's running turn)."""
+        return sum(len(q) for key, q in self._queues.items() if not self._stats[key].running)
+
+    async def join(self) -> None:
+        """Wait until every queued turn has finished."""
+        while self._workers:
+            await asyncio.gather(*list(self._workers.values()), return_exceptions=True)
+
+    async def shutdown(self) -> None:
+        """Cancel running and queued turns."""
+        workers = list(self._workers.values())
+        for task in workers:
+            task.cancel()
+        if workers:
+            await asyncio.gather(*workers, return_exceptions=True)
+        self._queues.clear()
+        self._stats.clear()
+
+
+@dataclass
+class _ConsolidationJob:
+    session: Session
+    due_at: float  # Debounce deadline (monotonic)
+    deadline: float  # Latest start, however often the debounce is pushed back
+    running: bool = False
+    rerun: bool = False  # Requested again while running
+    task: asyncio.Task[None] | None = None
+
+
+class ConsolidationScheduler:
+    """
+    Runs memory consolidation in the background, at most once per session.
+
+    A request for a session that already has a queued job only pushes its
+    start back by the debounce delay, but never past `max_delay_s` after
+    the job's first request, so a steady stream of messages still gets
+    consolidated; a request while the job is running schedules a single
+    follow-up pass. Jobs for different sessions share a
+    global concurrency cap (default 1, since they all update MEMORY.md).
+    """
+
+    def __init__(
+        self,
+        consolidate: Callable[[Session, bool], Awaitable[None]],
+        max_concurrency: int = 1,
+        debounce_s: float = 5.0,
+        max_delay_s: float = 60.0,
+    ):
+        self._consolidate = consolidate
+        self.debounce_s = debounce_s
+        self.max_delay_s = max(max_delay_s, debounce_s)
+        self._slots = asyncio.Semaphore(max(1, max_concurrency))
+        self._jobs: dict[str, _ConsolidationJob] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+        self.requested = 0
+        self.runs = 0
+
+    def request(self, session: Session) -> None:
+        """Ask for a session to be consolidated soon."""
+        self.requested += 1
+        now = time.monotonic()
+        job = self._jobs.get(session.key)
+        if job is None:
+            job = self._jobs[session.key] = _ConsolidationJob(session, now + self.debounce_s, now + self.max_delay_s)
+            job.task = self._spawn(self._run(session.key))
+            return
+        job.session = session
+        if job.running:
+            job.rerun = True
+        else:
+            job.due_at = min(now + self.debounce_s, job.deadline)
+
+    def archive(self, session: Session) -> None:
+        """Consolidate and archive all messages of a (detached) session right away."""
+        self.requested += 1
+        self._spawn(self._run_once(session, archive_all=True))
+
+    def cancel(self, key: str) -> bool:
+        """Drop a session's queued or running job (e.g. because the session was cleared)."""
+        job = self._jobs.pop(key, None)
+        if job is None:
+            return False
+        if job.task is not None:
+            job.task.cancel()
+        return True
+
+    def _spawn(self, coro: Awaitable[None]) -> asyncio.Task[None]:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _run(self, key: str) -> None:
+        job = self._jobs[key]
+        try:
+            while True:
+                while (delay := job.due_at - time.monotonic()) > 0:
+                    await asyncio.sleep(delay)
+                job.running = True
+                try:
+                    await self._run_once(job.session, archive_all=False)
+                finally:
+                    job.running = False
+                if not job.rerun:
+                    break
+                job.rerun = False
+                now = time.monotonic()
+                job.due_at, job.deadline = now + self.debounce_s, now + self.max_delay_s
+        finally:
+            if self._jobs.get(key) is job:
+                self._jobs.pop(key)
+
+    async def _run_once(self, session: Session, archive_all: bool) -> None:
+        async with self._slots:
+            self.runs += 1
+            try:
+                await self._consolidate(session, archive_all)
+            except Exception as e:
+                logger.error(f"Memory consolidation for {session.key} failed: {e}")
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get consolidation counters and per-session job state."""
+        return {
+            "requested": self.requested,
+            "runs": self.runs,
+            "jobs": {
+                key: "running" if job.running else "waiting"
+                for key, job in self._jobs.items()
+            },
+        }
+
+    async def join(self) -> None:
+        """Wait until every scheduled job has finished."""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    async def shutdown(self) -> None:
+        """Cancel waiting and running jobs (progress is saved after each completed job)."""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._jobs.clear()
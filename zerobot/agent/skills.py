@@ -4,24 +4,140 @@ import json
 import os
 import re
 import shutil
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
 
+from zerobot.utils.helpers import file_signature
+
 # Default builtin skills directory (relative to this file)
 BUILTIN_SKILLS_DIR = Path(__file__).parent.parent / "skills"
 
 
+@dataclass
+class SkillEntry:
+    """A parsed SKILL.md with its requirement checks resolved."""
+    name: str
+    path: Path
+    source: str  # "workspace" or "builtin"
+    signature: tuple[int, int]  # (mtime_ns, size) of SKILL.md when parsed
+    content: str
+    metadata: dict = field(default_factory=dict)  # Raw frontmatter
+    meta: dict = field(default_factory=dict)  # zerobot/openclaw metadata block
+    missing: str = ""  # Missing requirements; empty when available
+
+    @property
+    def available(self) -> bool:
+        return not self.missing
+
+
 class SkillsLoader:
     """
     Loader for agent skills.
     
     Skills are markdown files (SKILL.md) that teach the agent how to use
     specific tools or perform certain tasks.
+
+    Skills are kept in an in-memory index: each SKILL.md is parsed once and
+    re-parsed only when its mtime/size changes, and requirement checks are
+    re-resolved only when PATH or the environment changes. Directories are
+    rescanned at most every ``rescan_interval_s`` seconds. One loader can be
+    shared by the main agent and its subagents.
     """
     
-    def __init__(self, workspace: Path, builtin_skills_dir: Path | None = None):
+    def __init__(
+        self,
+        workspace: Path,
+        builtin_skills_dir: Path | None = None,
+        rescan_interval_s: float = 1.0,
+    ):
         self.workspace = workspace
         self.workspace_skills = workspace / "skills"
         self.builtin_skills = builtin_skills_dir or BUILTIN_SKILLS_DIR
+        self.rescan_interval_s = rescan_interval_s
+        self.version = 0  # Bumped whenever the index changes
+        self._index: dict[str, SkillEntry] = {}
+        self._env_key: tuple | None = None
+        self._which: dict[str, bool] = {}
+        self._scanned_at: float | None = None
+    
+    def refresh(self, force: bool = False) -> int:
+        """
+        Rescan skill directories and update the index incrementally.
+        
+        Args:
+            force: Rescan even if the last scan is within rescan_interval_s.
+        
+        Returns:
+            Index version (changes whenever any skill changes).
+        """
+        now = time.monotonic()
+        if (
+            not force
+            and self._scanned_at is not None
+            and now - self._scanned_at < self.rescan_interval_s
+        ):
+            return self.version
+        self._scanned_at = now
+        
+        env_key = (os.environ.get("PATH", ""), frozenset(k for k, v in os.environ.items() if v))
+        env_changed = env_key != self._env_key
+        if env_changed:
+            self._env_key = env_key
+            self._which.clear()
+        
+        index: dict[str, SkillEntry] = {}
+        changed = False
+        # Workspace skills take priority over built-in skills with the same name
+        for source, root in (("workspace", self.workspace_skills), ("builtin", self.builtin_skills)):
+            if not root or not root.is_dir():
+                continue
+            for skill_dir in sorted(root.iterdir()):
+                if skill_dir.name in index:
+                    continue
+                skill_file = skill_dir / "SKILL.md"
+                signature = file_signature(skill_file)
+                if signature is None:
+                    continue
+                entry = self._index.get(skill_dir.name)
+                if entry is None or entry.path != skill_file or entry.signature != signature:
+                    entry = self._parse_entry(skill_dir.name, skill_file, source, signature)
+                    changed = True
+                elif env_changed:
+                    missing = self._get_missing_requirements(entry.meta)
+                    changed |= missing != entry.missing
+                    entry.missing = missing
+                index[entry.name] = entry
+        
+        if changed or index.keys() != self._index.keys():
+            self.version += 1
+        self._index = index
+        return self.version
+    
+    def _parse_entry(self, name: str, path: Path, source: str, signature: tuple[int, int]) -> SkillEntry:
+        """Read and parse one SKILL.md."""
+        content = path.read_text(encoding="utf-8")
+        metadata = self._parse_frontmatter(content) or {}
+        meta = self._parse_zerobot_metadata(metadata.get("metadata", ""))
+        return SkillEntry(
+            name=name,
+            path=path,
+            source=source,
+            signature=signature,
+            content=content,
+            metadata=metadata,
+            meta=meta,
+            missing=self._get_missing_requirements(meta),
+        )
+    
+    def _get_entry(self, name: str) -> SkillEntry | None:
+        """Look up a skill, forcing a rescan if it is not indexed yet."""
+        self.refresh()
+        entry = self._index.get(name)
+        if entry is None:
+            self.refresh(force=True)
+            entry = self._index.get(name)
+        return entry
     
     def list_skills(self, filter_unavailable: bool = True) -> list[dict[str, str]]:
         """
@@ -33,28 +149,12 @@ class SkillsLoader:
         Returns:
             List of skill info dicts with 'name', 'path', 'source'.
         """
-        skills = []
-        
-        # Workspace skills (highest priority)
-        if self.workspace_skills.exists():
-            for skill_dir in self.workspace_skills.iterdir():
-                if skill_dir.is_dir():
-                    skill_file = skill_dir / "SKILL.md"
-                    if skill_file.exists():
-                        skills.append({"name": skill_dir.name, "path": str(skill_file), "source": "workspace"})
-        
-        # Built-in skills
-        if self.builtin_skills and self.builtin_skills.exists():
-            for skill_dir in self.builtin_skills.iterdir():
-                if skill_dir.is_dir():
-                    skill_file = skill_dir / "SKILL.md"
-                    if skill_file.exists() and not any(s["name"] == skill_dir.name for s in skills):
-                        skills.append({"name": skill_dir.name, "path": str(skill_file), "source": "builtin"})
-        
-        # Filter by requirements
-        if filter_unavailable:
-            return [s for s in skills if self._check_requirements(self._get_skill_meta(s["name"]))]
-        return skills
+        self.refresh()
+        return [
+            {"name": e.name, "path": str(e.path), "source": e.source}
+            for e in self._index.values()
+            if e.available or not filter_unavailable
+        ]
     
     def load_skill(self, name: str) -> str | None:
         """
@@ -66,18 +166,8 @@ class SkillsLoader:
         Returns:
             Skill content or None if not found.
         """
-        # Check workspace first
-        workspace_skill = self.workspace_skills / name / "SKILL.md"
-        if workspace_skill.exists():
-            return workspace_skill.read_text(encoding="utf-8")
-        
-        # Check built-in
-        if self.builtin_skills:
-            builtin_skill = self.builtin_skills / name / "SKILL.md"
-            if builtin_skill.exists():
-                return builtin_skill.read_text(encoding="utf-8")
-        
-        return None
+        entry = self._get_entry(name)
+        return entry.content if entry else None
     
     def load_skills_for_context(self, skill_names: list[str]) -> str:
         """
@@ -108,31 +198,26 @@ class SkillsLoader:
         Returns:
             XML-formatted skills summary.
         """
-        all_skills = self.list_skills(filter_unavailable=False)
-        if not all_skills:
+        self.refresh()
+        if not self._index:
             return ""
         
         def escape_xml(s: str) -> str:
             return s.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
         
         lines = ["<skills>"]
-        for s in all_skills:
-            name = escape_xml(s["name"])
-            path = s["path"]
-            desc = escape_xml(self._get_skill_description(s["name"]))
-            skill_meta = self._get_skill_meta(s["name"])
-            available = self._check_requirements(skill_meta)
+        for entry in self._index.values():
+            name = escape_xml(entry.name)
+            desc = escape_xml(entry.metadata.get("description") or entry.name)
             
-            lines.append(f"  <skill available=\"{str(available).lower()}\">")
+            lines.append(f"  <skill available=\"{str(entry.available).lower()}\">")
             lines.append(f"    <name>{name}</name>")
             lines.append(f"    <description>{desc}</description>")
-            lines.append(f"    <location>{path}</location>")
+            lines.append(f"    <location>{entry.path}</location>")
             
             # Show missing requirements for unavailable skills
-            if not available:
-                missing = self._get_missing_requirements(skill_meta)
-                if missing:
-                    lines.append(f"    <requires>{escape_xml(missing)}</requires>")
+            if not entry.available:
+                lines.append(f"    <requires>{escape_xml(entry.missing)}</requires>")
             
             lines.append(f"  </skill>")
         lines.append("</skills>")
@@ -144,19 +229,18 @@ class SkillsLoader:
         missing = []
         requires = skill_meta.get("requires", {})
         for b in requires.get("bins", []):
-            if not shutil.which(b):
+            if not self._has_bin(b):
                 missing.append(f"CLI: {b}")
         for env in requires.get("env", []):
             if not os.environ.get(env):
                 missing.append(f"ENV: {env}")
         return ", ".join(missing)
     
-    def _get_skill_description(self, name: str) -> str:
-        """Get the description of a skill from its frontmatter."""
-        meta = self.get_skill_metadata(name)
-        if meta and meta.get("description"):
-            return meta["description"]
-        return name  # Fallback to skill name
+    def _has_bin(self, name: str) -> bool:
+        """shutil.which, memoized until PATH changes."""
+        if name not in self._which:
+            self._which[name] = shutil.which(name) is not None
+        return self._which[name]
     
     def _strip_frontmatter(self, content: str) -> str:
         """Remove YAML frontmatter from markdown content."""
@@ -174,31 +258,18 @@ class SkillsLoader:
         except (json.JSONDecodeError, TypeError):
             return {}
     
-    def _check_requirements(self, skill_meta: dict) -> bool:
-        """Check if skill requirements are met (bins, env vars)."""
-        requires = skill_meta.get("requires", {})
-        for b in requires.get("bins", []):
-            if not shutil.which(b):
-                return False
-        for env in requires.get("env", []):
-            if not os.environ.get(env):
-                return False
-        return True
-    
     def _get_skill_meta(self, name: str) -> dict:
         """Get zerobot metadata for a skill (cached in frontmatter)."""
-        meta = self.get_skill_metadata(name) or {}
-        return self._parse_zerobot_metadata(meta.get("metadata", ""))
+        entry = self._get_entry(name)
+        return dict(entry.meta) if entry else {}
     
     def get_always_skills(self) -> list[str]:
         """Get skills marked as always=true that meet requirements."""
-        result = []
-        for s in self.list_skills(filter_unavailable=True):
-            meta = self.get_skill_metadata(s["name"]) or {}
-            skill_meta = self._parse_zerobot_metadata(meta.get("metadata", ""))
-            if skill_meta.get("always") or meta.get("always"):
-                result.append(s["name"])
-        return result
+        self.refresh()
+        return [
+            e.name for e in self._index.values()
+            if e.available and (e.meta.get("always") or e.metadata.get("always"))
+        ]
     
     def get_skill_metadata(self, name: str) -> dict | None:
         """
@@ -210,10 +281,11 @@ class SkillsLoader:
         Returns:
             Metadata dict or None.
         """
-        content = self.load_skill(name)
-        if not content:
-            return None
-        
+        entry = self._get_entry(name)
+        return dict(entry.metadata) if entry and entry.metadata else None
+    
+    def _parse_frontmatter(self, content: str) -> dict | None:
+        """Parse simple key: value frontmatter from SKILL.md content."""
         if content.startswith("---"):
             match = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
             if match:
@@ -0,0 +1,64 @@
+"""Relay streamed LLM output to channels as throttled partial messages."""
+
+import time
+import uuid
+from typing import Any, Awaitable, Callable
+
+from zerobot.bus.events import OutboundMessage
+
+
+class StreamRelay:
+    """
+    Publishes the text of an in-progress reply as partial outbound messages.
+
+    Each partial carries the full text so far (not just the delta), so
+    channels can simply edit their placeholder. Updates are throttled to at
+    most one per `interval_s`; the final message always carries the
+    complete text.
+    """
+
+    def __init__(
+        self,
+        publish: Callable[[OutboundMessage], Awaitable[None]],
+        channel: str,
+        chat_id: str,
+        metadata: dict[str, Any] | None = None,
+        interval_s: float = 1.0,
+    ):
+        self._publish = publish
+        self.channel = channel
+        self.chat_id = chat_id
+        self.metadata = metadata or {}
+        self.interval_s = interval_s
+        self.stream_id = uuid.uuid4().hex[:12]
+        self.started = False  # True once a partial has been published
+        self._text = ""
+        self._last_sent = ""
+        self._last_publish = 0.0
+
+    def begin(self) -> None:
+        """Start a new LLM call; its text replaces the previous call's."""
+        self._text = ""
+
+    async def push(self, delta: str) -> None:
+        """Append a content delta, publishing if the throttle allows."""
+        if not delta:
+            return
+        self._text += delta
+        now = time.monotonic()
+        if now - self._last_publish < self.interval_s:
+            return
+        text = self._text.strip()
+        if not text or text == self._last_sent:
+            return
+        self._last_publish = now
+        self._last_sent = text
+        self.started = True
+        await self._publish(OutboundMessage(
+            channel=self.channel,
+            chat_id=self.chat_id,
+            content=text,
+            metadata=self.metadata,
+            stream_id=self.stream_id,
+            partial=True,
+        ))
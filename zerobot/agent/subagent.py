@@ -11,10 +11,13 @@ from loguru import logger
 from zerobot.bus.events import InboundMessage
 from zerobot.bus.queue import MessageBus
 from zerobot.providers.base import LLMProvider
+from zerobot.providers.rate_limit import llm_priority
+from zerobot.agent.skills import SkillsLoader
 from zerobot.agent.tools.registry import ToolRegistry
 from zerobot.agent.tools.filesystem import ReadFileTool, WriteFileTool, EditFileTool, ListDirTool
 from zerobot.agent.tools.shell import ExecTool
 from zerobot.agent.tools.web import WebSearchTool, WebFetchTool
+from zerobot.agent.tools.results import ReadToolResultTool, ToolResultStore
 
 
 class SubagentManager:
@@ -34,9 +37,13 @@ class SubagentManager:
         model: str | None = None,
         temperature: float = 0.7,
         max_tokens: int = 4096,
+        max_parallel_tools: int = 4,
         brave_api_key: str | None = None,
         exec_config: "ExecToolConfig | None" = None,
         restrict_to_workspace: bool = False,
+        skills: SkillsLoader | None = None,
+        tool_result_inline_chars: int = 6000,
+        tool_result_stale_chars: int = 600,
     ):
         from zerobot.config.schema import ExecToolConfig
         self.provider = provider
@@ -45,9 +52,13 @@ class SubagentManager:
         self.model = model or provider.get_default_model()
         self.temperature = temperature
         self.max_tokens = max_tokens
+        self.max_parallel_tools = max_parallel_tools
         self.brave_api_key = brave_api_key
         self.exec_config = exec_config or ExecToolConfig()
         self.restrict_to_workspace = restrict_to_workspace
+        self.skills = skills or SkillsLoader(workspace)
+        self.tool_result_inline_chars = tool_result_inline_chars
+        self.tool_result_stale_chars = tool_result_stale_chars
         self._running_tasks: dict[str, asyncio.Task[None]] = {}
     
     async def spawn(
@@ -77,10 +88,11 @@ class SubagentManager:
             "chat_id": origin_chat_id,
         }
         
-        # Create background task
-        bg_task = asyncio.create_task(
-            self._run_subagent(task_id, task, display_label, origin)
-        )
+        # Create background task (its LLM requests yield to interactive turns)
+        with llm_priority("background"):
+            bg_task = asyncio.create_task(
+                self._run_subagent(task_id, task, display_label, origin)
+            )
         self._running_tasks[task_id] = bg_task
         
         # Cleanup when done
@@ -114,6 +126,11 @@ class SubagentManager:
             ))
             tools.register(WebSearchTool(api_key=self.brave_api_key))
             tools.register(WebFetchTool())
+            results_store = ToolResultStore(
+                inline_chars=self.tool_result_inline_chars,
+                stale_chars=self.tool_result_stale_chars,
+            )
+            tools.register(ReadToolResultTool(results_store))
             
             # Build messages with subagent-specific prompt
             system_prompt = self._build_subagent_prompt(task)
@@ -139,6 +156,7 @@ class SubagentManager:
                 )
                 
                 if response.has_tool_calls:
+                    results_store.compact(messages)
                     # Add assistant message with tool calls
                     tool_call_dicts = [
                         {
@@ -157,16 +175,20 @@ class SubagentManager:
                         "tool_calls": tool_call_dicts,
                     })
                     
-                    # Execute tools
+                    # Execute tools (independent calls run in parallel)
                     for tool_call in response.tool_calls:
                         args_str = json.dumps(tool_call.arguments)
                         logger.debug(f"Subagent [{task_id}] executing: {tool_call.name} with arguments: {args_str}")
-                        result = await tools.execute(tool_call.name, tool_call.arguments)
+                    results = await tools.execute_many(
+                        [(tc.name, tc.arguments) for tc in response.tool_calls],
+                        max_concurrency=self.max_parallel_tools,
+                    )
+                    for tool_call, result in zip(response.tool_calls, results):
                         messages.append({
                             "role": "tool",
                             "tool_call_id": tool_call.id,
                             "name": tool_call.name,
-                            "content": result,
+                            "content": results_store.add(tool_call.id, result),
                         })
                 else:
                     final_result = response.content
@@ -221,6 +243,8 @@ Summarize this naturally for the user. Keep it brief (1-2 sentences). Do not men
         import time as _time
         now = datetime.now().strftime("%Y-%m-%d %H:%M (%A)")
         tz = _time.strftime("%Z") or "UTC"
+        skills_summary = self.skills.build_skills_summary()
+        skills_section = f"\n\n## Skills\n{skills_summary}" if skills_summary else ""
 
         return f"""# Subagent
 
@@ -248,7 +272,7 @@ You are a subagent spawned by the main agent to complete a specific task.
 
 ## Workspace
 Your workspace is at: {self.workspace}
-Skills are available at: {self.workspace}/skills/ (read SKILL.md files as needed)
+Skills are available at: {self.workspace}/skills/ (read SKILL.md files as needed){skills_section}
 
 When you have completed the task, provide a clear summary of your findings or actions."""
     
@@ -39,6 +39,26 @@ class Tool(ABC):
         """JSON Schema for tool parameters."""
         pass
     
+    @property
+    def read_only(self) -> bool:
+        """Whether the tool only reads state (safe to run alongside other calls)."""
+        return False
+
+    def concurrency_key(self, params: dict[str, Any]) -> str | None:
+        """
+        Resource a call touches, used to decide what may run in parallel.
+
+        Calls with the same key are serialized unless all of them are read-only.
+        A mutating tool that returns None runs exclusively.
+
+        Args:
+            params: Call parameters.
+
+        Returns:
+            Resource key, or None.
+        """
+        return None
+
     @abstractmethod
     async def execute(self, **kwargs: Any) -> str:
         """
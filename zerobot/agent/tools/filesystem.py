@@ -14,8 +14,20 @@ def _resolve_path(path: str, allowed_dir: Path | None = None) -> Path:
     return resolved
 
 
+def _path_key(path: Any) -> str | None:
+    """Concurrency key for a filesystem path."""
+    if not isinstance(path, str):
+        return None
+    try:
+        return f"fs:{Path(path).expanduser().resolve()}"
+    except Exception:
+        return f"fs:{path}"
+
+
 class ReadFileTool(Tool):
     """Tool to read file contents."""
+
+    read_only = True
     
     def __init__(self, allowed_dir: Path | None = None):
         self._allowed_dir = allowed_dir
@@ -41,6 +53,9 @@ class ReadFileTool(Tool):
             "required": ["path"]
         }
     
+    def concurrency_key(self, params: dict[str, Any]) -> str | None:
+        return _path_key(params.get("path"))
+    
     async def execute(self, path: str, **kwargs: Any) -> str:
         try:
             file_path = _resolve_path(path, self._allowed_dir)
@@ -88,6 +103,9 @@ class WriteFileTool(Tool):
             "required": ["path", "content"]
         }
     
+    def concurrency_key(self, params: dict[str, Any]) -> str | None:
+        return _path_key(params.get("path"))
+    
     async def execute(self, path: str, content: str, **kwargs: Any) -> str:
         try:
             file_path = _resolve_path(path, self._allowed_dir)
@@ -135,6 +153,9 @@ class EditFileTool(Tool):
             "required": ["path", "old_text", "new_text"]
         }
     
+    def concurrency_key(self, params: dict[str, Any]) -> str | None:
+        return _path_key(params.get("path"))
+    
     async def execute(self, path: str, old_text: str, new_text: str, **kwargs: Any) -> str:
         try:
             file_path = _resolve_path(path, self._allowed_dir)
@@ -163,6 +184,8 @@ class EditFileTool(Tool):
 
 class ListDirTool(Tool):
     """Tool to list directory contents."""
+
+    read_only = True
     
     def __init__(self, allowed_dir: Path | None = None):
         self._allowed_dir = allowed_dir
@@ -188,6 +211,9 @@ class ListDirTool(Tool):
             "required": ["path"]
         }
     
+    def concurrency_key(self, params: dict[str, Any]) -> str | None:
+        return _path_key(params.get("path"))
+    
     async def execute(self, path: str, **kwargs: Any) -> str:
         try:
             dir_path = _resolve_path(path, self._allowed_dir)
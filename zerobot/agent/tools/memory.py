@@ -0,0 +1,81 @@
+"""Memory search tool: ranked full-text search over history and past sessions."""
+
+import asyncio
+import re
+from typing import Any
+
+from zerobot.agent.memory_index import MemoryIndex
+from zerobot.agent.tools.base import Tool
+
+_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+class MemorySearchTool(Tool):
+    """Tool to search HISTORY.md and past conversations."""
+
+    read_only = True
+
+    def __init__(self, index: MemoryIndex):
+        self._index = index
+
+    @property
+    def name(self) -> str:
+        return "memory_search"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Search past events (HISTORY.md) and earlier conversations from all sessions. "
+            "Returns the best matching entries with dates and snippets."
+        )
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "query": {"type": "string", "description": "Words to search for"},
+                "source": {
+                    "type": "string",
+                    "enum": ["all", "history", "session"],
+                    "description": "Search history entries, conversation messages, or both (default)",
+                },
+                "since": {"type": "string", "description": "Only results on or after this date (YYYY-MM-DD)"},
+                "until": {"type": "string", "description": "Only results on or before this date (YYYY-MM-DD)"},
+                "limit": {"type": "integer", "minimum": 1, "maximum": 50, "description": "Max results (default 10)"},
+            },
+            "required": ["query"],
+        }
+
+    async def execute(
+        self,
+        query: str,
+        source: str = "all",
+        since: str | None = None,
+        until: str | None = None,
+        limit: int = 10,
+        **kwargs: Any,
+    ) -> str:
+        for label, value in (("since", since), ("until", until)):
+            if value and not _DATE.match(value):
+                return f"Error: '{label}' must be a date like 2026-01-31"
+        try:
+            hits = await asyncio.to_thread(
+                self._index.search,
+                query,
+                source=None if source == "all" else source,
+                since=since,
+                until=until,
+                limit=limit,
+            )
+        except Exception as e:
+            return f"Error searching memory: {str(e)}"
+
+        if not hits:
+            return f"No results for: {query}"
+        lines = [f"Results for: {query}"]
+        for i, hit in enumerate(hits, 1):
+            where = "history" if hit.source == "history" else f"session {hit.ref}, {hit.role}"
+            when = hit.timestamp[:16] or "undated"
+            lines.append(f"\n{i}. [{where}] {when}\n{hit.snippet}")
+        return "\n".join(lines)
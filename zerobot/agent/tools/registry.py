@@ -1,5 +1,6 @@
 """Tool registry for dynamic tool management."""
 
+import asyncio
 from typing import Any
 
 from zerobot.agent.tools.base import Tool
@@ -61,6 +62,73 @@ class ToolRegistry:
         except Exception as e:
             return f"Error executing {name}: {str(e)}"
     
+    async def execute_many(
+        self,
+        calls: list[tuple[str, dict[str, Any]]],
+        max_concurrency: int = 4,
+    ) -> list[str]:
+        """
+        Execute several tool calls, running independent ones in parallel.
+
+        Calls are split into ordered batches (see _plan_batches); each batch
+        runs concurrently, batches run one after another.
+
+        Args:
+            calls: (name, params) pairs in the order the model emitted them.
+            max_concurrency: Maximum calls running at once.
+
+        Returns:
+            Results in the same order as calls.
+        """
+        results: list[str] = [""] * len(calls)
+        slots = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def run(index: int) -> None:
+            name, params = calls[index]
+            async with slots:
+                results[index] = await self.execute(name, params)
+
+        for batch in self._plan_batches(calls):
+            if len(batch) == 1:
+                await run(batch[0])
+            else:
+                await asyncio.gather(*(run(i) for i in batch))
+        return results
+
+    def _plan_batches(self, calls: list[tuple[str, dict[str, Any]]]) -> list[list[int]]:
+        """Group consecutive non-conflicting calls into batches."""
+        batches: list[list[int]] = []
+        current: list[int] = []
+        # key -> True if any call in the current batch mutates it
+        touched: dict[str, bool] = {}
+
+        for i, (name, params) in enumerate(calls):
+            tool = self._tools.get(name)
+            read_only = bool(tool and tool.read_only)
+            try:
+                key = tool.concurrency_key(params) if tool else None
+            except Exception:
+                key = None
+
+            exclusive = tool is None or (key is None and not read_only)
+            conflict = key is not None and key in touched and (touched[key] or not read_only)
+
+            if exclusive or conflict:
+                if current:
+                    batches.append(current)
+                current, touched = [], {}
+            if exclusive:
+                batches.append([i])
+                continue
+
+            current.append(i)
+            if key is not None:
+                touched[key] = touched.get(key, False) or not read_only
+
+        if current:
+            batches.append(current)
+        return batches
+
     @property
     def tool_names(self) -> list[str]:
         """Get list of registered tool names."""
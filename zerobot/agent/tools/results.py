@@ -0,0 +1,158 @@
+"""Out-of-band storage for large tool results and a tool to page through them."""
+
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any
+
+from zerobot.agent.tools.base import Tool
+
+
+class ToolResultStore:
+    """
+    Keeps full tool outputs for one agent turn outside the transcript.
+
+    Large results enter the transcript as a bounded excerpt plus a handle the
+    model can pass to read_tool_result. Once the model has seen a result,
+    compact() shrinks it further so later LLM calls don't pay for it again.
+    """
+
+    def __init__(
+        self,
+        inline_chars: int = 6000,
+        stale_chars: int = 600,
+        max_total_chars: int = 2_000_000,
+    ):
+        self.inline_chars = inline_chars
+        self.stale_chars = stale_chars
+        self.max_total_chars = max_total_chars
+        self._results: OrderedDict[str, str] = OrderedDict()  # handle -> full output
+        self._by_call: dict[str, str] = {}  # tool_call_id -> handle
+        self._compacted: set[str] = set()  # tool_call_ids already shrunk
+        self._total = 0
+        self._counter = 0
+
+    def add(self, tool_call_id: str, result: str) -> str:
+        """
+        Store a tool result and return the text to put in the transcript.
+
+        Args:
+            tool_call_id: ID of the tool call that produced the result.
+            result: Full tool output.
+
+        Returns:
+            The result itself if short, otherwise an excerpt with a handle.
+        """
+        if not isinstance(result, str) or len(result) <= self.stale_chars:
+            return result
+
+        self._counter += 1
+        handle = f"result-{self._counter}"
+        self._results[handle] = result
+        self._by_call[tool_call_id] = handle
+        self._total += len(result)
+        self._evict()
+
+        if len(result) <= self.inline_chars:
+            return result
+        return (
+            f"{result[:self.inline_chars]}\n\n"
+            f"[Truncated: showing characters 0-{self.inline_chars} of {len(result)}. "
+            f"Call read_tool_result with handle \"{handle}\" and offset={self.inline_chars} to read more.]"
+        )
+
+    def read(self, handle: str, offset: int = 0, length: int | None = None) -> str:
+        """Read a page of a stored result."""
+        result = self._results.get(handle)
+        if result is None:
+            return f"Error: Unknown or expired result handle '{handle}'"
+        if offset >= len(result):
+            return f"Error: Offset {offset} is past the end of the result ({len(result)} characters)"
+
+        end = min(len(result), offset + (length or self.inline_chars))
+        page = result[offset:end]
+        if end < len(result):
+            page += (
+                f"\n\n[Showing characters {offset}-{end} of {len(result)}. "
+                f"Call read_tool_result with offset={end} to continue.]"
+            )
+        return page
+
+    def compact(self, messages: list[dict[str, Any]]) -> int:
+        """
+        Shrink stored results already present in the transcript.
+
+        Args:
+            messages: Message list; tool messages are replaced in place.
+
+        Returns:
+            Number of characters removed.
+        """
+        saved = 0
+        for i, msg in enumerate(messages):
+            call_id = msg.get("tool_call_id")
+            if msg.get("role") != "tool" or call_id in self._compacted:
+                continue
+            handle = self._by_call.get(call_id)
+            if handle is None or handle not in self._results:
+                continue
+            full = self._results[handle]
+            short = (
+                f"{full[:self.stale_chars]}\n\n"
+                f"[Earlier result shortened ({len(full)} characters). "
+                f"Call read_tool_result with handle \"{handle}\" to view it again.]"
+            )
+            self._compacted.add(call_id)
+            current = msg.get("content") or ""
+            if len(short) < len(current):
+                saved += len(current) - len(short)
+                messages[i] = {**msg, "content": short}
+        return saved
+
+    def _evict(self) -> None:
+        """Drop the oldest results once the store exceeds its size limit."""
+        while self._total > self.max_total_chars and len(self._results) > 1:
+            _, old = self._results.popitem(last=False)
+            self._total -= len(old)
+
+
+class ReadToolResultTool(Tool):
+    """Tool to page through tool results stored out of the transcript."""
+
+    read_only = True
+
+    def __init__(self, store: ToolResultStore | None = None):
+        # Per-task store, so concurrent turns only see their own results
+        self._store: ContextVar[ToolResultStore | None] = ContextVar("tool_result_store", default=store)
+
+    def set_store(self, store: ToolResultStore) -> None:
+        """Set the result store for the current turn."""
+        self._store.set(store)
+
+    @property
+    def name(self) -> str:
+        return "read_tool_result"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Read more of a long tool result that was truncated or shortened in the conversation. "
+            "Pass the handle mentioned in the truncation note."
+        )
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "handle": {"type": "string", "description": "Result handle, e.g. result-3"},
+                "offset": {"type": "integer", "minimum": 0, "description": "Character offset to start from"},
+                "length": {"type": "integer", "minimum": 1, "maximum": 50000, "description": "Characters to read"},
+            },
+            "required": ["handle"],
+        }
+
+    async def execute(self, handle: str, offset: int = 0, length: int | None = None, **kwargs: Any) -> str:
+        store = self._store.get()
+        if store is None:
+            return "Error: No stored tool results in this conversation"
+        return store.read(handle, offset, length)
@@ -33,5 +33,7 @@ class OutboundMessage:
     reply_to: str | None = None
     media: list[str] = field(default_factory=list)
     metadata: dict[str, Any] = field(default_factory=dict)
+    stream_id: str | None = None  # Groups the partial updates and final text of one streamed reply
+    partial: bool = False  # In-progress text; channels edit it in place until the final message arrives
 
 
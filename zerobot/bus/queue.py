@@ -1,80 +1,258 @@
 """Async message queue for decoupled channel-agent communication."""
 
 import asyncio
-from typing import Callable, Awaitable
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Callable
 
 from loguru import logger
 
 from zerobot.bus.events import InboundMessage, OutboundMessage
 
+# Inbound priority lanes, most urgent first
+LANES = ("system", "direct", "group")
+OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_new")
+
+
+def message_lane(msg: InboundMessage) -> int:
+    """
+    Priority lane of an inbound message (an index into LANES).
+
+    System messages (subagent results, cron) come first, then direct
+    messages, then group chats. Publishers can force a lane with
+    metadata["priority"] set to a lane name.
+    """
+    meta = msg.metadata or {}
+    if msg.channel == "system":
+        return 0
+    if meta.get("priority") in LANES:
+        return LANES.index(meta["priority"])
+    slack = meta.get("slack")
+    if (
+        meta.get("is_group")
+        or meta.get("chat_type") == "group"
+        or meta.get("guild_id")
+        or (isinstance(slack, dict) and slack.get("channel_type") not in (None, "im"))
+    ):
+        return 2
+    return 1
+
+
+@dataclass
+class QueueStats:
+    """Counters for one queue (or inbound lane)."""
+    published: int = 0
+    delivered: int = 0
+    dropped: int = 0
+    last_wait_s: float = 0.0  # Time the last delivered message spent queued
+    max_wait_s: float = 0.0
+    total_wait_s: float = 0.0
+
+    def record_wait(self, wait: float) -> None:
+        self.delivered += 1
+        self.last_wait_s = wait
+        self.max_wait_s = max(self.max_wait_s, wait)
+        self.total_wait_s += wait
+
+    def as_dict(self, depth: int) -> dict[str, Any]:
+        return {
+            "depth": depth,
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "last_wait_s": round(self.last_wait_s, 3),
+            "max_wait_s": round(self.max_wait_s, 3),
+            "avg_wait_s": round(self.total_wait_s / self.delivered, 3) if self.delivered else 0.0,
+        }
+
 
 class MessageBus:
     """
     Async message bus that decouples chat channels from the agent core.
-    
+
     Channels push messages to the inbound queue, and the agent processes
     them and pushes responses to the outbound queue.
+
+    Both queues are bounded. Inbound messages are served by priority lane
+    (see message_lane) and, within a lane, round-robin across channels and
+    then across chats, so one noisy group chat cannot starve the rest. When
+    the inbound queue is full, the overflow policy decides:
+
+    - "block": the publisher waits for space (backpressure on the channel).
+    - "drop_oldest": the oldest message of the busiest chat in the least
+      urgent lane is dropped, unless that lane is more urgent than the new
+      message, in which case the new message is dropped.
+    - "drop_new": the new message is dropped.
+
+    System messages are always accepted. A full outbound queue makes the
+    publisher wait, except for partial (streaming) updates, which are
+    dropped; the final message supersedes them anyway.
     """
-    
-    def __init__(self):
-        self.inbound: asyncio.Queue[InboundMessage] = asyncio.Queue()
-        self.outbound: asyncio.Queue[OutboundMessage] = asyncio.Queue()
-        self._outbound_subscribers: dict[str, list[Callable[[OutboundMessage], Awaitable[None]]]] = {}
-        self._running = False
-    
-    async def publish_inbound(self, msg: InboundMessage) -> None:
-        """Publish a message from a channel to the agent."""
-        await self.inbound.put(msg)
-    
-    async def consume_inbound(self) -> InboundMessage:
-        """Consume the next inbound message (blocks until available)."""
-        return await self.inbound.get()
-    
-    async def publish_outbound(self, msg: OutboundMessage) -> None:
-        """Publish a response from the agent to channels."""
-        await self.outbound.put(msg)
-    
-    async def consume_outbound(self) -> OutboundMessage:
-        """Consume the next outbound message (blocks until available)."""
-        return await self.outbound.get()
-    
-    def subscribe_outbound(
-        self, 
-        channel: str, 
-        callback: Callable[[OutboundMessage], Awaitable[None]]
-    ) -> None:
-        """Subscribe to outbound messages for a specific channel."""
-        if channel not in self._outbound_subscribers:
-            self._outbound_subscribers[channel] = []
-        self._outbound_subscribers[channel].append(callback)
-    
-    async def dispatch_outbound(self) -> None:
+
+    def __init__(self, inbound_max: int = 1000, outbound_max: int = 1000, overflow: str = "block"):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {overflow!r} (use one of {', '.join(OVERFLOW_POLICIES)})")
+        self.inbound_max = inbound_max  # 0 = unbounded
+        self.overflow = overflow
+        # lane -> channel -> chat_id -> (message, enqueued_at); dict order is the round-robin order
+        self._lanes: list[OrderedDict[str, OrderedDict[str, deque[tuple[InboundMessage, float]]]]] = [
+            OrderedDict() for _ in LANES
+        ]
+        self._inbound_count = 0
+        self._inbound_changed = asyncio.Condition()
+        self._lane_stats = [QueueStats() for _ in LANES]
+        self.outbound: asyncio.Queue[tuple[OutboundMessage, float]] = asyncio.Queue(outbound_max)
+        self._outbound_stats = QueueStats()
+
+    async def publish_inbound(self, msg: InboundMessage) -> bool:
         """
-        Dispatch outbound messages to subscribed channels.
-        Run this as a background task.
+        Publish a message from a channel to the agent.
+
+        Returns:
+            False if the message was dropped by the overflow policy.
         """
-        self._running = True
-        while self._running:
-            try:
-                msg = await asyncio.wait_for(self.outbound.get(), timeout=1.0)
-                subscribers = self._outbound_subscribers.get(msg.channel, [])
-                for callback in subscribers:
-                    try:
-                        await callback(msg)
-                    except Exception as e:
-                        logger.error(f"Error dispatching to {msg.channel}: {e}")
-            except asyncio.TimeoutError:
+        lane = message_lane(msg)
+        async with self._inbound_changed:
+            if lane > 0 and self.inbound_max and self._inbound_count >= self.inbound_max:
+                if self.overflow == "block":
+                    await self._inbound_changed.wait_for(lambda: self._inbound_count < self.inbound_max)
+                elif self.overflow == "drop_new" or not self._evict(lane):
+                    self._lane_stats[lane].published += 1
+                    self._record_drop(lane, msg)
+                    return False
+            self._lanes[lane].setdefault(msg.channel, OrderedDict()).setdefault(msg.chat_id, deque()).append(
+                (msg, time.monotonic())
+            )
+            self._inbound_count += 1
+            self._lane_stats[lane].published += 1
+            self._inbound_changed.notify_all()
+        return True
+
+    async def consume_inbound(self, ready: Callable[[InboundMessage], bool] | None = None) -> InboundMessage:
+        """
+        Consume the next inbound message (blocks until available).
+
+        Args:
+            ready: If given, chats whose next message fails this check are
+                skipped (their messages stay queued, in order). Call
+                notify_inbound() when the check may have changed.
+        """
+        async with self._inbound_changed:
+            while (msg := self._pop(ready)) is None:
+                await self._inbound_changed.wait()
+            self._inbound_changed.notify_all()  # Wake a blocked publisher
+            return msg
+
+    async def notify_inbound(self) -> None:
+        """Wake consumers so that they re-check which queued chats are ready."""
+        async with self._inbound_changed:
+            self._inbound_changed.notify_all()
+
+    def _pop(self, ready: Callable[[InboundMessage], bool] | None = None) -> InboundMessage | None:
+        for lane, channels in enumerate(self._lanes):
+            for channel, chats in channels.items():
+                for chat_id, queue in chats.items():
+                    if ready is None or ready(queue[0][0]):
+                        break
+                else:
+                    continue
+                msg, enqueued_at = queue.popleft()
+                # Rotate: this chat (and channel) goes to the back of the line
+                if queue:
+                    chats.move_to_end(chat_id)
+                else:
+                    del chats[chat_id]
+                if chats:
+                    channels.move_to_end(channel)
+                else:
+                    del channels[channel]
+                self._inbound_count -= 1
+                self._lane_stats[lane].record_wait(time.monotonic() - enqueued_at)
+                return msg
+        return None
+
+    def _evict(self, lane: int) -> bool:
+        """Drop one queued message to make room for a message in `lane`. Returns False if none may go."""
+        for victim in range(len(LANES) - 1, lane - 1, -1):
+            channels = self._lanes[victim]
+            if victim == 0 or not channels:
                 continue
-    
-    def stop(self) -> None:
-        """Stop the dispatcher loop."""
-        self._running = False
-    
+            # The oldest message of the chat with the most messages queued
+            channel, chat_id, queue = max(
+                ((ch, cid, q) for ch, chats in channels.items() for cid, q in chats.items()),
+                key=lambda item: len(item[2]),
+            )
+            msg, _ = queue.popleft()
+            if not queue:
+                del channels[channel][chat_id]
+                if not channels[channel]:
+                    del channels[channel]
+            self._inbound_count -= 1
+            self._record_drop(victim, msg)
+            return True
+        return False
+
+    def _record_drop(self, lane: int, msg: InboundMessage) -> None:
+        stats = self._lane_stats[lane]
+        stats.dropped += 1
+        logger.warning(
+            f"Inbound queue full ({self._inbound_count}/{self.inbound_max}): dropped a {LANES[lane]} message "
+            f"from {msg.channel}:{msg.chat_id} ({stats.dropped} {LANES[lane]} messages dropped so far)"
+        )
+
+    async def publish_outbound(self, msg: OutboundMessage) -> bool:
+        """
+        Publish a response from the agent to channels.
+
+        Returns:
+            False if the message (a partial update) was dropped because the queue is full.
+        """
+        self._outbound_stats.published += 1
+        item = (msg, time.monotonic())
+        if not msg.partial:
+            await self.outbound.put(item)
+            return True
+        try:
+            self.outbound.put_nowait(item)
+        except asyncio.QueueFull:
+            self._outbound_stats.dropped += 1
+            return False
+        return True
+
+    async def consume_outbound(self) -> OutboundMessage:
+        """Consume the next outbound message (blocks until available)."""
+        msg, enqueued_at = await self.outbound.get()
+        self._outbound_stats.record_wait(time.monotonic() - enqueued_at)
+        return msg
+
+    def snapshot(self) -> dict[str, Any]:
+        """Queue depths, drop counts and wait times, per inbound lane and channel."""
+        by_channel: dict[str, int] = {}
+        lanes = {}
+        for name, channels, stats in zip(LANES, self._lanes, self._lane_stats):
+            depth = 0
+            for channel, chats in channels.items():
+                n = sum(len(q) for q in chats.values())
+                by_channel[channel] = by_channel.get(channel, 0) + n
+                depth += n
+            lanes[name] = stats.as_dict(depth)
+        return {
+            "inbound": {
+                "depth": self._inbound_count,
+                "max": self.inbound_max,
+                "overflow": self.overflow,
+                "lanes": lanes,
+                "channels": by_channel,
+            },
+            "outbound": {"max": self.outbound.maxsize, **self._outbound_stats.as_dict(self.outbound.qsize())},
+        }
+
     @property
     def inbound_size(self) -> int:
         """Number of pending inbound messages."""
-        return self.inbound.qsize()
-    
+        return self._inbound_count
+
     @property
     def outbound_size(self) -> int:
         """Number of pending outbound messages."""
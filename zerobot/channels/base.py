@@ -7,6 +7,7 @@ from loguru import logger
 
 from zerobot.bus.events import InboundMessage, OutboundMessage
 from zerobot.bus.queue import MessageBus
+from zerobot.channels.coalesce import InboundCoalescer
 
 
 class BaseChannel(ABC):
@@ -18,6 +19,7 @@ class BaseChannel(ABC):
     """
     
     name: str = "base"
+    supports_streaming: bool = False  # Can edit a sent message in place (see OutboundMessage.partial)
     
     def __init__(self, config: Any, bus: MessageBus):
         """
@@ -30,6 +32,7 @@ class BaseChannel(ABC):
         self.config = config
         self.bus = bus
         self._running = False
+        self.coalescer: InboundCoalescer | None = None  # Set by ChannelManager when coalescing is enabled
     
     @abstractmethod
     async def start(self) -> None:
@@ -53,8 +56,18 @@ class BaseChannel(ABC):
         """
         Send a message through this channel.
         
+        Channels with supports_streaming receive partial messages too: the first
+        partial of a stream_id should post a placeholder, later ones edit it, and
+        the final (non-partial) message with the same stream_id replaces it.
+        
         Args:
             msg: The message to send.
+        
+        Raises:
+            Exception: If the message could not be sent. The outbound worker
+                pool counts the failure and retries final messages; partial
+                updates are best-effort and may fail silently. Raise
+                PartialSendError if part of the message already went out.
         """
         pass
     
@@ -94,7 +107,8 @@ class BaseChannel(ABC):
         """
         Handle an incoming message from the chat platform.
         
-        This method checks permissions and forwards to the bus.
+        This method checks permissions and forwards to the bus (through the
+        coalescer, if any, which may merge it with the chat's next messages).
         
         Args:
             sender_id: The sender's identifier.
@@ -119,7 +133,10 @@ class BaseChannel(ABC):
             metadata=metadata or {}
         )
         
-        await self.bus.publish_inbound(msg)
+        if self.coalescer:
+            await self.coalescer.add(msg)
+        else:
+            await self.bus.publish_inbound(msg)
     
     @property
     def is_running(self) -> bool:
@@ -0,0 +1,125 @@
+"""Merging bursts of inbound messages from one chat into a single turn."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from zerobot.bus.events import InboundMessage
+
+
+@dataclass
+class _Burst:
+    messages: list[InboundMessage] = field(default_factory=list)
+    first_at: float = 0.0
+    timer: asyncio.Task | None = None
+
+
+class InboundCoalescer:
+    """
+    Holds a chat's messages briefly so a burst becomes one agent turn.
+
+    A message is published once no further message from the same chat has
+    arrived for `window_s`, or `max_delay_s` after the first message of
+    the burst, or when `max_messages` are waiting, whichever comes first.
+    A message that mentions the bot (metadata["was_mentioned"], which the
+    Telegram, Discord, Feishu, Slack and Mochat channels set) flushes
+    the burst it completes immediately; a slash command is never merged:
+    the waiting burst goes first, then the command on its own.
+    """
+
+    def __init__(
+        self,
+        publish: Callable[[InboundMessage], Awaitable[object]],
+        window_s: float,
+        max_delay_s: float,
+        max_messages: int = 20,
+    ):
+        self._publish = publish
+        self.window_s = window_s
+        self.max_delay_s = max(max_delay_s, window_s)
+        self.max_messages = max(1, max_messages)
+        self._bursts: dict[str, _Burst] = {}
+        self.merged = 0  # Messages that did not need a turn of their own
+
+    async def add(self, msg: InboundMessage) -> None:
+        key = msg.session_key
+        if msg.content.strip().startswith("/"):
+            await self.flush(key)
+            await self._publish(msg)
+            return
+
+        burst = self._bursts.setdefault(key, _Burst(first_at=time.monotonic()))
+        burst.messages.append(msg)
+        if msg.metadata.get("was_mentioned") or len(burst.messages) >= self.max_messages:
+            await self.flush(key)
+            return
+
+        if burst.timer:
+            burst.timer.cancel()
+        delay = min(self.window_s, burst.first_at + self.max_delay_s - time.monotonic())
+        burst.timer = asyncio.create_task(self._flush_after(key, max(0.0, delay)))
+
+    async def _flush_after(self, key: str, delay: float) -> None:
+        await asyncio.sleep(delay)
+        burst = self._bursts.get(key)
+        if burst and burst.timer is asyncio.current_task():
+            burst.timer = None  # Don't cancel ourselves mid-publish
+        await self.flush(key)
+
+    async def flush(self, key: str) -> None:
+        """Publish a chat's waiting messages now (as one message)."""
+        burst = self._bursts.pop(key, None)
+        if not burst or not burst.messages:
+            return
+        if burst.timer:
+            burst.timer.cancel()
+        self.merged += len(burst.messages) - 1
+        await self._publish(merge_messages(burst.messages))
+
+    async def flush_all(self) -> None:
+        for key in list(self._bursts):
+            await self.flush(key)
+
+    @property
+    def pending(self) -> int:
+        """Messages currently held back."""
+        return sum(len(b.messages) for b in self._bursts.values())
+
+
+def merge_messages(messages: list[InboundMessage]) -> InboundMessage:
+    """
+    Combine messages from one chat into one.
+
+    Texts are joined by newlines; when several people wrote, each line is
+    prefixed with its sender. The last message supplies the metadata
+    (reply target, thread, ...), with "coalesced_count" added.
+    """
+    if len(messages) == 1:
+        return messages[0]
+    last = messages[-1]
+    several = len({m.sender_id for m in messages}) > 1
+    lines = []
+    for m in messages:
+        if not m.content:
+            continue
+        if several:
+            name = m.metadata.get("sender_name") or m.metadata.get("username") or m.sender_id
+            lines.append(f"{name}: {m.content}")
+        else:
+            lines.append(m.content)
+    return InboundMessage(
+        channel=last.channel,
+        sender_id=last.sender_id,
+        chat_id=last.chat_id,
+        content="\n".join(lines),
+        timestamp=messages[0].timestamp,
+        media=[path for m in messages for path in m.media],
+        metadata={
+            **last.metadata,
+            "was_mentioned": any(m.metadata.get("was_mentioned") for m in messages),
+            "coalesced_count": len(messages),
+        },
+    )
@@ -12,6 +12,7 @@ from zerobot.bus.events import OutboundMessage
 from zerobot.bus.queue import MessageBus
 from zerobot.channels.base import BaseChannel
 from zerobot.config.schema import DingTalkConfig
+from zerobot.utils.http import get_http_client
 
 try:
     from dingtalk_stream import (
@@ -123,7 +124,7 @@ class DingTalkChannel(BaseChannel):
                 return
 
             self._running = True
-            self._http = httpx.AsyncClient()
+            self._http = get_http_client()
 
             logger.info(
                 f"Initializing DingTalk Stream Client with Client ID: {self.config.client_id}..."
@@ -153,10 +154,7 @@ class DingTalkChannel(BaseChannel):
     async def stop(self) -> None:
         """Stop the DingTalk bot."""
         self._running = False
-        # Close the shared HTTP client
-        if self._http:
-            await self._http.aclose()
-            self._http = None
+        self._http = None  # Shared client; the pool owns its connections
         # Cancel outstanding background tasks
         for task in self._background_tasks:
             task.cancel()
@@ -193,7 +191,7 @@ class DingTalkChannel(BaseChannel):
         """Send a message through DingTalk."""
         token = await self._get_access_token()
         if not token:
-            return
+            raise RuntimeError("DingTalk access token unavailable")
 
         # oToMessages/batchSend: sends to individual users (private chat)
         # https://open.dingtalk.com/document/orgapp/robot-batch-send-messages
@@ -212,17 +210,12 @@ class DingTalkChannel(BaseChannel):
         }
 
         if not self._http:
-            logger.warning("DingTalk HTTP client not initialized, cannot send")
-            return
+            raise RuntimeError("DingTalk HTTP client not initialized")
 
-        try:
-            resp = await self._http.post(url, json=data, headers=headers)
-            if resp.status_code != 200:
-                logger.error(f"DingTalk send failed: {resp.text}")
-            else:
-                logger.debug(f"DingTalk message sent to {msg.chat_id}")
-        except Exception as e:
-            logger.error(f"Error sending DingTalk message: {e}")
+        resp = await self._http.post(url, json=data, headers=headers)
+        if resp.status_code != 200:
+            raise RuntimeError(f"DingTalk send failed ({resp.status_code}): {resp.text}")
+        logger.debug(f"DingTalk message sent to {msg.chat_id}")
 
     async def _on_message(self, content: str, sender_id: str, sender_name: str) -> None:
         """Handle incoming message (called by ZerobotDingTalkHandler).
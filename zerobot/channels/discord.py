@@ -13,6 +13,7 @@ from zerobot.bus.events import OutboundMessage
 from zerobot.bus.queue import MessageBus
 from zerobot.channels.base import BaseChannel
 from zerobot.config.schema import DiscordConfig
+from zerobot.utils.http import get_http_client
 
 
 DISCORD_API_BASE = "https://discord.com/api/v10"
@@ -23,6 +24,7 @@ class DiscordChannel(BaseChannel):
     """Discord channel using Gateway websocket."""
 
     name = "discord"
+    supports_streaming = True
 
     def __init__(self, config: DiscordConfig, bus: MessageBus):
         super().__init__(config, bus)
@@ -32,6 +34,8 @@ class DiscordChannel(BaseChannel):
         self._heartbeat_task: asyncio.Task | None = None
         self._typing_tasks: dict[str, asyncio.Task] = {}
         self._http: httpx.AsyncClient | None = None
+        self._streams: dict[str, str] = {}  # stream_id -> placeholder message id
+        self._bot_user_id: str | None = None  # From the gateway READY event
 
     async def start(self) -> None:
         """Start the Discord gateway connection."""
@@ -40,7 +44,7 @@ class DiscordChannel(BaseChannel):
             return
 
         self._running = True
-        self._http = httpx.AsyncClient(timeout=30.0)
+        self._http = get_http_client()
 
         while self._running:
             try:
@@ -68,44 +72,56 @@ class DiscordChannel(BaseChannel):
         if self._ws:
             await self._ws.close()
             self._ws = None
-        if self._http:
-            await self._http.aclose()
-            self._http = None
+        self._http = None
 
     async def send(self, msg: OutboundMessage) -> None:
         """Send a message through Discord REST API."""
         if not self._http:
-            logger.warning("Discord HTTP client not initialized")
-            return
+            raise RuntimeError("Discord HTTP client not initialized")
 
         url = f"{DISCORD_API_BASE}/channels/{msg.chat_id}/messages"
-        payload: dict[str, Any] = {"content": msg.content}
-
-        if msg.reply_to:
+        payload: dict[str, Any] = {"content": msg.content[:2000] if msg.partial else msg.content}
+
+        # Streamed replies: post a placeholder once, then edit it in place
+        method = "POST"
+        message_id = self._streams.get(msg.stream_id) if msg.stream_id else None
+        if not msg.partial and msg.stream_id:
+            self._streams.pop(msg.stream_id, None)
+        if message_id:
+            method = "PATCH"
+            url = f"{url}/{message_id}"
+        elif msg.reply_to:
             payload["message_reference"] = {"message_id": msg.reply_to}
             payload["allowed_mentions"] = {"replied_user": False}
 
         headers = {"Authorization": f"Bot {self.config.token}"}
 
         try:
-            for attempt in range(3):
+            # Partial updates are best-effort: a single attempt, no retries
+            attempts = 1 if msg.partial else 3
+            for attempt in range(attempts):
                 try:
-                    response = await self._http.post(url, headers=headers, json=payload)
+                    response = await self._http.request(method, url, headers=headers, json=payload)
                     if response.status_code == 429:
+                        if msg.partial:
+                            return
                         data = response.json()
                         retry_after = float(data.get("retry_after", 1.0))
                         logger.warning(f"Discord rate limited, retrying in {retry_after}s")
                         await asyncio.sleep(retry_after)
                         continue
                     response.raise_for_status()
+                    if msg.partial and msg.stream_id and method == "POST":
+                        self._streams[msg.stream_id] = response.json().get("id")
                     return
-                except Exception as e:
-                    if attempt == 2:
-                        logger.error(f"Error sending Discord message: {e}")
-                    else:
-                        await asyncio.sleep(1)
+                except Exception:
+                    if attempt == attempts - 1:
+                        raise
+                    await asyncio.sleep(1)
+            raise RuntimeError("Discord rate limit persisted after retries")
         finally:
-            await self._stop_typing(msg.chat_id)
+            if not msg.partial:
+                await self._stop_typing(msg.chat_id)
 
     async def _gateway_loop(self) -> None:
         """Main gateway loop: identify, heartbeat, dispatch events."""
@@ -133,6 +149,7 @@ class DiscordChannel(BaseChannel):
                 await self._start_heartbeat(interval_ms / 1000)
                 await self._identify()
             elif op == 0 and event_type == "READY":
+                self._bot_user_id = str((payload.get("user") or {}).get("id", "")) or None
                 logger.info("Discord gateway READY")
             elif op == 0 and event_type == "MESSAGE_CREATE":
                 await self._handle_message_create(payload)
@@ -222,7 +239,12 @@ class DiscordChannel(BaseChannel):
                 logger.warning(f"Failed to download Discord attachment: {e}")
                 content_parts.append(f"[attachment: {filename} - download failed]")
 
-        reply_to = (payload.get("referenced_message") or {}).get("id")
+        referenced = payload.get("referenced_message") or {}
+        reply_to = referenced.get("id")
+        was_mentioned = bool(self._bot_user_id) and (
+            any(str(m.get("id")) == self._bot_user_id for m in payload.get("mentions") or [])
+            or str((referenced.get("author") or {}).get("id")) == self._bot_user_id
+        )
 
         await self._start_typing(channel_id)
 
@@ -235,6 +257,7 @@ class DiscordChannel(BaseChannel):
                 "message_id": str(payload.get("id", "")),
                 "guild_id": payload.get("guild_id"),
                 "reply_to": reply_to,
+                "was_mentioned": was_mentioned,
             },
         )
 
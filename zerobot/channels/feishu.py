@@ -108,6 +108,7 @@ class FeishuChannel(BaseChannel):
         self._ws_thread: threading.Thread | None = None
         self._processed_message_ids: OrderedDict[str, None] = OrderedDict()  # Ordered dedup cache
         self._loop: asyncio.AbstractEventLoop | None = None
+        self._bot_open_id: str | None = None
     
     async def start(self) -> None:
         """Start the Feishu bot with WebSocket long connection."""
@@ -129,6 +130,8 @@ class FeishuChannel(BaseChannel):
             .log_level(lark.LogLevel.INFO) \
             .build()
         
+        self._bot_open_id = await asyncio.get_running_loop().run_in_executor(None, self._fetch_bot_open_id)
+        
         # Create event handler (only register message receive, ignore other events)
         event_handler = lark.EventDispatcherHandler.builder(
             self.config.encrypt_key or "",
@@ -175,6 +178,28 @@ class FeishuChannel(BaseChannel):
                 logger.warning(f"Error stopping WebSocket client: {e}")
         logger.info("Feishu bot stopped")
     
+    def _fetch_bot_open_id(self) -> str | None:
+        """Look up the bot's own open_id, to tell mentions of the bot from other mentions."""
+        try:
+            request = lark.BaseRequest.builder() \
+                .http_method(lark.HttpMethod.GET) \
+                .uri("/open-apis/bot/v3/info") \
+                .token_types({lark.AccessTokenType.TENANT}) \
+                .build()
+            response = self._client.request(request)
+            return json.loads(response.raw.content).get("bot", {}).get("open_id") or None
+        except Exception as e:
+            logger.warning(f"Could not get Feishu bot info, treating any mention as a mention of the bot: {e}")
+            return None
+    
+    def _is_mentioned(self, message: Any) -> bool:
+        """Whether a message @-mentions the bot."""
+        for mention in getattr(message, "mentions", None) or []:
+            open_id = mention.id.open_id if mention.id else None
+            if self._bot_open_id is None or open_id == self._bot_open_id:
+                return True
+        return False
+    
     def _add_reaction_sync(self, message_id: str, emoji_type: str) -> None:
         """Sync helper for adding reaction (runs in thread pool)."""
         try:
@@ -287,47 +312,41 @@ class FeishuChannel(BaseChannel):
     async def send(self, msg: OutboundMessage) -> None:
         """Send a message through Feishu."""
         if not self._client:
-            logger.warning("Feishu client not initialized")
-            return
+            raise RuntimeError("Feishu client not initialized")
         
-        try:
-            # Determine receive_id_type based on chat_id format
-            # open_id starts with "ou_", chat_id starts with "oc_"
-            if msg.chat_id.startswith("oc_"):
-                receive_id_type = "chat_id"
-            else:
-                receive_id_type = "open_id"
-            
-            # Build card with markdown + table support
-            elements = self._build_card_elements(msg.content)
-            card = {
-                "config": {"wide_screen_mode": True},
-                "elements": elements,
-            }
-            content = json.dumps(card, ensure_ascii=False)
-            
-            request = CreateMessageRequest.builder() \
-                .receive_id_type(receive_id_type) \
-                .request_body(
-                    CreateMessageRequestBody.builder()
-                    .receive_id(msg.chat_id)
-                    .msg_type("interactive")
-                    .content(content)
-                    .build()
-                ).build()
-            
-            response = self._client.im.v1.message.create(request)
-            
-            if not response.success():
-                logger.error(
-                    f"Failed to send Feishu message: code={response.code}, "
-                    f"msg={response.msg}, log_id={response.get_log_id()}"
-                )
-            else:
-                logger.debug(f"Feishu message sent to {msg.chat_id}")
-                
-        except Exception as e:
-            logger.error(f"Error sending Feishu message: {e}")
+        # Determine receive_id_type based on chat_id format
+        # open_id starts with "ou_", chat_id starts with "oc_"
+        if msg.chat_id.startswith("oc_"):
+            receive_id_type = "chat_id"
+        else:
+            receive_id_type = "open_id"
+        
+        # Build card with markdown + table support
+        elements = self._build_card_elements(msg.content)
+        card = {
+            "config": {"wide_screen_mode": True},
+            "elements": elements,
+        }
+        content = json.dumps(card, ensure_ascii=False)
+        
+        request = CreateMessageRequest.builder() \
+            .receive_id_type(receive_id_type) \
+            .request_body(
+                CreateMessageRequestBody.builder()
+                .receive_id(msg.chat_id)
+                .msg_type("interactive")
+                .content(content)
+                .build()
+            ).build()
+        
+        response = self._client.im.v1.message.create(request)
+        
+        if not response.success():
+            raise RuntimeError(
+                f"Failed to send Feishu message: code={response.code}, "
+                f"msg={response.msg}, log_id={response.get_log_id()}"
+            )
+        logger.debug(f"Feishu message sent to {msg.chat_id}")
     
     def _on_message_sync(self, data: "P2ImMessageReceiveV1") -> None:
         """
@@ -395,6 +414,7 @@ class FeishuChannel(BaseChannel):
                     "message_id": message_id,
                     "chat_type": chat_type,
                     "msg_type": msg_type,
+                    "was_mentioned": self._is_mentioned(message),
                 }
             )
             
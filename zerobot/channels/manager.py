@@ -7,9 +7,10 @@ from typing import Any
 
 from loguru import logger
 
-from zerobot.bus.events import OutboundMessage
 from zerobot.bus.queue import MessageBus
 from zerobot.channels.base import BaseChannel
+from zerobot.channels.coalesce import InboundCoalescer
+from zerobot.channels.outbound import OutboundWorkerPool, Sink
 from zerobot.config.schema import Config
 
 
@@ -21,15 +22,29 @@ class ChannelManager:
     - Initialize enabled channels (Telegram, WhatsApp, etc.)
     - Start/stop channels
     - Route outbound messages
+
+    Each channel sends through its own OutboundWorkerPool, so a slow or
+    rate-limited platform only delays its own messages.
     """
     
     def __init__(self, config: Config, bus: MessageBus):
         self.config = config
         self.bus = bus
         self.channels: dict[str, BaseChannel] = {}
+        self.senders: dict[str, OutboundWorkerPool] = {}
         self._dispatch_task: asyncio.Task | None = None
         
         self._init_channels()
+        for name, channel in self.channels.items():
+            self._sender(name).sinks.append(channel.send)
+            coalesce = self.config.channels.coalesce_overrides.get(name, self.config.channels.coalesce)
+            if coalesce.window_ms > 0:
+                channel.coalescer = InboundCoalescer(
+                    self.bus.publish_inbound,
+                    window_s=coalesce.window_ms / 1000,
+                    max_delay_s=coalesce.max_delay_ms / 1000,
+                    max_messages=coalesce.max_messages,
+                )
     
     def _init_channels(self) -> None:
         """Initialize channels based on config."""
@@ -137,6 +152,29 @@ class ChannelManager:
             except ImportError as e:
                 logger.warning(f"QQ channel not available: {e}")
     
+    def _sender(self, name: str) -> OutboundWorkerPool:
+        """The outbound worker pool of a channel, created on first use."""
+        if name not in self.senders:
+            opts = self.config.channels.outbound_overrides.get(name, self.config.channels.outbound)
+            self.senders[name] = OutboundWorkerPool(
+                name,
+                sinks=[],
+                workers=opts.workers,
+                max_queue=opts.queue_size,
+                max_retries=opts.max_retries,
+                retry_backoff_s=opts.retry_backoff_s,
+                rate_limit_per_s=opts.rate_limit_per_s,
+                burst=opts.burst,
+            )
+        return self.senders[name]
+
+    def subscribe(self, channel: str, callback: Sink) -> None:
+        """Also deliver a channel's outbound messages to `callback` (e.g. a bridge or a logger)."""
+        sender = self._sender(channel)
+        sender.sinks.append(callback)
+        if self._dispatch_task is not None:  # Already running: start_all() won't start it
+            sender.start()
+
     async def _start_channel(self, name: str, channel: BaseChannel) -> None:
         """Start a channel and log any exceptions."""
         try:
@@ -150,7 +188,9 @@ class ChannelManager:
             logger.warning("No channels enabled")
             return
         
-        # Start outbound dispatcher
+        # Start outbound dispatcher and senders
+        for sender in self.senders.values():
+            sender.start()
         self._dispatch_task = asyncio.create_task(self._dispatch_outbound())
         
         # Start channels
@@ -173,17 +213,23 @@ class ChannelManager:
                 await self._dispatch_task
             except asyncio.CancelledError:
                 pass
+            self._dispatch_task = None
+        
+        # Let queued replies go out while the channels are still connected
+        await asyncio.gather(*(sender.stop() for sender in self.senders.values()))
         
         # Stop all channels
         for name, channel in self.channels.items():
             try:
+                if channel.coalescer:
+                    await channel.coalescer.flush_all()
                 await channel.stop()
                 logger.info(f"Stopped {name} channel")
             except Exception as e:
                 logger.error(f"Error stopping {name}: {e}")
     
     async def _dispatch_outbound(self) -> None:
-        """Dispatch outbound messages to the appropriate channel."""
+        """Hand outbound messages to the sender of their channel (never waits on a send)."""
         logger.info("Outbound dispatcher started")
         
         while True:
@@ -193,12 +239,12 @@ class ChannelManager:
                     timeout=1.0
                 )
                 
-                channel = self.channels.get(msg.channel)
-                if channel:
-                    try:
-                        await channel.send(msg)
-                    except Exception as e:
-                        logger.error(f"Error sending to {msg.channel}: {e}")
+                sender = self.senders.get(msg.channel)
+                if sender:
+                    channel = self.channels.get(msg.channel)
+                    if msg.partial and not (channel and channel.supports_streaming):
+                        continue
+                    sender.submit(msg)
                 else:
                     logger.warning(f"Unknown channel: {msg.channel}")
                     
@@ -216,7 +262,9 @@ class ChannelManager:
         return {
             name: {
                 "enabled": True,
-                "running": channel.is_running
+                "running": channel.is_running,
+                "outbound": self.senders[name].snapshot(),
+                "coalesced": channel.coalescer.merged if channel.coalescer else 0,
             }
             for name, channel in self.channels.items()
         }
@@ -17,6 +17,7 @@ from zerobot.bus.queue import MessageBus
 from zerobot.channels.base import BaseChannel
 from zerobot.config.schema import MochatConfig
 from zerobot.utils.helpers import get_data_path
+from zerobot.utils.http import get_http_client
 
 try:
     import socketio
@@ -255,7 +256,7 @@ class MochatChannel(BaseChannel):
             return
 
         self._running = True
-        self._http = httpx.AsyncClient(timeout=30.0)
+        self._http = get_http_client()
         self._state_dir.mkdir(parents=True, exist_ok=True)
         await self._load_session_cursors()
         self._seed_targets_from_config()
@@ -290,16 +291,13 @@ class MochatChannel(BaseChannel):
             self._cursor_save_task = None
         await self._save_session_cursors()
 
-        if self._http:
-            await self._http.aclose()
-            self._http = None
+        self._http = None
         self._ws_connected = self._ws_ready = False
 
     async def send(self, msg: OutboundMessage) -> None:
         """Send outbound message to session or panel."""
         if not self.config.claw_token:
-            logger.warning("Mochat claw_token missing, skip send")
-            return
+            raise RuntimeError("Mochat claw_token missing")
 
         parts = ([msg.content.strip()] if msg.content and msg.content.strip() else [])
         if msg.media:
@@ -310,19 +308,15 @@ class MochatChannel(BaseChannel):
 
         target = resolve_mochat_target(msg.chat_id)
         if not target.id:
-            logger.warning("Mochat outbound target is empty")
-            return
+            raise ValueError(f"Mochat outbound target is empty: {msg.chat_id!r}")
 
         is_panel = (target.is_panel or target.id in self._panel_set) and not target.id.startswith("session_")
-        try:
-            if is_panel:
-                await self._api_send("/api/claw/groups/panels/send", "panelId", target.id,
-                                     content, msg.reply_to, self._read_group_id(msg.metadata))
-            else:
-                await self._api_send("/api/claw/sessions/send", "sessionId", target.id,
-                                     content, msg.reply_to)
-        except Exception as e:
-            logger.error(f"Failed to send Mochat message: {e}")
+        if is_panel:
+            await self._api_send("/api/claw/groups/panels/send", "panelId", target.id,
+                                 content, msg.reply_to, self._read_group_id(msg.metadata))
+        else:
+            await self._api_send("/api/claw/sessions/send", "sessionId", target.id,
+                                 content, msg.reply_to)
 
     # ---- config / init helpers ---------------------------------------------
 
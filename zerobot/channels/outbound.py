@@ -0,0 +1,203 @@
+"""Per-channel outbound delivery workers."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from loguru import logger
+
+from zerobot.bus.events import OutboundMessage
+
+Sink = Callable[[OutboundMessage], Awaitable[None]]
+
+
+class PartialSendError(Exception):
+    """
+    A send failed after part of the message (e.g. the first chunks of a
+    long reply) was already delivered.
+
+    Retrying the whole message would duplicate what went out, so the pool
+    retries only `remaining`, the part that was not sent.
+    """
+
+    def __init__(self, remaining: OutboundMessage):
+        super().__init__(f"message to {remaining.channel}:{remaining.chat_id} only partly sent")
+        self.remaining = remaining
+
+
+@dataclass
+class DeliveryStats:
+    """Delivery counters for one channel."""
+    queued: int = 0  # Messages waiting for a worker
+    delivered: int = 0  # Messages handled by a worker (sent or failed)
+    sent: int = 0
+    failed: int = 0  # Gave up after retries
+    retried: int = 0
+    dropped: int = 0  # Partial updates dropped (queue full, or superseded by a newer update)
+    last_latency_s: float = 0.0  # From hand-off to the channel to the send completing
+    max_latency_s: float = 0.0
+    total_latency_s: float = 0.0
+
+
+class RateLimiter:
+    """Token bucket: `rate` sends per second on average, bursts of up to `burst`."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._stamp = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._tokens = 1.0
+                self._stamp = time.monotonic()
+            self._tokens -= 1
+
+
+class OutboundWorkerPool:
+    """
+    Sends one channel's outbound messages, independently of other channels.
+
+    Messages are spread over `workers` queues by chat, so each chat's
+    messages go out in order while (with more than one worker) different
+    chats are sent to in parallel. Sends share the channel's rate limit.
+    A send that raises is retried with exponential backoff (after a
+    PartialSendError, only the unsent remainder is); partial (streaming)
+    updates are never retried, and one still queued behind a
+    newer update of the same stream is skipped.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        sinks: list[Sink],
+        workers: int = 1,
+        max_queue: int = 1000,
+        max_retries: int = 2,
+        retry_backoff_s: float = 1.0,
+        rate_limit_per_s: float = 0.0,
+        burst: int = 1,
+    ):
+        self.name = name
+        self.sinks = sinks
+        self.max_queue = max_queue  # Partial updates beyond this are dropped; final messages never are
+        self.max_retries = max_retries
+        self.retry_backoff_s = retry_backoff_s
+        self.stats = DeliveryStats()
+        self._limiter = RateLimiter(rate_limit_per_s, burst)
+        self._queues: list[asyncio.Queue[tuple[OutboundMessage, float, int]]] = [
+            asyncio.Queue() for _ in range(max(1, workers))
+        ]
+        self._tasks: list[asyncio.Task[None]] = []
+        self._seq = 0
+        self._stream_seq: dict[str, int] = {}  # stream_id -> newest queued update
+
+    def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._work(q)) for q in self._queues]
+
+    def submit(self, msg: OutboundMessage) -> bool:
+        """
+        Queue a message without waiting.
+
+        Returns:
+            False if it was a partial update dropped because the queue is full.
+        """
+        if msg.partial and self.stats.queued >= self.max_queue:
+            self.stats.dropped += 1
+            return False
+        self._seq += 1
+        if msg.stream_id:
+            self._stream_seq[msg.stream_id] = self._seq
+        queue = self._queues[hash(msg.chat_id) % len(self._queues)]
+        queue.put_nowait((msg, time.monotonic(), self._seq))
+        self.stats.queued += 1
+        return True
+
+    async def _work(self, queue: asyncio.Queue[tuple[OutboundMessage, float, int]]) -> None:
+        while True:
+            msg, enqueued_at, seq = await queue.get()
+            try:
+                newest = self._stream_seq.get(msg.stream_id) if msg.stream_id else None
+                if msg.partial and newest is not None and newest > seq:
+                    self.stats.dropped += 1
+                    continue
+                if newest == seq:
+                    self._stream_seq.pop(msg.stream_id, None)
+                await self._deliver(msg)
+                self.stats.delivered += 1
+                latency = time.monotonic() - enqueued_at
+                self.stats.last_latency_s = latency
+                self.stats.max_latency_s = max(self.stats.max_latency_s, latency)
+                self.stats.total_latency_s += latency
+            except Exception as e:
+                logger.error(f"Outbound worker for {self.name} failed: {e}")
+            finally:
+                self.stats.queued -= 1
+                queue.task_done()
+
+    async def _deliver(self, msg: OutboundMessage) -> None:
+        attempts = 1 if msg.partial else 1 + self.max_retries
+        for sink in self.sinks:
+            pending = msg
+            for attempt in range(attempts):
+                await self._limiter.acquire()
+                try:
+                    await sink(pending)
+                except Exception as e:
+                    if isinstance(e, PartialSendError):
+                        pending = e.remaining  # Don't resend what already went out
+                    if attempt + 1 >= attempts:
+                        self.stats.failed += 1
+                        logger.error(f"Error sending to {self.name}: {e}")
+                        break
+                    self.stats.retried += 1
+                    delay = self.retry_backoff_s * 2 ** attempt
+                    logger.warning(f"Error sending to {self.name}, retrying in {delay:.1f}s: {e}")
+                    await asyncio.sleep(delay)
+                else:
+                    self.stats.sent += 1
+                    break
+
+    async def join(self) -> None:
+        """Wait until every queued message has been handled."""
+        for queue in self._queues:
+            await queue.join()
+
+    async def stop(self, drain_timeout_s: float = 5.0) -> None:
+        """Give queued messages a moment to go out, then stop the workers."""
+        if self._tasks and self.stats.queued:
+            try:
+                await asyncio.wait_for(self.join(), timeout=drain_timeout_s)
+            except asyncio.TimeoutError:
+                logger.warning(f"Stopping {self.name} with {self.stats.queued} outbound messages unsent")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def snapshot(self) -> dict[str, Any]:
+        s = self.stats
+        return {
+            "workers": len(self._queues),
+            "queued": s.queued,
+            "sent": s.sent,
+            "failed": s.failed,
+            "retried": s.retried,
+            "dropped": s.dropped,
+            "last_latency_s": round(s.last_latency_s, 3),
+            "max_latency_s": round(s.max_latency_s, 3),
+            "avg_latency_s": round(s.total_latency_s / s.delivered, 3) if s.delivered else 0.0,
+        }
@@ -99,16 +99,12 @@ class QQChannel(BaseChannel):
     async def send(self, msg: OutboundMessage) -> None:
         """Send a message through QQ."""
         if not self._client:
-            logger.warning("QQ client not initialized")
-            return
-        try:
-            await self._client.api.post_c2c_message(
-                openid=msg.chat_id,
-                msg_type=0,
-                content=msg.content,
-            )
-        except Exception as e:
-            logger.error(f"Error sending QQ message: {e}")
+            raise RuntimeError("QQ client not initialized")
+        await self._client.api.post_c2c_message(
+            openid=msg.chat_id,
+            msg_type=0,
+            content=msg.content,
+        )
 
     async def _on_message(self, data: "C2CMessage") -> None:
         """Handle incoming message from QQ."""
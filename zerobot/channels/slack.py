@@ -22,6 +22,7 @@ class SlackChannel(BaseChannel):
     """Slack channel using Socket Mode."""
 
     name = "slack"
+    supports_streaming = True
 
     def __init__(self, config: SlackConfig, bus: MessageBus):
         super().__init__(config, bus)
@@ -29,6 +30,7 @@ class SlackChannel(BaseChannel):
         self._web_client: AsyncWebClient | None = None
         self._socket_client: SocketModeClient | None = None
         self._bot_user_id: str | None = None
+        self._streams: dict[str, str] = {}  # stream_id -> placeholder message ts
 
     async def start(self) -> None:
         """Start the Slack Socket Mode client."""
@@ -76,21 +78,38 @@ class SlackChannel(BaseChannel):
     async def send(self, msg: OutboundMessage) -> None:
         """Send a message through Slack."""
         if not self._web_client:
-            logger.warning("Slack client not running")
-            return
+            raise RuntimeError("Slack client not running")
         try:
             slack_meta = msg.metadata.get("slack", {}) if msg.metadata else {}
             thread_ts = slack_meta.get("thread_ts")
             channel_type = slack_meta.get("channel_type")
             # Only reply in thread for channel/group messages; DMs don't use threads
             use_thread = thread_ts and channel_type != "im"
-            await self._web_client.chat_postMessage(
+
+            # Streamed replies: post a placeholder once, then edit it in place
+            ts = self._streams.get(msg.stream_id) if msg.stream_id else None
+            if not msg.partial and msg.stream_id:
+                self._streams.pop(msg.stream_id, None)
+            if ts:
+                await self._web_client.chat_update(
+                    channel=msg.chat_id,
+                    ts=ts,
+                    text=self._to_mrkdwn(msg.content),
+                )
+                return
+
+            result = await self._web_client.chat_postMessage(
                 channel=msg.chat_id,
                 text=self._to_mrkdwn(msg.content),
                 thread_ts=thread_ts if use_thread else None,
             )
+            if msg.partial and msg.stream_id:
+                self._streams[msg.stream_id] = result.get("ts")
         except Exception as e:
-            logger.error(f"Error sending Slack message: {e}")
+            if msg.partial:
+                logger.debug(f"Slack stream update failed: {e}")
+                return
+            raise
 
     async def _on_socket_request(
         self,
@@ -169,6 +188,7 @@ class SlackChannel(BaseChannel):
             chat_id=chat_id,
             content=text,
             metadata={
+                "was_mentioned": event_type == "app_mention",
                 "slack": {
                     "event": event,
                     "thread_ts": thread_ts,
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import re
+from dataclasses import replace
 from loguru import logger
 from telegram import BotCommand, Update
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
@@ -12,6 +13,7 @@ from telegram.request import HTTPXRequest
 from zerobot.bus.events import OutboundMessage
 from zerobot.bus.queue import MessageBus
 from zerobot.channels.base import BaseChannel
+from zerobot.channels.outbound import PartialSendError
 from zerobot.config.schema import TelegramConfig
 
 
@@ -106,6 +108,7 @@ class TelegramChannel(BaseChannel):
     """
     
     name = "telegram"
+    supports_streaming = True
     
     # Commands registered with Telegram's command menu
     BOT_COMMANDS = [
@@ -126,6 +129,9 @@ class TelegramChannel(BaseChannel):
         self._app: Application | None = None
         self._chat_ids: dict[str, int] = {}  # Map sender_id to chat_id for replies
         self._typing_tasks: dict[str, asyncio.Task] = {}  # chat_id -> typing loop task
+        self._streams: dict[str, tuple[int, str]] = {}  # stream_id -> (placeholder message_id, last text)
+        self._bot_id: int | None = None
+        self._bot_username: str | None = None
     
     async def start(self) -> None:
         """Start the Telegram bot with long polling."""
@@ -166,6 +172,7 @@ class TelegramChannel(BaseChannel):
         # Get bot info and register command menu
         bot_info = await self._app.bot.get_me()
         logger.info(f"Telegram bot @{bot_info.username} connected")
+        self._bot_id, self._bot_username = bot_info.id, bot_info.username
         
         try:
             await self._app.bot.set_my_commands(self.BOT_COMMANDS)
@@ -201,27 +208,78 @@ class TelegramChannel(BaseChannel):
     async def send(self, msg: OutboundMessage) -> None:
         """Send a message through Telegram."""
         if not self._app:
-            logger.warning("Telegram bot not running")
-            return
+            raise RuntimeError("Telegram bot not running")
 
         self._stop_typing(msg.chat_id)
 
         try:
             chat_id = int(msg.chat_id)
         except ValueError:
-            logger.error(f"Invalid chat_id: {msg.chat_id}")
+            raise ValueError(f"Invalid Telegram chat_id: {msg.chat_id}") from None
+
+        if msg.partial:
+            await self._send_partial(chat_id, msg)
             return
 
-        for chunk in _split_message(msg.content):
+        chunks = _split_message(msg.content)
+        delivered = False
+        stream = self._streams.pop(msg.stream_id, None) if msg.stream_id else None
+        if stream and chunks:
+            # Replace the streamed placeholder with the first chunk
+            message_id, _ = stream
+            first = chunks.pop(0)
             try:
-                html = _markdown_to_telegram_html(chunk)
-                await self._app.bot.send_message(chat_id=chat_id, text=html, parse_mode="HTML")
+                await self._app.bot.edit_message_text(
+                    chat_id=chat_id, message_id=message_id,
+                    text=_markdown_to_telegram_html(first), parse_mode="HTML",
+                )
             except Exception as e:
-                logger.warning(f"HTML parse failed, falling back to plain text: {e}")
+                logger.warning(f"HTML edit failed, falling back to plain text: {e}")
                 try:
-                    await self._app.bot.send_message(chat_id=chat_id, text=chunk)
+                    await self._app.bot.edit_message_text(chat_id=chat_id, message_id=message_id, text=first)
                 except Exception as e2:
-                    logger.error(f"Error sending Telegram message: {e2}")
+                    logger.warning(f"Error editing Telegram message, sending it anew: {e2}")
+                    chunks.insert(0, first)
+                else:
+                    delivered = True
+            else:
+                delivered = True
+
+        for i, chunk in enumerate(chunks):
+            try:
+                await self._send_chunk(chat_id, chunk)
+            except Exception as e:
+                if not delivered:
+                    raise
+                # Earlier chunks went out; only the rest may be retried
+                rest = replace(msg, content="\n".join(chunks[i:]), stream_id=None)
+                raise PartialSendError(rest) from e
+            delivered = True
+
+    async def _send_chunk(self, chat_id: int, chunk: str) -> None:
+        """Send one chunk as HTML, falling back to plain text."""
+        try:
+            html = _markdown_to_telegram_html(chunk)
+            await self._app.bot.send_message(chat_id=chat_id, text=html, parse_mode="HTML")
+        except Exception as e:
+            logger.warning(f"HTML parse failed, falling back to plain text: {e}")
+            await self._app.bot.send_message(chat_id=chat_id, text=chunk)
+    
+    async def _send_partial(self, chat_id: int, msg: OutboundMessage) -> None:
+        """Post or edit the placeholder of a streamed reply (plain text)."""
+        if not msg.stream_id or not self._app:
+            return
+        text = msg.content[:4000]
+        stream = self._streams.get(msg.stream_id)
+        try:
+            if stream is None:
+                sent = await self._app.bot.send_message(chat_id=chat_id, text=text)
+                self._streams[msg.stream_id] = (sent.message_id, text)
+            elif stream[1] != text:
+                await self._app.bot.edit_message_text(chat_id=chat_id, message_id=stream[0], text=text)
+                self._streams[msg.stream_id] = (stream[0], text)
+        except Exception as e:
+            logger.debug(f"Telegram stream update failed: {e}")
     
     async def _on_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle /start command."""
@@ -345,10 +403,26 @@ class TelegramChannel(BaseChannel):
                 "user_id": user.id,
                 "username": user.username,
                 "first_name": user.first_name,
-                "is_group": message.chat.type != "private"
+                "is_group": message.chat.type != "private",
+                "was_mentioned": self._is_mentioned(message),
             }
         )
     
+    def _is_mentioned(self, message) -> bool:
+        """Whether a message @-mentions the bot or replies to one of its messages."""
+        reply = message.reply_to_message
+        if reply and reply.from_user and reply.from_user.id == self._bot_id:
+            return True
+        for entities, text in ((message.entities, message.text), (message.caption_entities, message.caption)):
+            for entity in entities or ():
+                if entity.type == "text_mention" and entity.user and entity.user.id == self._bot_id:
+                    return True
+                if entity.type == "mention" and self._bot_username and text:
+                    mention = text[entity.offset + 1:entity.offset + entity.length]
+                    if mention.lower() == self._bot_username.lower():
+                        return True
+        return False
+
     def _start_typing(self, chat_id: str) -> None:
         """Start sending 'typing...' indicator for a chat."""
         # Cancel any existing typing task for this chat
@@ -78,18 +78,14 @@ class WhatsAppChannel(BaseChannel):
     async def send(self, msg: OutboundMessage) -> None:
         """Send a message through WhatsApp."""
         if not self._ws or not self._connected:
-            logger.warning("WhatsApp bridge not connected")
-            return
+            raise RuntimeError("WhatsApp bridge not connected")
         
-        try:
-            payload = {
-                "type": "send",
-                "to": msg.chat_id,
-                "text": msg.content
-            }
-            await self._ws.send(json.dumps(payload))
-        except Exception as e:
-            logger.error(f"Error sending WhatsApp message: {e}")
+        payload = {
+            "type": "send",
+            "to": msg.chat_id,
+            "text": msg.content
+        }
+        await self._ws.send(json.dumps(payload))
     
     async def _handle_bridge_message(self, raw: str) -> None:
         """Handle a message from the bridge."""
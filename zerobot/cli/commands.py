@@ -325,29 +325,93 @@ This file stores important information that should persist across sessions.
 
 
 def _make_provider(config: Config):
-    """Create LiteLLMProvider from config. Exits if no API key found."""
+    """Create the LLM provider from config (with failover and caching when configured). Exits if no API key found."""
+    from zerobot.providers.cache import with_response_cache
+    from zerobot.providers.failover import Endpoint, FailoverProvider
+    from zerobot.providers.rate_limit import configure_llm_limits
+
+    configure_llm_limits(config.rate_limits)
+    model = config.agents.defaults.model
+    provider = _make_model_provider(config, model)
+
+    failover = config.failover
+    if failover.endpoints:
+        endpoints = [Endpoint(provider, model, timeout_s=failover.timeout_s)]
+        for ep in failover.endpoints:
+            endpoints.append(Endpoint(
+                _make_model_provider(config, ep.model, ep.provider),
+                ep.model,
+                timeout_s=ep.timeout_s or failover.timeout_s,
+                name=f"{ep.provider}:{ep.model}" if ep.provider else ep.model,
+            ))
+        provider = FailoverProvider(
+            endpoints,
+            hedge=failover.hedge,
+            hedge_percentile=failover.hedge_percentile,
+            hedge_min_samples=failover.hedge_min_samples,
+        )
+    return with_response_cache(provider, config.agents.defaults)
+
+
+def _make_model_provider(config: Config, model: str, provider_name: str = ""):
+    """Create LiteLLMProvider (or the Codex provider) for one model. Exits if no API key found."""
     from zerobot.providers.litellm_provider import LiteLLMProvider
     from zerobot.providers.openai_codex_provider import OpenAICodexProvider
+    from zerobot.providers.registry import find_by_name
 
-    model = config.agents.defaults.model
-    provider_name = config.get_provider_name(model)
-    p = config.get_provider(model)
+    if provider_name:
+        p = getattr(config.providers, provider_name, None)
+        if p is None:
+            console.print(f"[red]Error: Unknown provider '{provider_name}' for {model}[/red]")
+            raise typer.Exit(1)
+        spec = find_by_name(provider_name)
+        api_base = p.api_base or (spec.default_api_base if spec and spec.is_gateway else None)
+    else:
+        provider_name = config.get_provider_name(model)
+        p = config.get_provider(model)
+        api_base = config.get_api_base(model)
 
     # OpenAI Codex (OAuth): don't route via LiteLLM; use the dedicated implementation.
     if provider_name == "openai_codex" or model.startswith("openai-codex/"):
         return OpenAICodexProvider(default_model=model)
 
     if not model.startswith("bedrock/") and not (p and p.api_key):
-        console.print("[red]Error: No API key configured.[/red]")
+        console.print(f"[red]Error: No API key configured for {model}.[/red]")
         console.print("Set one in ~/.zerobot/config.json under providers section")
         raise typer.Exit(1)
 
     return LiteLLMProvider(
         api_key=p.api_key if p else None,
-        api_base=config.get_api_base(model),
+        api_base=api_base,
         default_model=model,
         extra_headers=p.extra_headers if p else None,
         provider_name=provider_name,
+        prompt_caching=config.agents.defaults.prompt_caching,
+    )
+
+
+def _make_session_manager(config: Config):
+    """Create the SessionManager with the configured session store."""
+    from zerobot.config.loader import get_data_dir
+    from zerobot.session.manager import SessionManager
+    from zerobot.session.sqlite_store import SqliteSessionStore
+
+    defaults = config.agents.defaults
+    store = None
+    if defaults.session_store == "sqlite":
+        store = SqliteSessionStore(get_data_dir() / "sessions.db", fsync=defaults.session_fsync)
+    elif defaults.session_store != "jsonl":
+        console.print(f"[red]Error: Unknown sessionStore '{defaults.session_store}' (use 'jsonl' or 'sqlite')[/red]")
+        raise typer.Exit(1)
+
+    return SessionManager(
+        config.workspace_path,
+        flush_interval_s=defaults.session_flush_interval_s,
+        fsync=defaults.session_fsync,
+        cache_max_messages=defaults.session_cache_max_messages,
+        cache_idle_s=defaults.session_cache_idle_s,
+        archive_after_s=defaults.session_archive_after_s,
+        store=store,
     )
 
 
@@ -366,10 +430,11 @@ def gateway(
     from zerobot.bus.queue import MessageBus
     from zerobot.agent.loop import AgentLoop
     from zerobot.channels.manager import ChannelManager
-    from zerobot.session.manager import SessionManager
     from zerobot.cron.service import CronService
     from zerobot.cron.types import CronJob
     from zerobot.heartbeat.service import HeartbeatService
+    from zerobot.providers.rate_limit import llm_priority
+    from zerobot.utils.http import close_http_clients, configure_http
     
     if verbose:
         import logging
@@ -378,9 +443,14 @@ def gateway(
     console.print(f"{__logo__} Starting zerobot gateway on port {port}...")
     
     config = load_config()
-    bus = MessageBus()
+    configure_http(config.http)
+    bus = MessageBus(
+        inbound_max=config.gateway.inbound_queue_size,
+        outbound_max=config.gateway.outbound_queue_size,
+        overflow=config.gateway.queue_overflow,
+    )
     provider = _make_provider(config)
-    session_manager = SessionManager(config.workspace_path)
+    session_manager = _make_session_manager(config)
     
     # Create cron service first (callback set after agent creation)
     cron_store_path = get_data_dir() / "cron" / "jobs.json"
@@ -396,6 +466,24 @@ def gateway(
         max_tokens=config.agents.defaults.max_tokens,
         max_iterations=config.agents.defaults.max_tool_iterations,
         memory_window=config.agents.defaults.memory_window,
+        consolidation_model=config.agents.defaults.consolidation_model,
+        router_model=config.agents.defaults.router_model,
+        router_chat_max_chars=config.agents.defaults.router_chat_max_chars,
+        consolidation_debounce_s=config.agents.defaults.consolidation_debounce_s,
+        consolidation_max_delay_s=config.agents.defaults.consolidation_max_delay_s,
+        max_concurrent_consolidations=config.agents.defaults.max_concurrent_consolidations,
+        context_window_tokens=config.agents.defaults.context_window_tokens,
+        max_history_tokens=config.agents.defaults.max_history_tokens,
+        tool_reserve_tokens=config.agents.defaults.tool_reserve_tokens,
+        max_concurrent_turns=config.agents.defaults.max_concurrent_turns,
+        max_parallel_tools=config.tools.max_parallel_calls,
+        tool_result_inline_chars=config.tools.result_inline_chars,
+        tool_result_stale_chars=config.tools.result_stale_chars,
+        stream_responses=config.agents.defaults.stream_responses,
+        stream_interval_s=config.agents.defaults.stream_interval_s,
+        prompt_caching=config.agents.defaults.prompt_caching,
+        memory_inline_tokens=config.agents.defaults.memory_inline_tokens,
+        memory_top_k=config.agents.defaults.memory_top_k,
         brave_api_key=config.tools.web.search.api_key or None,
         exec_config=config.tools.exec,
         cron_service=cron,
@@ -408,12 +496,13 @@ def gateway(
     # Set cron callback (needs agent)
     async def on_cron_job(job: CronJob) -> str | None:
         """Execute a cron job through the agent."""
-        response = await agent.process_direct(
-            job.payload.message,
-            session_key=f"cron:{job.id}",
-            channel=job.payload.channel or "cli",
-            chat_id=job.payload.to or "direct",
-        )
+        with llm_priority("background"):
+            response = await agent.process_direct(
+                job.payload.message,
+                session_key=f"cron:{job.id}",
+                channel=job.payload.channel or "cli",
+                chat_id=job.payload.to or "direct",
+            )
         if job.payload.deliver and job.payload.to:
             from zerobot.bus.events import OutboundMessage
             await bus.publish_outbound(OutboundMessage(
@@ -427,7 +516,8 @@ def gateway(
     # Create heartbeat service
     async def on_heartbeat(prompt: str) -> str:
         """Execute heartbeat through the agent."""
-        return await agent.process_direct(prompt, session_key="heartbeat")
+        with llm_priority("background"):
+            return await agent.process_direct(prompt, session_key="heartbeat")
     
     heartbeat = HeartbeatService(
         workspace=config.workspace_path,
@@ -471,6 +561,9 @@ def gateway(
             cron.stop()
             agent.stop()
             await channels.stop_all()
+            await close_http_clients()
+            if hasattr(provider, "close"):
+                provider.close()
     
     asyncio.run(run())
 
@@ -493,9 +586,11 @@ def agent(
     from zerobot.config.loader import load_config
     from zerobot.bus.queue import MessageBus
     from zerobot.agent.loop import AgentLoop
+    from zerobot.utils.http import close_http_clients, configure_http
     from loguru import logger
     
     config = load_config()
+    configure_http(config.http)
     
     bus = MessageBus()
     provider = _make_provider(config)
@@ -514,9 +609,28 @@ def agent(
         max_tokens=config.agents.defaults.max_tokens,
         max_iterations=config.agents.defaults.max_tool_iterations,
         memory_window=config.agents.defaults.memory_window,
+        consolidation_model=config.agents.defaults.consolidation_model,
+        router_model=config.agents.defaults.router_model,
+        router_chat_max_chars=config.agents.defaults.router_chat_max_chars,
+        consolidation_debounce_s=config.agents.defaults.consolidation_debounce_s,
+        consolidation_max_delay_s=config.agents.defaults.consolidation_max_delay_s,
+        max_concurrent_consolidations=config.agents.defaults.max_concurrent_consolidations,
+        context_window_tokens=config.agents.defaults.context_window_tokens,
+        max_history_tokens=config.agents.defaults.max_history_tokens,
+        tool_reserve_tokens=config.agents.defaults.tool_reserve_tokens,
+        max_concurrent_turns=config.agents.defaults.max_concurrent_turns,
+        max_parallel_tools=config.tools.max_parallel_calls,
+        tool_result_inline_chars=config.tools.result_inline_chars,
+        tool_result_stale_chars=config.tools.result_stale_chars,
+        stream_responses=config.agents.defaults.stream_responses,
+        stream_interval_s=config.agents.defaults.stream_interval_s,
+        prompt_caching=config.agents.defaults.prompt_caching,
+        memory_inline_tokens=config.agents.defaults.memory_inline_tokens,
+        memory_top_k=config.agents.defaults.memory_top_k,
         brave_api_key=config.tools.web.search.api_key or None,
         exec_config=config.tools.exec,
         restrict_to_workspace=config.tools.restrict_to_workspace,
+        session_manager=_make_session_manager(config),
         mcp_servers=config.tools.mcp_servers,
         universe_config=config.universe,
     )
@@ -541,6 +655,10 @@ def agent(
             finally:
                 await stop_public_service(public_handle)
                 await agent_loop.close_mcp()
+                await close_http_clients()
+                if hasattr(provider, "close"):
+                    provider.close()
+                await asyncio.to_thread(agent_loop.sessions.close)
         
         asyncio.run(run_once())
     else:
@@ -551,6 +669,7 @@ def agent(
         def _exit_on_sigint(signum, frame):
             _restore_terminal()
             console.print("\nGoodbye!")
+            agent_loop.sessions.close()  # os._exit skips atexit handlers
             os._exit(0)
 
         signal.signal(signal.SIGINT, _exit_on_sigint)
@@ -586,6 +705,10 @@ def agent(
             finally:
                 await stop_public_service(public_handle)
                 await agent_loop.close_mcp()
+                await close_http_clients()
+                if hasattr(provider, "close"):
+                    provider.close()
+                await asyncio.to_thread(agent_loop.sessions.close)
         
         asyncio.run(run_interactive())
 
@@ -906,6 +1029,128 @@ def cron_run(
         console.print(f"[red]Failed to run job {job_id}[/red]")
 
 
+# ============================================================================
+# Session Commands
+# ============================================================================
+
+sessions_app = typer.Typer(help="Manage conversation sessions")
+app.add_typer(sessions_app, name="sessions")
+
+
+@sessions_app.command("list")
+def sessions_list(
+    limit: int = typer.Option(20, "--limit", "-n", help="Show the N most recently updated sessions"),
+):
+    """List sessions, most recently updated first."""
+    from zerobot.config.loader import load_config
+
+    config = load_config()
+    sessions = _make_session_manager(config).list_sessions()
+
+    if not sessions:
+        console.print("No sessions.")
+        return
+
+    table = Table(title=f"Sessions ({config.agents.defaults.session_store})")
+    table.add_column("Key", style="cyan")
+    table.add_column("Created")
+    table.add_column("Updated")
+
+    for info in sessions[:limit]:
+        table.add_row(info["key"], (info.get("created_at") or "")[:16], (info.get("updated_at") or "")[:16])
+
+    console.print(table)
+    if len(sessions) > limit:
+        console.print(f"[dim]... and {len(sessions) - limit} more[/dim]")
+
+
+@sessions_app.command("migrate")
+def sessions_migrate(
+    force: bool = typer.Option(False, "--force", "-f", help="Overwrite sessions already in the database"),
+):
+    """Copy JSONL session files into the SQLite session database."""
+    from zerobot.config.loader import get_data_dir
+    from zerobot.session.jsonl_store import JsonlSessionStore
+    from zerobot.session.sqlite_store import SqliteSessionStore
+    from zerobot.session.store import copy_sessions
+
+    source = JsonlSessionStore(Path.home() / ".zerobot" / "sessions")
+    db_path = get_data_dir() / "sessions.db"
+    target = SqliteSessionStore(db_path)
+    try:
+        counts = copy_sessions(source, target, overwrite=force)
+    finally:
+        target.close()
+
+    console.print(
+        f"[green]✓[/green] Migrated {counts['sessions']} sessions ({counts['messages']} messages) to {db_path}"
+    )
+    if counts["skipped"]:
+        console.print(f"  Skipped {counts['skipped']} already in the database (use --force to overwrite)")
+    if counts["failed"]:
+        console.print(f"  [red]{counts['failed']} failed (see log)[/red]")
+    console.print('JSONL files were kept. Set "sessionStore": "sqlite" under agents.defaults to use the database.')
+
+
+@sessions_app.command("archive")
+def sessions_archive(
+    idle_days: float = typer.Option(None, "--idle-days", "-d", help="Archive sessions idle this many days (default: from config)"),
+):
+    """Compress idle sessions into the archive now."""
+    from zerobot.config.loader import load_config
+
+    config = load_config()
+    manager = _make_session_manager(config)
+    idle_s = idle_days * 86400 if idle_days is not None else config.agents.defaults.session_archive_after_s
+    result = manager.archive_idle(idle_s)
+
+    console.print(
+        f"[green]✓[/green] Archived {result['sessions']} sessions "
+        f"({_format_bytes(result['bytes'])} -> {_format_bytes(result['compressed'])})"
+    )
+    _print_session_storage(manager.store.archive_stats())
+
+
+@sessions_app.command("stats")
+def sessions_stats():
+    """Show session storage use and what the archive saves."""
+    from zerobot.config.loader import load_config
+
+    stats = _make_session_manager(load_config()).store.archive_stats()
+    if not stats:
+        console.print("The configured session store does not archive sessions.")
+        return
+    _print_session_storage(stats)
+
+
+def _print_session_storage(stats: dict[str, int]) -> None:
+    if not stats:
+        return
+    table = Table(title="Session Storage")
+    table.add_column("Tier", style="cyan")
+    table.add_column("Sessions", justify="right")
+    table.add_column("Size", justify="right")
+    table.add_row("live", str(stats["live_sessions"]), _format_bytes(stats["live_bytes"]))
+    table.add_row(
+        f"archived ({stats['archived_segments']} segments)",
+        str(stats["archived_sessions"]),
+        f"{_format_bytes(stats['archived_segment_bytes'])} (from {_format_bytes(stats['archived_bytes'])})",
+    )
+    console.print(table)
+    saved = stats["archived_bytes"] - stats["archived_segment_bytes"]
+    if stats["archived_bytes"]:
+        ratio = stats["archived_bytes"] / max(stats["archived_segment_bytes"], 1)
+        console.print(f"Archive saves {_format_bytes(max(saved, 0))} ({ratio:.1f}x compression)")
+
+
+def _format_bytes(n: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+
 # ============================================================================
 # Status Commands
 # ============================================================================
@@ -143,8 +143,29 @@ class QQConfig(BaseModel):
     allow_from: list[str] = Field(default_factory=list)  # Allowed user openids (empty = public access)
 
 
+class OutboundConfig(BaseModel):
+    """Outbound delivery settings for a channel."""
+    workers: int = 1  # Send workers; with more than one, different chats are sent to in parallel
+    queue_size: int = 1000  # Queued messages beyond which streaming updates are dropped
+    max_retries: int = 2  # Retries of a failed send (streaming updates are never retried)
+    retry_backoff_s: float = 1.0  # First retry delay; doubles per attempt
+    rate_limit_per_s: float = 0.0  # Sends per second; 0 = unlimited
+    burst: int = 1  # Sends allowed back to back before the rate limit applies
+
+
+class CoalesceConfig(BaseModel):
+    """Merging a chat's bursts of inbound messages into one agent turn."""
+    window_ms: int = 0  # Wait this long for a follow-up message; 0 = off
+    max_delay_ms: int = 5000  # Never hold the first message of a burst longer than this
+    max_messages: int = 20  # Flush once this many messages are waiting
+
+
 class ChannelsConfig(BaseModel):
     """Configuration for chat channels."""
+    outbound: OutboundConfig = Field(default_factory=OutboundConfig)  # Defaults for every channel
+    outbound_overrides: dict[str, OutboundConfig] = Field(default_factory=dict)  # Per channel name
+    coalesce: CoalesceConfig = Field(default_factory=CoalesceConfig)  # Defaults for every channel
+    coalesce_overrides: dict[str, CoalesceConfig] = Field(default_factory=dict)  # Per channel name
     whatsapp: WhatsAppConfig = Field(default_factory=WhatsAppConfig)
     telegram: TelegramConfig = Field(default_factory=TelegramConfig)
     discord: DiscordConfig = Field(default_factory=DiscordConfig)
@@ -163,7 +184,32 @@ class AgentDefaults(BaseModel):
     max_tokens: int = 8192
     temperature: float = 0.7
     max_tool_iterations: int = 20
-    memory_window: int = 50
+    memory_window: int = 50  # Messages kept unconsolidated before memory consolidation runs
+    consolidation_model: str | None = None  # Cheaper model for memory consolidation (default: model)
+    router_model: str | None = None  # Small fast model for consolidation, classification and chit-chat (default: off)
+    router_chat_max_chars: int = 280  # Messages up to this long (no media, links or code) try router_model first
+    consolidation_debounce_s: float = 5.0  # Quiet period before a session's consolidation starts
+    consolidation_max_delay_s: float = 60.0  # Start anyway this long after the first request, even without a quiet period
+    max_concurrent_consolidations: int = 1  # Consolidation jobs running at once across sessions
+    context_window_tokens: int = 0  # Model context size; 0 = look up via LiteLLM (fallback 32k)
+    max_history_tokens: int = 16000  # Token budget for conversation history per request
+    tool_reserve_tokens: int = 8000  # Headroom for tool results produced during a turn
+    max_concurrent_turns: int = 4  # Turns running at once across sessions (same session is always serial)
+    stream_responses: bool = True  # Stream partial replies to channels that support message edits
+    stream_interval_s: float = 1.0  # Minimum seconds between partial updates
+    prompt_caching: bool = True  # Keep a stable prompt prefix and mark it cacheable (Anthropic cache_control)
+    memory_inline_tokens: int = 2000  # MEMORY.md above this size is retrieved per message instead of inlined
+    memory_top_k: int = 12  # Memory entries retrieved per message once MEMORY.md is large
+    session_store: str = "jsonl"  # "jsonl" (one file per session) or "sqlite" (sessions.db in the data dir)
+    session_flush_interval_s: float = 0.5  # Session saves are written behind, batched this often; 0 = write immediately
+    session_fsync: str = "never"  # "never" or "always" (fsync every session write)
+    session_cache_max_messages: int = 20000  # Messages kept in memory across cached sessions; 0 = unbounded
+    session_cache_idle_s: float = 3600.0  # Cached sessions unused this long are evicted (reloaded on demand)
+    session_archive_after_s: float = 604800.0  # Sessions idle this long are compressed into the archive; 0 = never
+    llm_cache: bool = False  # Answer repeated deterministic LLM requests from a cache (llm_cache.db in the data dir)
+    llm_cache_max_temperature: float = 0.0  # Only requests at or below this temperature are cached
+    llm_cache_ttl_s: float = 86400.0  # Cached responses older than this are discarded
+    llm_cache_max_mb: float = 64.0  # Least recently used responses are evicted beyond this size
 
 
 class AgentsConfig(BaseModel):
@@ -178,6 +224,37 @@ class ProviderConfig(BaseModel):
     extra_headers: dict[str, str] | None = None  # Custom headers (e.g. APP-Code for AiHubMix)
 
 
+class ModelLimitsConfig(BaseModel):
+    """Request limits for one model; 0 = unlimited."""
+    max_concurrent: int = 8  # Requests in flight at once
+    requests_per_minute: int = 0
+    tokens_per_minute: int = 0  # Prompt estimate + max_tokens are reserved, then corrected to actual usage
+
+
+class RateLimitsConfig(ModelLimitsConfig):
+    """LLM request scheduling, per model (LiteLLM providers)."""
+    max_retries: int = 4  # Retries for rate limits (429), overload and transient errors
+    backoff_s: float = 1.0  # First retry delay, doubled per retry (a server's Retry-After wins)
+    max_backoff_s: float = 60.0
+    models: dict[str, ModelLimitsConfig] = Field(default_factory=dict)  # By model name or prefix ("anthropic/")
+
+
+class FailoverEndpointConfig(BaseModel):
+    """A fallback provider/model pair."""
+    model: str
+    provider: str = ""  # Name under providers (e.g. "openrouter"); empty = matched from the model
+    timeout_s: float = 0.0  # 0 = failover.timeoutS
+
+
+class FailoverConfig(BaseModel):
+    """Fallback endpoints tried after agents.defaults.model, in order."""
+    endpoints: list[FailoverEndpointConfig] = Field(default_factory=list)
+    timeout_s: float = 120.0  # Per endpoint: whole request, or until the first streamed chunk
+    hedge: bool = False  # Also send slow requests to the next endpoint and use whichever answers first
+    hedge_percentile: float = 95.0  # "Slow" = slower than this percentile of the endpoint's recent latency
+    hedge_min_samples: int = 20  # Requests measured before hedging starts
+
+
 class ProvidersConfig(BaseModel):
     """Configuration for LLM providers."""
     custom: ProviderConfig = Field(default_factory=ProviderConfig)  # Any OpenAI-compatible endpoint
@@ -200,6 +277,21 @@ class GatewayConfig(BaseModel):
     """Gateway/server configuration."""
     host: str = "0.0.0.0"
     port: int = 18790
+    inbound_queue_size: int = 1000  # Messages waiting for the agent; 0 = unbounded
+    outbound_queue_size: int = 1000  # Replies waiting to be sent; 0 = unbounded
+    queue_overflow: str = "drop_oldest"  # Full inbound queue: "block", "drop_oldest" (least urgent first) or "drop_new"
+
+
+class HttpConfig(BaseModel):
+    """Shared HTTP client pool (web tools, providers and channels that use httpx)."""
+    timeout_s: float = 30.0  # Default per-request timeout; callers may pass their own
+    connect_timeout_s: float = 10.0
+    max_connections: int = 100  # Per client; 0 = unlimited
+    max_keepalive_connections: int = 20
+    keepalive_expiry_s: float = 30.0  # Idle connections are closed after this long
+    per_host_limit: int = 0  # Concurrent requests to one host; 0 = unlimited
+    http2: bool = False  # Needs the h2 package
+    proxy: str = ""  # e.g. "http://127.0.0.1:7890"; empty = use HTTP(S)_PROXY from the environment
 
 
 class WebSearchConfig(BaseModel):
@@ -231,6 +323,9 @@ class ToolsConfig(BaseModel):
     web: WebToolsConfig = Field(default_factory=WebToolsConfig)
     exec: ExecToolConfig = Field(default_factory=ExecToolConfig)
     restrict_to_workspace: bool = False  # If true, restrict all tool access to workspace directory
+    max_parallel_calls: int = 4  # Max independent tool calls run concurrently within one LLM turn
+    result_inline_chars: int = 6000  # Longer results are stored aside and paged with read_tool_result
+    result_stale_chars: int = 600  # Results from earlier iterations are shrunk to this many characters
     mcp_servers: dict[str, MCPServerConfig] = Field(default_factory=dict)
 
 
@@ -336,6 +431,9 @@ class Config(BaseSettings):
     channels: ChannelsConfig = Field(default_factory=ChannelsConfig)
     providers: ProvidersConfig = Field(default_factory=ProvidersConfig)
     gateway: GatewayConfig = Field(default_factory=GatewayConfig)
+    http: HttpConfig = Field(default_factory=HttpConfig)
+    rate_limits: RateLimitsConfig = Field(default_factory=RateLimitsConfig)
+    failover: FailoverConfig = Field(default_factory=FailoverConfig)
     tools: ToolsConfig = Field(default_factory=ToolsConfig)
     universe: UniverseConfig = Field(default_factory=UniverseConfig)
     
@@ -2,7 +2,7 @@
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, AsyncIterator
 
 
 @dataclass
@@ -28,6 +28,27 @@ class LLMResponse:
         return len(self.tool_calls) > 0
 
 
+@dataclass
+class ToolCallDelta:
+    """Incremental piece of a tool call in a streamed response."""
+    index: int  # Position of the tool call within the response
+    id: str | None = None
+    name: str | None = None
+    arguments: str = ""  # Raw JSON fragment
+
+
+@dataclass
+class StreamChunk:
+    """One event of a streamed response.
+
+    Intermediate chunks carry content and/or tool-call deltas. The last chunk
+    carries the fully assembled `response`.
+    """
+    content: str = ""
+    tool_calls: list[ToolCallDelta] = field(default_factory=list)
+    response: LLMResponse | None = None
+
+
 class LLMProvider(ABC):
     """
     Abstract base class for LLM providers.
@@ -64,6 +85,38 @@ class LLMProvider(ABC):
         """
         pass
     
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[StreamChunk]:
+        """
+        Send a chat completion request and stream the response.
+        
+        Providers without native streaming fall back to a single chunk
+        produced from chat().
+        
+        Yields:
+            StreamChunk deltas, ending with a chunk whose `response` is set.
+        """
+        response = await self.chat(
+            messages=messages,
+            tools=tools,
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+        )
+        if response.content:
+            yield StreamChunk(content=response.content)
+        yield StreamChunk(response=response)
+    
+    def get_context_window(self, model: str | None = None) -> int | None:
+        """Get the model's input context size in tokens, or None if unknown."""
+        return None
+    
     @abstractmethod
     def get_default_model(self) -> str:
         """Get the default model for this provider."""
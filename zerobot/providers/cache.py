@@ -0,0 +1,384 @@
+"""Response cache for deterministic LLM calls."""
+
+import asyncio
+import copy
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+from loguru import logger
+
+from zerobot.providers.base import LLMProvider, LLMResponse, StreamChunk, ToolCallRequest
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    used_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS responses_used_at ON responses (used_at);
+"""
+
+# Request fields that don't change what the model answers
+_IGNORED_FIELDS = ("cache_control",)
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            k: _normalize(v) for k, v in value.items()
+            if v is not None and k not in _IGNORED_FIELDS
+        }
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def request_key(
+    messages: list[dict[str, Any]],
+    tools: list[dict[str, Any]] | None,
+    model: str,
+    max_tokens: int,
+    temperature: float,
+) -> str:
+    """
+    Hash of a chat request.
+
+    Keys are compared after dropping None-valued fields and cache_control
+    markers and stripping surrounding whitespace from strings, so requests
+    that differ only in those ways share an entry.
+    """
+    payload = {
+        "messages": _normalize(messages),
+        "tools": _normalize(tools or []),
+        "model": model,
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+    }
+    blob = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _dump(response: LLMResponse) -> str:
+    return json.dumps(asdict(response), ensure_ascii=False)
+
+
+def _load(data: str) -> LLMResponse:
+    raw = json.loads(data)
+    raw["tool_calls"] = [ToolCallRequest(**tc) for tc in raw.get("tool_calls", [])]
+    return LLMResponse(**raw)
+
+
+class ResponseCache:
+    """
+    LLM responses by request key: an in-memory LRU in front of a SQLite file.
+
+    Entries expire `ttl_s` after they were stored. The file is kept under
+    `max_bytes` by evicting the least recently used entries. All methods
+    are blocking; CachingProvider calls the disk ones from a thread.
+    """
+
+    def __init__(
+        self,
+        db_path: Path | None,
+        ttl_s: float = 86400.0,
+        max_bytes: int = 64 * 1024 * 1024,
+        memory_entries: int = 256,
+    ):
+        self.db_path = db_path
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self._memory: OrderedDict[str, tuple[LLMResponse, float]] = OrderedDict()
+        self._lock = threading.RLock()
+        self._conn: sqlite3.Connection | None = None
+        self._bytes = 0
+        self.evicted = 0
+        if db_path is not None:
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - ttl_s,))
+            self._bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def get_memory(self, key: str) -> LLMResponse | None:
+        """Look in the in-memory LRU only (never blocks on disk)."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            response, created_at = entry
+            if time.time() - created_at > self.ttl_s:
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            return response
+
+    def get(self, key: str) -> LLMResponse | None:
+        response = self.get_memory(key)
+        if response is not None or self._conn is None:
+            return response
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT data, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            data, created_at = row
+            if now - created_at > self.ttl_s:
+                self._delete(key)
+                return None
+            self._conn.execute("UPDATE responses SET used_at = ? WHERE key = ?", (now, key))
+            response = _load(data)
+            self._remember(key, response, created_at)
+        return response
+
+    def put(self, key: str, response: LLMResponse) -> None:
+        now = time.time()
+        with self._lock:
+            self._remember(key, response, now)
+            if self._conn is None:
+                return
+            data = _dump(response)
+            size = len(data.encode("utf-8"))
+            if size > self.max_bytes:
+                return
+            self._delete(key)
+            self._conn.execute(
+                "INSERT INTO responses (key, data, size, created_at, used_at) VALUES (?, ?, ?, ?, ?)",
+                (key, data, size, now, now),
+            )
+            self._bytes += size
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def _remember(self, key: str, response: LLMResponse, created_at: float) -> None:
+        self._memory[key] = (response, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _delete(self, key: str) -> None:
+        row = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+        if row:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._bytes -= row[0]
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the file is 90% of max_bytes."""
+        target = self.max_bytes * 0.9
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY used_at").fetchall()
+        doomed = []
+        for key, size in rows:
+            if self._bytes <= target:
+                break
+            doomed.append((key,))
+            self._bytes -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+        for (key,) in doomed:
+            self._memory.pop(key, None)
+        self.evicted += len(doomed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM responses")
+            self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            entries = len(self._memory)
+            if self._conn is not None:
+                entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            return {
+                "entries": entries,
+                "memory_entries": len(self._memory),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "evicted": self.evicted,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+@dataclass
+class _Flight:
+    """A cache miss being fetched, shared by every caller asking for the same request."""
+    task: asyncio.Task[LLMResponse]
+    waiters: int = 0
+
+
+class CachingProvider(LLMProvider):
+    """
+    Wraps a provider and answers repeated deterministic requests from a cache.
+
+    Only requests at or below `max_temperature` are cached (by default
+    temperature 0, i.e. classification and routing calls); everything
+    else goes straight to the wrapped provider. Identical requests that
+    arrive while the first is still in flight wait for its answer instead
+    of making their own call. The call runs in its own task, so a caller
+    that is cancelled doesn't take the others down with it; it is only
+    cancelled once nobody is waiting for it any more. Error responses are
+    shared with those waiters but never stored. Every caller gets its own
+    copy of the response.
+    """
+
+    def __init__(self, provider: LLMProvider, cache: ResponseCache, max_temperature: float = 0.0):
+        super().__init__(provider.api_key, provider.api_base)
+        self.provider = provider
+        self.cache = cache
+        self.max_temperature = max_temperature
+        self._inflight: dict[str, _Flight] = {}
+        self.hits = 0
+        self.misses = 0
+        self.collapsed = 0  # Requests answered by an identical request already in flight
+        self.bypassed = 0  # Requests not eligible for caching
+
+    def _key(self, messages, tools, model, max_tokens, temperature) -> str | None:
+        if temperature > self.max_temperature:
+            self.bypassed += 1
+            return None
+        return request_key(messages, tools, model or self.provider.get_default_model(), max_tokens, temperature)
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        kwargs = dict(messages=messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature)
+        key = self._key(**kwargs)
+        if key is None:
+            return await self.provider.chat(**kwargs)
+
+        cached = self.cache.get_memory(key)
+        if cached is not None:
+            self.hits += 1
+            return copy.deepcopy(cached)
+        flight = self._inflight.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.create_task(self._fetch(key, kwargs)))
+            self._inflight[key] = flight
+        else:
+            self.collapsed += 1
+
+        flight.waiters += 1
+        try:
+            response = await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                # The last caller gave up: stop the request, and let the next caller start afresh
+                flight.task.cancel()
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+        return copy.deepcopy(response)
+
+    async def _fetch(self, key: str, kwargs: dict[str, Any]) -> LLMResponse:
+        try:
+            cached = await asyncio.to_thread(self.cache.get, key)
+            if cached is not None:
+                self.hits += 1
+                return cached
+            self.misses += 1
+            response = await self.provider.chat(**kwargs)
+            if response.finish_reason != "error":
+                await self._store(key, response)
+            return response
+        finally:
+            if (flight := self._inflight.get(key)) is not None and flight.task is asyncio.current_task():
+                del self._inflight[key]
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[StreamChunk]:
+        kwargs = dict(messages=messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature)
+        key = self._key(**kwargs)
+        cached = None
+        if key is not None:
+            cached = self.cache.get_memory(key) or await asyncio.to_thread(self.cache.get, key)
+        if cached is not None:
+            self.hits += 1
+            cached = copy.deepcopy(cached)
+            if cached.content:
+                yield StreamChunk(content=cached.content)
+            yield StreamChunk(response=cached)
+            return
+
+        if key is not None:
+            self.misses += 1
+        async for chunk in self.provider.chat_stream(**kwargs):
+            if key is not None and chunk.response is not None and chunk.response.finish_reason != "error":
+                await self._store(key, chunk.response)
+            yield chunk
+
+    async def _store(self, key: str, response: LLMResponse) -> None:
+        try:
+            await asyncio.to_thread(self.cache.put, key, response)
+        except Exception as e:
+            logger.warning(f"Could not store LLM response in cache: {e}")
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "collapsed": self.collapsed,
+            "bypassed": self.bypassed,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            **self.cache.stats(),
+        }
+
+    def close(self) -> None:
+        stats = self.stats()
+        if stats["hits"] or stats["misses"]:
+            logger.info(
+                f"LLM cache: {stats['hits']} hits, {stats['misses']} misses, "
+                f"{stats['collapsed']} collapsed, {stats['entries']} entries"
+            )
+        self.cache.close()
+        if hasattr(self.provider, "close"):
+            self.provider.close()
+
+    def get_context_window(self, model: str | None = None) -> int | None:
+        return self.provider.get_context_window(model)
+
+    def get_default_model(self) -> str:
+        return self.provider.get_default_model()
+
+
+def with_response_cache(provider: LLMProvider, defaults: Any) -> LLMProvider:
+    """Wrap `provider` in a CachingProvider when agents.defaults.llmCache is on."""
+    if not defaults.llm_cache:
+        return provider
+    from zerobot.config.loader import get_data_dir
+
+    cache = ResponseCache(
+        get_data_dir() / "llm_cache.db",
+        ttl_s=defaults.llm_cache_ttl_s,
+        max_bytes=int(defaults.llm_cache_max_mb * 1024 * 1024),
+    )
+    return CachingProvider(provider, cache, max_temperature=defaults.llm_cache_max_temperature)
@@ -0,0 +1,353 @@
+"""Composite provider that fails over (and optionally hedges) across endpoints."""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator
+
+from loguru import logger
+
+from zerobot.providers.base import LLMProvider, LLMResponse, StreamChunk
+
+# Histogram bucket upper bounds in seconds: 50 ms doubling every two buckets, up to ~15 min
+_BUCKETS = [0.05 * 2 ** (i / 2) for i in range(30)]
+
+
+class LatencyHistogram:
+    """Fixed log-spaced latency buckets; percentiles are bucket upper bounds."""
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(_BUCKETS) + 1)
+        self.count = 0
+
+    def record(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(_BUCKETS, seconds)] += 1
+        self.count += 1
+
+    def percentile(self, p: float) -> float | None:
+        """Latency below which `p` percent of recorded requests finished (None if empty)."""
+        if not self.count:
+            return None
+        rank = max(1, round(self.count * p / 100))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return _BUCKETS[i] if i < len(_BUCKETS) else _BUCKETS[-1] * 2
+        return _BUCKETS[-1] * 2
+
+
+@dataclass
+class Endpoint:
+    """One provider/model pair in a failover chain."""
+    provider: LLMProvider
+    model: str
+    timeout_s: float = 120.0  # Whole request (chat) or until the first chunk (stream)
+    name: str = ""
+    # Per model sent to this endpoint, so overridden models don't skew its own model's hedge delay
+    latency: dict[str, LatencyHistogram] = field(default_factory=dict)  # chat(): full response
+    first_chunk: dict[str, LatencyHistogram] = field(default_factory=dict)  # chat_stream(): time to first chunk
+    requests: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    hedges: int = 0  # Times this endpoint was raced as the hedge
+    hedges_won: int = 0
+
+    def __post_init__(self) -> None:
+        self.name = self.name or self.model
+
+    def latency_for(self, model: str) -> LatencyHistogram:
+        return self.latency.setdefault(model, LatencyHistogram())
+
+    def first_chunk_for(self, model: str) -> LatencyHistogram:
+        return self.first_chunk.setdefault(model, LatencyHistogram())
+
+
+class EndpointError(Exception):
+    """An endpoint failed, timed out or answered with an error response."""
+
+
+class FailoverProvider(LLMProvider):
+    """
+    Sends each request down an ordered list of endpoints until one answers.
+
+    An endpoint that raises, times out, or returns an error response
+    (finish_reason "error") is skipped for the next one. With `hedge` on,
+    a request still unanswered after the primary's `hedge_percentile`
+    latency (once `hedge_min_samples` requests have been measured) is also
+    sent to the next endpoint, and whichever answers first is used. For
+    streams the race is for the first chunk; after that the stream is
+    committed to its endpoint.
+
+    A request for the default model runs each endpoint with its own model.
+    A request for another model (e.g. a consolidation model) uses that
+    model on the first endpoint and falls back to the others' own models.
+    """
+
+    def __init__(
+        self,
+        endpoints: list[Endpoint],
+        hedge: bool = False,
+        hedge_percentile: float = 95.0,
+        hedge_min_samples: int = 20,
+    ):
+        if not endpoints:
+            raise ValueError("FailoverProvider needs at least one endpoint")
+        primary = endpoints[0].provider
+        super().__init__(primary.api_key, primary.api_base)
+        self.endpoints = endpoints
+        self.hedge = hedge and len(endpoints) > 1
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+
+    def _plan(self, model: str | None) -> list[tuple[Endpoint, str]]:
+        first = self.endpoints[0]
+        plan = [(first, model if model and model != first.model else first.model)]
+        return plan + [(ep, ep.model) for ep in self.endpoints[1:]]
+
+    def _hedge_delay(self, histogram: LatencyHistogram) -> float | None:
+        if not self.hedge or histogram.count < self.hedge_min_samples:
+            return None
+        return histogram.percentile(self.hedge_percentile)
+
+    async def _call(self, endpoint: Endpoint, model: str, kwargs: dict[str, Any]) -> LLMResponse:
+        endpoint.requests += 1
+        started = time.monotonic()
+        try:
+            response = await asyncio.wait_for(
+                endpoint.provider.chat(model=model, **kwargs), endpoint.timeout_s or None
+            )
+        except asyncio.TimeoutError:
+            endpoint.timeouts += 1
+            raise EndpointError(f"{endpoint.name} timed out after {endpoint.timeout_s:.0f}s")
+        except Exception as e:
+            endpoint.errors += 1
+            raise EndpointError(f"{endpoint.name}: {e}") from e
+        if response.finish_reason == "error":
+            endpoint.errors += 1
+            raise EndpointError(f"{endpoint.name}: {response.content}")
+        endpoint.latency_for(model).record(time.monotonic() - started)
+        return response
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        kwargs = dict(messages=messages, tools=tools, max_tokens=max_tokens, temperature=temperature)
+        plan = self._plan(model)
+        errors: list[str] = []
+        i = 0
+        while i < len(plan):
+            endpoint, ep_model = plan[i]
+            primary = asyncio.create_task(self._call(endpoint, ep_model, kwargs))
+            delay = self._hedge_delay(endpoint.latency_for(ep_model)) if i + 1 < len(plan) else None
+            try:
+                if delay is not None:
+                    done, _ = await asyncio.wait({primary}, timeout=delay)
+                    if not done:
+                        backup, backup_model = plan[i + 1]
+                        response = await self._race(primary, backup, backup_model, kwargs, errors)
+                        if response is not None:
+                            return response
+                        i += 2
+                        continue
+                return await primary
+            except EndpointError as e:
+                errors.append(str(e))
+                logger.warning(f"LLM endpoint failed, trying the next one: {e}")
+            finally:
+                primary.cancel()  # No-op once it has finished
+            i += 1
+        return LLMResponse(content=f"Error calling LLM: {'; '.join(errors)}", finish_reason="error")
+
+    async def _race(
+        self,
+        primary: asyncio.Task[LLMResponse],
+        backup: Endpoint,
+        backup_model: str,
+        kwargs: dict[str, Any],
+        errors: list[str],
+    ) -> LLMResponse | None:
+        """Run a hedge request against the primary; the first success wins. None if both fail."""
+        backup.hedges += 1
+        hedge = asyncio.create_task(self._call(backup, backup_model, kwargs))
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    try:
+                        response = task.result()
+                    except EndpointError as e:
+                        errors.append(str(e))
+                        continue
+                    if task is hedge:
+                        backup.hedges_won += 1
+                    return response
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[StreamChunk]:
+        kwargs = dict(messages=messages, tools=tools, max_tokens=max_tokens, temperature=temperature)
+        plan = self._plan(model)
+        errors: list[str] = []
+        i = 0
+        while i < len(plan):
+            endpoint, ep_model = plan[i]
+            contenders = [_Stream(endpoint, ep_model, kwargs)]
+            delay = self._hedge_delay(endpoint.first_chunk_for(ep_model)) if i + 1 < len(plan) else None
+            backup = plan[i + 1] if delay is not None else None
+            winner = await self._first_chunk(contenders, backup, delay, kwargs, errors)
+            i += len(contenders)
+            if winner is None:
+                continue
+            async for chunk in winner.rest():
+                yield chunk
+            return
+        yield StreamChunk(response=LLMResponse(content=f"Error calling LLM: {'; '.join(errors)}", finish_reason="error"))
+
+    async def _first_chunk(
+        self,
+        contenders: list[_Stream],
+        backup: tuple[Endpoint, str] | None,
+        delay: float | None,
+        kwargs: dict[str, Any],
+        errors: list[str],
+    ) -> _Stream | None:
+        """Wait for the first stream to produce a good first chunk, hedging after `delay`."""
+        tasks = {asyncio.create_task(contenders[0].start()): contenders[0]}
+        try:
+            while tasks:
+                timeout = delay if backup is not None else None
+                done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    endpoint, model = backup
+                    endpoint.hedges += 1
+                    hedge = _Stream(endpoint, model, kwargs, hedge=True)
+                    contenders.append(hedge)
+                    tasks[asyncio.create_task(hedge.start())] = hedge
+                    backup = None
+                    continue
+                for task in done:
+                    stream = tasks.pop(task)
+                    try:
+                        task.result()
+                    except EndpointError as e:
+                        errors.append(str(e))
+                        logger.warning(f"LLM endpoint failed, trying the next one: {e}")
+                        if backup is not None and not tasks:
+                            # The primary failed before the hedge delay: go straight to the backup
+                            endpoint, model = backup
+                            fallback = _Stream(endpoint, model, kwargs)
+                            contenders.append(fallback)
+                            tasks[asyncio.create_task(fallback.start())] = fallback
+                            backup = None
+                        continue
+                    if stream.hedge:
+                        stream.endpoint.hedges_won += 1
+                    return stream
+            return None
+        finally:
+            for task, stream in tasks.items():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                await stream.close()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Per-endpoint counters, and latency percentiles of each endpoint's own model."""
+        result = {}
+        for ep in self.endpoints:
+            latency, first_chunk = ep.latency_for(ep.model), ep.first_chunk_for(ep.model)
+            result[ep.name] = {
+                "requests": ep.requests,
+                "errors": ep.errors,
+                "timeouts": ep.timeouts,
+                "hedges": ep.hedges,
+                "hedges_won": ep.hedges_won,
+                "p50_s": latency.percentile(50),
+                "p95_s": latency.percentile(95),
+                "p99_s": latency.percentile(99),
+                "first_chunk_p95_s": first_chunk.percentile(95),
+                "other_models_p95_s": {
+                    model: h.percentile(95) for model, h in ep.latency.items() if model != ep.model and h.count
+                },
+            }
+        return result
+
+    def close(self) -> None:
+        for name, s in self.snapshot().items():
+            if s["requests"]:
+                logger.info(
+                    f"LLM endpoint {name}: {s['requests']} requests, {s['errors']} errors, {s['timeouts']} timeouts, "
+                    f"{s['hedges_won']}/{s['hedges']} hedges won, p95 {s['p95_s'] or 0:.1f}s"
+                )
+
+    def get_context_window(self, model: str | None = None) -> int | None:
+        return self.endpoints[0].provider.get_context_window(model or self.endpoints[0].model)
+
+    def get_default_model(self) -> str:
+        return self.endpoints[0].model
+
+
+class _Stream:
+    """A stream from one endpoint, split into its first chunk and the rest."""
+
+    def __init__(self, endpoint: Endpoint, model: str, kwargs: dict[str, Any], hedge: bool = False):
+        self.endpoint = endpoint
+        self.model = model
+        self.hedge = hedge
+        self._gen = endpoint.provider.chat_stream(model=model, **kwargs)
+        self._first: StreamChunk | None = None
+
+    async def start(self) -> None:
+        """Read the first chunk, raising EndpointError if the endpoint fails or times out first."""
+        ep = self.endpoint
+        ep.requests += 1
+        started = time.monotonic()
+        try:
+            self._first = await asyncio.wait_for(self._gen.__anext__(), ep.timeout_s or None)
+        except asyncio.TimeoutError:
+            ep.timeouts += 1
+            await self.close()
+            raise EndpointError(f"{ep.name} sent nothing for {ep.timeout_s:.0f}s")
+        except StopAsyncIteration:
+            ep.errors += 1
+            raise EndpointError(f"{ep.name}: empty stream")
+        except Exception as e:
+            ep.errors += 1
+            await self.close()
+            raise EndpointError(f"{ep.name}: {e}") from e
+        response = self._first.response
+        if response is not None and response.finish_reason == "error":
+            ep.errors += 1
+            await self.close()
+            raise EndpointError(f"{ep.name}: {response.content}")
+        ep.first_chunk_for(self.model).record(time.monotonic() - started)
+
+    async def rest(self) -> AsyncIterator[StreamChunk]:
+        yield self._first
+        async for chunk in self._gen:
+            yield chunk
+
+    async def close(self) -> None:
+        try:
+            await self._gen.aclose()
+        except Exception:
+            pass
@@ -1,15 +1,19 @@
 """LiteLLM provider implementation for multi-provider support."""
 
+import asyncio
+import itertools
 import json
 import json_repair
 import os
-from typing import Any
+from typing import Any, AsyncIterator
 
 import litellm
 from litellm import acompletion
 
-from zerobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from zerobot.providers.base import LLMProvider, LLMResponse, StreamChunk, ToolCallDelta, ToolCallRequest
+from zerobot.providers.rate_limit import get_llm_scheduler
 from zerobot.providers.registry import find_by_model, find_gateway
+from zerobot.utils.helpers import estimate_tokens
 
 
 class LiteLLMProvider(LLMProvider):
@@ -19,6 +23,10 @@ class LiteLLMProvider(LLMProvider):
     Supports OpenRouter, Anthropic, OpenAI, Gemini, MiniMax, and many other providers through
     a unified interface.  Provider-specific logic is driven by the registry
     (see providers/registry.py) — no if-elif chains needed here.
+    
+    Requests go through the shared LLM scheduler (providers/rate_limit.py),
+    which applies per-model concurrency and rate limits and retries rate
+    limit, overload and transient errors with backoff.
     """
     
     def __init__(
@@ -28,10 +36,12 @@ class LiteLLMProvider(LLMProvider):
         default_model: str = "anthropic/claude-opus-4-5",
         extra_headers: dict[str, str] | None = None,
         provider_name: str | None = None,
+        prompt_caching: bool = True,
     ):
         super().__init__(api_key, api_base)
         self.default_model = default_model
         self.extra_headers = extra_headers or {}
+        self.prompt_caching = prompt_caching
         
         # Detect gateway / local deployment.
         # provider_name (from config key) is the primary signal;
@@ -93,6 +103,36 @@ class LiteLLMProvider(LLMProvider):
         
         return model
     
+    def _supports_cache_control(self, model: str) -> bool:
+        """Whether requests for this model accept Anthropic-style cache_control breakpoints."""
+        spec = self._gateway or find_by_model(model)
+        if not spec or not spec.supports_cache_control:
+            return False
+        return not spec.is_gateway or "claude" in model.lower()
+    
+    def _apply_cache_control(self, messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Mark the system prompt and the last two messages as cache breakpoints.
+        
+        The system breakpoint covers tools + system prompt; the trailing ones
+        let the next turn (or tool iteration) reuse the whole history prefix.
+        Returns a new list; the caller's messages are not modified.
+        """
+        targets = [i for i, m in enumerate(messages) if m.get("role") == "system"][:1]
+        targets += [
+            i for i, m in enumerate(messages)
+            if m.get("role") != "system" and m.get("content")
+        ][-2:]
+        
+        marked = list(messages)
+        for i in targets:
+            msg = messages[i]
+            content = msg["content"]
+            blocks = [{"type": "text", "text": content}] if isinstance(content, str) else [dict(b) for b in content]
+            blocks[-1]["cache_control"] = {"type": "ephemeral"}
+            marked[i] = {**msg, "content": blocks}
+        return marked
+    
     def _apply_model_overrides(self, model: str, kwargs: dict[str, Any]) -> None:
         """Apply model-specific parameter overrides from the registry."""
         model_lower = model.lower()
@@ -124,12 +164,147 @@ class LiteLLMProvider(LLMProvider):
         Returns:
             LLMResponse with content and/or tool calls.
         """
+        kwargs = self._build_kwargs(messages, tools, model, max_tokens, temperature)
+        
+        async def request() -> LLMResponse:
+            return self._parse_response(await acompletion(**kwargs))
+        
+        try:
+            return await get_llm_scheduler().call(kwargs["model"], self._estimate_tokens(kwargs), request)
+        except Exception as e:
+            # Return error as content for graceful handling
+            return LLMResponse(
+                content=f"Error calling LLM: {str(e)}",
+                finish_reason="error",
+            )
+    
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[StreamChunk]:
+        """
+        Stream a chat completion via LiteLLM (acompletion with stream=True).
+        
+        Yields:
+            Content/tool-call deltas, then a final chunk with the assembled response.
+        """
+        kwargs = self._build_kwargs(messages, tools, model, max_tokens, temperature)
+        kwargs["stream"] = True
+        kwargs["stream_options"] = {"include_usage": True}
+        
+        content_parts: list[str] = []
+        reasoning_parts: list[str] = []
+        tool_buffers: dict[int, dict[str, Any]] = {}
+        finish_reason = "stop"
+        usage: dict[str, int] = {}
+        
+        scheduler = get_llm_scheduler()
+        tokens = self._estimate_tokens(kwargs)
+        lease = None
+        try:
+            # Retry opening the stream; once text has been relayed, a failure is final
+            for attempt in itertools.count():
+                lease = await scheduler.acquire(kwargs["model"], tokens)
+                try:
+                    stream = await acompletion(**kwargs)
+                    break
+                except Exception as e:
+                    delay = lease.fail(e, attempt)
+                    if delay is None:
+                        raise
+                    await asyncio.sleep(delay)
+            async for chunk in stream:
+                if getattr(chunk, "usage", None):
+                    usage = self._parse_usage(chunk.usage)
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                if choice.finish_reason:
+                    finish_reason = choice.finish_reason
+                delta = choice.delta
+                if delta is None:
+                    continue
+                
+                if reasoning := getattr(delta, "reasoning_content", None):
+                    reasoning_parts.append(reasoning)
+                
+                deltas: list[ToolCallDelta] = []
+                for tc in getattr(delta, "tool_calls", None) or []:
+                    index = tc.index if tc.index is not None else len(tool_buffers)
+                    buf = tool_buffers.setdefault(index, {"id": None, "name": None, "arguments": ""})
+                    fn = tc.function
+                    name = getattr(fn, "name", None)
+                    args = getattr(fn, "arguments", None) or ""
+                    if tc.id:
+                        buf["id"] = tc.id
+                    if name:
+                        buf["name"] = name
+                    buf["arguments"] += args
+                    deltas.append(ToolCallDelta(index=index, id=tc.id, name=name, arguments=args))
+                
+                text = getattr(delta, "content", None) or ""
+                if text or deltas:
+                    content_parts.append(text)
+                    yield StreamChunk(content=text, tool_calls=deltas)
+        except Exception as e:
+            if lease:
+                lease.fail(e, attempt=scheduler.max_retries)
+            yield StreamChunk(response=LLMResponse(
+                content=f"Error calling LLM: {str(e)}",
+                finish_reason="error",
+            ))
+            return
+        finally:
+            if lease:
+                lease.release(usage)
+        
+        tool_calls = []
+        for index, buf in sorted(tool_buffers.items()):
+            args = buf["arguments"]
+            tool_calls.append(ToolCallRequest(
+                id=buf["id"] or f"call_{index}",
+                name=buf["name"] or "",
+                arguments=json_repair.loads(args) if args else {},
+            ))
+        
+        yield StreamChunk(response=LLMResponse(
+            content="".join(content_parts) or None,
+            tool_calls=tool_calls,
+            finish_reason=finish_reason,
+            usage=usage,
+            reasoning_content="".join(reasoning_parts) or None,
+        ))
+    
+    @staticmethod
+    def _estimate_tokens(kwargs: dict[str, Any]) -> int:
+        """Tokens a request will count against a tokens-per-minute budget (prompt + max output)."""
+        prompt = json.dumps(kwargs["messages"], ensure_ascii=False, default=str)
+        if kwargs.get("tools"):
+            prompt += json.dumps(kwargs["tools"], ensure_ascii=False)
+        return estimate_tokens(prompt) + kwargs["max_tokens"]
+    
+    def _build_kwargs(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        model: str | None,
+        max_tokens: int,
+        temperature: float,
+    ) -> dict[str, Any]:
+        """Build acompletion kwargs for a request."""
         model = self._resolve_model(model or self.default_model)
         
         # Clamp max_tokens to at least 1 — negative or zero values cause
         # LiteLLM to reject the request with "max_tokens must be at least 1".
         max_tokens = max(1, max_tokens)
         
+        if self.prompt_caching and self._supports_cache_control(model):
+            messages = self._apply_cache_control(messages)
+        
         kwargs: dict[str, Any] = {
             "model": model,
             "messages": messages,
@@ -156,15 +331,7 @@ class LiteLLMProvider(LLMProvider):
             kwargs["tools"] = tools
             kwargs["tool_choice"] = "auto"
         
-        try:
-            response = await acompletion(**kwargs)
-            return self._parse_response(response)
-        except Exception as e:
-            # Return error as content for graceful handling
-            return LLMResponse(
-                content=f"Error calling LLM: {str(e)}",
-                finish_reason="error",
-            )
+        return kwargs
     
     def _parse_response(self, response: Any) -> LLMResponse:
         """Parse LiteLLM response into our standard format."""
@@ -187,11 +354,7 @@ class LiteLLMProvider(LLMProvider):
         
         usage = {}
         if hasattr(response, "usage") and response.usage:
-            usage = {
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens,
-                "total_tokens": response.usage.total_tokens,
-            }
+            usage = self._parse_usage(response.usage)
         
         reasoning_content = getattr(message, "reasoning_content", None)
         
@@ -203,6 +366,35 @@ class LiteLLMProvider(LLMProvider):
             reasoning_content=reasoning_content,
         )
     
+    def _parse_usage(self, usage: Any) -> dict[str, int]:
+        """
+        Convert a LiteLLM usage object into a plain dict.
+        
+        Adds cached_tokens (prompt tokens served from the provider's prompt
+        cache) and cache_creation_tokens (tokens written to it) when reported.
+        """
+        result = {
+            "prompt_tokens": usage.prompt_tokens,
+            "completion_tokens": usage.completion_tokens,
+            "total_tokens": usage.total_tokens,
+        }
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", None) or getattr(usage, "cache_read_input_tokens", None)
+        if cached:
+            result["cached_tokens"] = int(cached)
+        created = getattr(usage, "cache_creation_input_tokens", None)
+        if created:
+            result["cache_creation_tokens"] = int(created)
+        return result
+    
+    def get_context_window(self, model: str | None = None) -> int | None:
+        """Look up the model's input context size in LiteLLM's model map."""
+        try:
+            info = litellm.get_model_info(self._resolve_model(model or self.default_model))
+        except Exception:
+            return None
+        return info.get("max_input_tokens") or info.get("max_tokens")
+    
     def get_default_model(self) -> str:
         """Get the default model."""
         return self.default_model
@@ -5,13 +5,14 @@ from __future__ import annotations
 import asyncio
 import hashlib
 import json
-from typing import Any, AsyncGenerator
+from typing import Any, AsyncGenerator, AsyncIterator
 
 import httpx
 from loguru import logger
 
 from oauth_cli_kit import get_token as get_codex_token
-from zerobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from zerobot.providers.base import LLMProvider, LLMResponse, StreamChunk, ToolCallDelta, ToolCallRequest
+from zerobot.utils.http import get_http_client
 
 DEFAULT_CODEX_URL = "https://chatgpt.com/backend-api/codex/responses"
 DEFAULT_ORIGINATOR = "zerobot"
@@ -32,6 +33,58 @@ class OpenAICodexProvider(LLMProvider):
         max_tokens: int = 4096,
         temperature: float = 0.7,
     ) -> LLMResponse:
+        url = DEFAULT_CODEX_URL
+        headers, body = await self._prepare_request(messages, tools, model)
+
+        try:
+            try:
+                return await _request_codex(url, headers, body, verify=True)
+            except Exception as e:
+                if "CERTIFICATE_VERIFY_FAILED" not in str(e):
+                    raise
+                logger.warning("SSL certificate verification failed for Codex API; retrying with verify=False")
+                return await _request_codex(url, headers, body, verify=False)
+        except Exception as e:
+            return LLMResponse(
+                content=f"Error calling Codex: {str(e)}",
+                finish_reason="error",
+            )
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[StreamChunk]:
+        url = DEFAULT_CODEX_URL
+        started = False
+        try:
+            headers, body = await self._prepare_request(messages, tools, model)
+            try:
+                async for chunk in _stream_codex(url, headers, body, verify=True):
+                    started = True
+                    yield chunk
+            except Exception as e:
+                # Only retry if nothing has been streamed yet.
+                if started or "CERTIFICATE_VERIFY_FAILED" not in str(e):
+                    raise
+                logger.warning("SSL certificate verification failed for Codex API; retrying with verify=False")
+                async for chunk in _stream_codex(url, headers, body, verify=False):
+                    yield chunk
+        except Exception as e:
+            yield StreamChunk(response=LLMResponse(
+                content=f"Error calling Codex: {str(e)}",
+                finish_reason="error",
+            ))
+
+    async def _prepare_request(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        model: str | None,
+    ) -> tuple[dict[str, str], dict[str, Any]]:
         model = model or self.default_model
         system_prompt, input_items = _convert_messages(messages)
 
@@ -46,34 +99,14 @@ class OpenAICodexProvider(LLMProvider):
             "input": input_items,
             "text": {"verbosity": "medium"},
             "include": ["reasoning.encrypted_content"],
-            "prompt_cache_key": _prompt_cache_key(messages),
+            "prompt_cache_key": _prompt_cache_key(model, system_prompt),
             "tool_choice": "auto",
             "parallel_tool_calls": True,
         }
 
         if tools:
             body["tools"] = _convert_tools(tools)
-
-        url = DEFAULT_CODEX_URL
-
-        try:
-            try:
-                content, tool_calls, finish_reason = await _request_codex(url, headers, body, verify=True)
-            except Exception as e:
-                if "CERTIFICATE_VERIFY_FAILED" not in str(e):
-                    raise
-                logger.warning("SSL certificate verification failed for Codex API; retrying with verify=False")
-                content, tool_calls, finish_reason = await _request_codex(url, headers, body, verify=False)
-            return LLMResponse(
-                content=content,
-                tool_calls=tool_calls,
-                finish_reason=finish_reason,
-            )
-        except Exception as e:
-            return LLMResponse(
-                content=f"Error calling Codex: {str(e)}",
-                finish_reason="error",
-            )
+        return headers, body
 
     def get_default_model(self) -> str:
         return self.default_model
@@ -102,13 +135,28 @@ async def _request_codex(
     headers: dict[str, str],
     body: dict[str, Any],
     verify: bool,
-) -> tuple[str, list[ToolCallRequest], str]:
-    async with httpx.AsyncClient(timeout=60.0, verify=verify) as client:
-        async with client.stream("POST", url, headers=headers, json=body) as response:
-            if response.status_code != 200:
-                text = await response.aread()
-                raise RuntimeError(_friendly_error(response.status_code, text.decode("utf-8", "ignore")))
-            return await _consume_sse(response)
+) -> LLMResponse:
+    client = get_http_client(verify=verify)
+    async with client.stream("POST", url, headers=headers, json=body, timeout=60.0) as response:
+        if response.status_code != 200:
+            text = await response.aread()
+            raise RuntimeError(_friendly_error(response.status_code, text.decode("utf-8", "ignore")))
+        return await _consume_sse(response)
+
+
+async def _stream_codex(
+    url: str,
+    headers: dict[str, str],
+    body: dict[str, Any],
+    verify: bool,
+) -> AsyncGenerator[StreamChunk, None]:
+    client = get_http_client(verify=verify)
+    async with client.stream("POST", url, headers=headers, json=body, timeout=60.0) as response:
+        if response.status_code != 200:
+            text = await response.aread()
+            raise RuntimeError(_friendly_error(response.status_code, text.decode("utf-8", "ignore")))
+        async for chunk in _stream_sse(response):
+            yield chunk
 
 
 def _convert_tools(tools: list[dict[str, Any]]) -> list[dict[str, Any]]:
@@ -217,8 +265,10 @@ def _split_tool_call_id(tool_call_id: Any) -> tuple[str, str | None]:
     return "call_0", None
 
 
-def _prompt_cache_key(messages: list[dict[str, Any]]) -> str:
-    raw = json.dumps(messages, ensure_ascii=True, sort_keys=True)
+def _prompt_cache_key(model: str, instructions: str) -> str:
+    # Keyed on the stable prefix only, so every turn of a conversation
+    # routes to the same cache instead of a fresh key per request.
+    raw = json.dumps([model, instructions], ensure_ascii=True)
     return hashlib.sha256(raw.encode("utf-8")).hexdigest()
 
 
@@ -242,11 +292,20 @@ async def _iter_sse(response: httpx.Response) -> AsyncGenerator[dict[str, Any],
         buffer.append(line)
 
 
-async def _consume_sse(response: httpx.Response) -> tuple[str, list[ToolCallRequest], str]:
+async def _consume_sse(response: httpx.Response) -> LLMResponse:
+    final = LLMResponse(content="")
+    async for chunk in _stream_sse(response):
+        if chunk.response is not None:
+            final = chunk.response
+    return final
+
+
+async def _stream_sse(response: httpx.Response) -> AsyncGenerator[StreamChunk, None]:
     content = ""
     tool_calls: list[ToolCallRequest] = []
     tool_call_buffers: dict[str, dict[str, Any]] = {}
     finish_reason = "stop"
+    usage: dict[str, int] = {}
 
     async for event in _iter_sse(response):
         event_type = event.get("type")
@@ -257,16 +316,30 @@ async def _consume_sse(response: httpx.Response) -> tuple[str, list[ToolCallRequ
                 if not call_id:
                     continue
                 tool_call_buffers[call_id] = {
+                    "index": len(tool_call_buffers),
                     "id": item.get("id") or "fc_0",
                     "name": item.get("name"),
                     "arguments": item.get("arguments") or "",
                 }
+                yield StreamChunk(tool_calls=[ToolCallDelta(
+                    index=tool_call_buffers[call_id]["index"],
+                    id=call_id,
+                    name=item.get("name"),
+                )])
         elif event_type == "response.output_text.delta":
-            content += event.get("delta") or ""
+            delta = event.get("delta") or ""
+            content += delta
+            if delta:
+                yield StreamChunk(content=delta)
         elif event_type == "response.function_call_arguments.delta":
             call_id = event.get("call_id")
             if call_id and call_id in tool_call_buffers:
-                tool_call_buffers[call_id]["arguments"] += event.get("delta") or ""
+                delta = event.get("delta") or ""
+                tool_call_buffers[call_id]["arguments"] += delta
+                yield StreamChunk(tool_calls=[ToolCallDelta(
+                    index=tool_call_buffers[call_id]["index"],
+                    arguments=delta,
+                )])
         elif event_type == "response.function_call_arguments.done":
             call_id = event.get("call_id")
             if call_id and call_id in tool_call_buffers:
@@ -291,12 +364,32 @@ async def _consume_sse(response: httpx.Response) -> tuple[str, list[ToolCallRequ
                     )
                 )
         elif event_type == "response.completed":
-            status = (event.get("response") or {}).get("status")
-            finish_reason = _map_finish_reason(status)
+            completed = event.get("response") or {}
+            finish_reason = _map_finish_reason(completed.get("status"))
+            usage = _parse_usage(completed.get("usage"))
         elif event_type in {"error", "response.failed"}:
             raise RuntimeError("Codex response failed")
 
-    return content, tool_calls, finish_reason
+    yield StreamChunk(response=LLMResponse(
+        content=content,
+        tool_calls=tool_calls,
+        finish_reason=finish_reason,
+        usage=usage,
+    ))
+
+
+def _parse_usage(usage: dict[str, Any] | None) -> dict[str, int]:
+    if not usage:
+        return {}
+    result = {
+        "prompt_tokens": usage.get("input_tokens") or 0,
+        "completion_tokens": usage.get("output_tokens") or 0,
+        "total_tokens": usage.get("total_tokens") or 0,
+    }
+    cached = (usage.get("input_tokens_details") or {}).get("cached_tokens")
+    if cached:
+        result["cached_tokens"] = cached
+    return result
 
 
 _FINISH_REASON_MAP = {"completed": "stop", "incomplete": "length", "failed": "error", "cancelled": "error"}
@@ -0,0 +1,360 @@
+"""Per-model request scheduling: concurrency caps, RPM/TPM budgets and retry with backoff."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import itertools
+import random
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Iterator
+
+from loguru import logger
+
+# Request priorities, most urgent first
+PRIORITIES = ("interactive", "background")
+
+# Statuses worth retrying: timeouts, conflicts, rate limits, overload and server errors
+_RETRY_STATUS = {408, 409, 425, 429, 500, 502, 503, 504, 529}
+_WINDOW_S = 60.0
+
+_priority: contextvars.ContextVar[str] = contextvars.ContextVar("llm_priority", default="interactive")
+
+
+@contextmanager
+def llm_priority(priority: str) -> Iterator[None]:
+    """Run LLM requests made inside the block (and tasks it creates) at this priority."""
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown priority {priority!r} (use one of {', '.join(PRIORITIES)})")
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+@dataclass
+class ModelLimits:
+    """Limits for one model; 0 = unlimited."""
+    max_concurrent: int = 8
+    requests_per_minute: int = 0
+    tokens_per_minute: int = 0
+
+
+@dataclass
+class LimiterStats:
+    requests: int = 0
+    retries: int = 0
+    rate_limited: int = 0  # 429 responses
+    failed: int = 0  # Requests that failed after retries (or with a non-retryable error)
+    waited: int = 0  # Requests that could not start right away
+    total_wait_s: float = 0.0
+
+
+def status_code(exc: BaseException) -> int | None:
+    for obj in (exc, getattr(exc, "response", None)):
+        code = getattr(obj, "status_code", None)
+        if isinstance(code, int):
+            return code
+    return None
+
+
+def retry_after(exc: BaseException) -> float | None:
+    """Seconds the server asked us to wait (Retry-After / retry-after-ms), if it said."""
+    for headers in (
+        getattr(getattr(exc, "response", None), "headers", None),
+        getattr(exc, "litellm_response_headers", None),
+        getattr(exc, "headers", None),
+    ):
+        if not headers:
+            continue
+        try:
+            if value := headers.get("retry-after-ms"):
+                return max(0.0, float(value) / 1000)
+            if value := headers.get("retry-after"):
+                try:
+                    return max(0.0, float(value))
+                except ValueError:
+                    return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError, AttributeError):
+            continue
+    return None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    code = status_code(exc)
+    if code is not None:
+        return code in _RETRY_STATUS
+    return isinstance(exc, (asyncio.TimeoutError, ConnectionError))
+
+
+class Lease:
+    """A granted request slot. Release it exactly once, via release() or fail()."""
+
+    def __init__(self, limiter: ModelLimiter, entry: list[float]):
+        self._limiter = limiter
+        self._entry = entry  # [started_at, tokens] in the limiter's budget window
+        self._done = False
+
+    def release(self, usage: dict[str, int] | None = None) -> None:
+        """Free the slot, correcting the token budget with the tokens actually used."""
+        if self._done:
+            return
+        self._done = True
+        if usage:
+            used = usage.get("total_tokens") or usage.get("prompt_tokens", 0) + usage.get("completion_tokens", 0)
+            if used:
+                self._entry[1] = used
+        self._limiter._release()
+
+    def fail(self, exc: BaseException, attempt: int) -> float | None:
+        """
+        Free the slot after a failed request.
+
+        Returns:
+            Seconds to wait before trying again, or None if the request
+            should not be retried.
+        """
+        if self._done:
+            return None
+        self._done = True
+        self._entry[1] = 0  # A rejected request used no tokens
+        return self._limiter._failed(exc, attempt)
+
+
+class ModelLimiter:
+    """
+    Admission control for one model (at one provider).
+
+    A request starts when a concurrency slot is free and the last minute's
+    requests and tokens leave room for it. Waiting requests start in
+    priority order, then in arrival order. A 429 pauses the whole model for
+    the server's Retry-After (or the backoff delay), so waiting requests
+    don't pile onto a limit that has already been hit.
+    """
+
+    def __init__(self, name: str, limits: ModelLimits, max_retries: int, backoff_s: float, max_backoff_s: float):
+        self.name = name
+        self.limits = limits
+        self.max_retries = max_retries
+        self.backoff_s = backoff_s
+        self.max_backoff_s = max_backoff_s
+        self.stats = LimiterStats()
+        self._window: deque[list[float]] = deque()  # [started_at, tokens] per request of the last minute
+        self._in_flight = 0
+        self._waiting: list[tuple[int, int]] = []  # (priority, arrival) tickets
+        self._arrivals = itertools.count()
+        self._paused_until = 0.0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._changed: asyncio.Condition | None = None
+        self._wakers: set[asyncio.Task[None]] = set()
+
+    def _condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:  # Conditions can't cross event loops
+            self._loop = loop
+            self._changed = asyncio.Condition()
+            self._in_flight = 0
+            self._waiting = []
+        return self._changed
+
+    def _budget_delay(self, tokens: int, now: float) -> float:
+        """Seconds until the rolling budgets have room for this request (0 = now)."""
+        while self._window and self._window[0][0] <= now - _WINDOW_S:
+            self._window.popleft()
+        delay = 0.0
+        rpm, tpm = self.limits.requests_per_minute, self.limits.tokens_per_minute
+        if rpm and len(self._window) >= rpm:
+            delay = self._window[len(self._window) - rpm][0] + _WINDOW_S - now
+        if tpm and self._window:
+            # Free the oldest entries until this request fits (an oversized request waits for an empty window)
+            used = sum(tokens_ for _, tokens_ in self._window)
+            for started_at, tokens_ in self._window:
+                if used + tokens <= tpm:
+                    break
+                used -= tokens_
+                delay = max(delay, started_at + _WINDOW_S - now)
+        return max(0.0, delay)
+
+    async def acquire(self, tokens: int = 0, priority: str | None = None) -> Lease:
+        priority = priority or _priority.get()
+        ticket = (PRIORITIES.index(priority), next(self._arrivals))
+        changed = self._condition()
+        started = time.monotonic()
+        async with changed:
+            self._waiting.append(ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    timeout = None
+                    if min(self._waiting) == ticket:
+                        cap = self.limits.max_concurrent
+                        if self._paused_until > now:
+                            timeout = self._paused_until - now
+                        elif not cap or self._in_flight < cap:
+                            timeout = self._budget_delay(tokens, now)
+                            if timeout <= 0:
+                                break
+                    try:
+                        await asyncio.wait_for(changed.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                self._waiting.remove(ticket)
+                changed.notify_all()
+            self._in_flight += 1
+        waited = time.monotonic() - started
+        if waited > 0.001:
+            self.stats.waited += 1
+            self.stats.total_wait_s += waited
+        self.stats.requests += 1
+        entry = [time.monotonic(), float(tokens)]
+        self._window.append(entry)
+        return Lease(self, entry)
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+        self._notify()
+
+    def _notify(self) -> None:
+        changed = self._changed
+        if changed is None:
+            return
+
+        async def wake() -> None:
+            async with changed:
+                changed.notify_all()
+
+        task = asyncio.get_running_loop().create_task(wake())
+        self._wakers.add(task)
+        task.add_done_callback(self._wakers.discard)
+
+    def _failed(self, exc: BaseException, attempt: int) -> float | None:
+        self._in_flight -= 1
+        code = status_code(exc)
+        if code == 429:
+            self.stats.rate_limited += 1
+        if attempt >= self.max_retries or not is_retryable(exc):
+            self.stats.failed += 1
+            self._notify()
+            return None
+        self.stats.retries += 1
+        delay = retry_after(exc)
+        if delay is None:
+            delay = self.backoff_s * 2 ** attempt * random.uniform(0.5, 1.0)
+        delay = min(delay, self.max_backoff_s)
+        if code == 429:
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        logger.warning(f"LLM request to {self.name} failed ({code or type(exc).__name__}), retrying in {delay:.1f}s")
+        self._notify()
+        return delay
+
+    def snapshot(self) -> dict[str, Any]:
+        now = time.monotonic()
+        recent = [e for e in self._window if e[0] > now - _WINDOW_S]
+        s = self.stats
+        return {
+            "in_flight": self._in_flight,
+            "waiting": len(self._waiting),
+            "requests": s.requests,
+            "retries": s.retries,
+            "rate_limited": s.rate_limited,
+            "failed": s.failed,
+            "avg_wait_s": round(s.total_wait_s / s.waited, 3) if s.waited else 0.0,
+            "last_minute_requests": len(recent),
+            "last_minute_tokens": int(sum(e[1] for e in recent)),
+            "paused_s": round(max(0.0, self._paused_until - now), 1),
+        }
+
+
+class LLMScheduler:
+    """
+    Limiters for every model in use, created on first request.
+
+    `overrides` maps a model name, or a prefix of it such as
+    "anthropic/", to its own limits; the longest match wins and other
+    models get `limits`.
+    """
+
+    def __init__(
+        self,
+        limits: ModelLimits | None = None,
+        overrides: dict[str, ModelLimits] | None = None,
+        max_retries: int = 4,
+        backoff_s: float = 1.0,
+        max_backoff_s: float = 60.0,
+    ):
+        self.limits = limits or ModelLimits()
+        self.overrides = overrides or {}
+        self.max_retries = max_retries
+        self.backoff_s = backoff_s
+        self.max_backoff_s = max_backoff_s
+        self._limiters: dict[str, ModelLimiter] = {}
+
+    def limits_for(self, model: str) -> ModelLimits:
+        matches = [name for name in self.overrides if model == name or model.startswith(name)]
+        return self.overrides[max(matches, key=len)] if matches else self.limits
+
+    def limiter(self, model: str) -> ModelLimiter:
+        if model not in self._limiters:
+            self._limiters[model] = ModelLimiter(
+                model, self.limits_for(model), self.max_retries, self.backoff_s, self.max_backoff_s
+            )
+        return self._limiters[model]
+
+    async def acquire(self, model: str, tokens: int = 0, priority: str | None = None) -> Lease:
+        return await self.limiter(model).acquire(tokens, priority)
+
+    async def call(self, model: str, tokens: int, request: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run `request` under the model's limits, retrying retryable errors.
+
+        The result's `usage` (if any) corrects the token budget. The last
+        error is raised once retries run out.
+        """
+        for attempt in itertools.count():
+            lease = await self.acquire(model, tokens)
+            try:
+                result = await request()
+            except Exception as e:
+                delay = lease.fail(e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                lease.release()
+                raise
+            lease.release(getattr(result, "usage", None))
+            return result
+
+    def snapshot(self) -> dict[str, Any]:
+        return {name: limiter.snapshot() for name, limiter in sorted(self._limiters.items())}
+
+
+_scheduler = LLMScheduler()
+
+
+def configure_llm_limits(config: Any) -> LLMScheduler:
+    """Replace the shared scheduler with one built from a RateLimitsConfig."""
+    global _scheduler
+
+    def limits(c: Any) -> ModelLimits:
+        return ModelLimits(c.max_concurrent, c.requests_per_minute, c.tokens_per_minute)
+
+    _scheduler = LLMScheduler(
+        limits=limits(config),
+        overrides={name: limits(c) for name, c in config.models.items()},
+        max_retries=config.max_retries,
+        backoff_s=config.backoff_s,
+        max_backoff_s=config.max_backoff_s,
+    )
+    return _scheduler
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    return _scheduler
@@ -54,6 +54,10 @@ class ProviderSpec:
     # OAuth-based providers (e.g., OpenAI Codex) don't use API keys
     is_oauth: bool = False                   # if True, uses OAuth flow instead of API key
 
+    # prompt caching: accepts Anthropic-style cache_control breakpoints
+    # (on gateways, only applied to Claude models)
+    supports_cache_control: bool = False
+
     @property
     def label(self) -> str:
         return self.display_name or self.name.title()
@@ -98,6 +102,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         default_api_base="https://openrouter.ai/api/v1",
         strip_model_prefix=False,
         model_overrides=(),
+        supports_cache_control=True,        # forwarded to Anthropic models
     ),
 
     # AiHubMix: global gateway, OpenAI-compatible interface.
@@ -138,6 +143,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         default_api_base="",
         strip_model_prefix=False,
         model_overrides=(),
+        supports_cache_control=True,
     ),
 
     # OpenAI: LiteLLM recognizes "gpt-*" natively, no prefix needed.
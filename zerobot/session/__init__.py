@@ -1,5 +1,8 @@
 """Session management module."""
 
 from zerobot.session.manager import SessionManager, Session
+from zerobot.session.store import SessionStore
+from zerobot.session.jsonl_store import JsonlSessionStore
+from zerobot.session.sqlite_store import SqliteSessionStore
 
-__all__ = ["SessionManager", "Session"]
+__all__ = ["SessionManager", "Session", "SessionStore", "JsonlSessionStore", "SqliteSessionStore"]
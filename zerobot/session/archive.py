@@ -0,0 +1,187 @@
+"""Compressed archive of idle session files."""
+
+import gzip
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads of this process are serialized
+    fcntl = None
+
+from zerobot.utils.helpers import ensure_dir
+
+_INDEX = "index.json"
+_LOCK = "index.lock"
+
+
+class SessionArchive:
+    """
+    Gzip-compressed segments holding session files that went cold.
+
+    Each archiving run writes one segment file: the session files
+    compressed one gzip member each, back to back (so the segment is itself
+    a valid .gz file). index.json maps file names to their member's
+    offset and length, so a single session is restored with one seek and
+    one decompression. A segment is deleted once none of its sessions are
+    left in it.
+
+    Several processes may share an archive (the gateway and the
+    `sessions archive` command): changes to the index take a file lock and
+    re-read index.json under it, and readers reload it whenever the file
+    has been replaced.
+    """
+
+    def __init__(self, archive_dir: Path):
+        self.archive_dir = archive_dir
+        self._lock = threading.Lock()
+        self._index: dict[str, dict[str, Any]] = {}
+        self._index_stat: tuple[int, int, int] | None = None  # (inode, size, mtime_ns) of the loaded index.json
+
+    def _entries(self) -> dict[str, dict[str, Any]]:
+        """The index, reloaded if index.json changed since it was read (call with self._lock held)."""
+        path = self.archive_dir / _INDEX
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            self._index, self._index_stat = {}, None
+            return self._index
+        stat = (st.st_ino, st.st_size, st.st_mtime_ns)
+        if stat != self._index_stat:
+            self._index = json.loads(path.read_text(encoding="utf-8")).get("sessions", {})
+            self._index_stat = stat
+        return self._index
+
+    def _save_index(self) -> None:
+        path = self.archive_dir / _INDEX
+        tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"version": 1, "sessions": self._index}), encoding="utf-8")
+        os.replace(tmp, path)
+        st = path.stat()
+        self._index_stat = (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    @contextmanager
+    def _locked(self) -> Iterator[dict[str, dict[str, Any]]]:
+        """Hold the index lock across threads and processes; yields the current index."""
+        with self._lock:
+            ensure_dir(self.archive_dir)
+            with open(self.archive_dir / _LOCK, "a") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield self._entries()
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return name in self._entries()
+
+    def entries(self) -> dict[str, dict[str, Any]]:
+        """Archived files by name: key, created_at, updated_at, segment, offset, length, size."""
+        with self._lock:
+            return dict(self._entries())
+
+    def add(self, files: list[tuple[Path, dict[str, Any]]]) -> dict[str, int]:
+        """
+        Compress session files into a new segment and delete the originals.
+
+        Args:
+            files: (path, info) pairs; info (key, created_at, updated_at) is
+                kept in the index for listing without decompressing.
+
+        Returns:
+            Counts of archived files and their size before and after compression.
+        """
+        result = {"sessions": 0, "bytes": 0, "compressed": 0}
+        if not files:
+            return result
+        ensure_dir(self.archive_dir)
+        segment = self.archive_dir / f"segment-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.gz"
+        added: dict[str, dict[str, Any]] = {}
+        with open(segment, "ab") as f:
+            for path, info in files:
+                try:
+                    data = path.read_bytes()
+                except OSError:
+                    continue
+                member = gzip.compress(data)
+                offset = f.tell()
+                f.write(member)
+                added[path.name] = {
+                    **info,
+                    "segment": segment.name,
+                    "offset": offset,
+                    "length": len(member),
+                    "size": len(data),
+                }
+            f.flush()
+            os.fsync(f.fileno())
+
+        with self._locked() as entries:
+            entries.update(added)
+            self._save_index()
+        # A crash before this point leaves both copies; the live file wins
+        for path, _ in files:
+            if path.name in added:
+                path.unlink(missing_ok=True)
+                result["sessions"] += 1
+                result["bytes"] += added[path.name]["size"]
+                result["compressed"] += added[path.name]["length"]
+        return result
+
+    def read(self, name: str) -> bytes | None:
+        """The original contents of an archived file, or None if it is not archived."""
+        with self._lock:
+            entry = self._entries().get(name)
+        if entry is None:
+            return None
+        with open(self.archive_dir / entry["segment"], "rb") as f:
+            f.seek(entry["offset"])
+            return gzip.decompress(f.read(entry["length"]))
+
+    def restore(self, name: str, path: Path) -> bool:
+        """Move an archived file back to `path`. Returns False if it is not archived."""
+        data = self.read(name)
+        if data is None:
+            return False
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        self.remove(name)
+        return True
+
+    def remove(self, name: str) -> None:
+        """Drop a file from the archive, deleting its segment if that was the last one in it."""
+        with self._locked() as entries:
+            entry = entries.pop(name, None)
+            if entry is None:
+                return
+            self._save_index()
+            if not any(e["segment"] == entry["segment"] for e in entries.values()):
+                (self.archive_dir / entry["segment"]).unlink(missing_ok=True)
+
+    def stats(self) -> dict[str, int]:
+        """Archived sessions, their original size, and the size of the segments on disk."""
+        with self._lock:
+            entries = list(self._entries().values())
+        segments = {e["segment"] for e in entries}
+        on_disk = 0
+        for name in segments:
+            try:
+                on_disk += (self.archive_dir / name).stat().st_size
+            except OSError:
+                pass
+        return {
+            "sessions": len(entries),
+            "bytes": sum(e["size"] for e in entries),
+            "compressed": sum(e["length"] for e in entries),
+            "segments": len(segments),
+            "segment_bytes": on_disk,  # Includes space of restored sessions not yet reclaimed
+        }
@@ -0,0 +1,358 @@
+"""Session store with one append-only JSONL file per session."""
+
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from zerobot.session.archive import SessionArchive
+from zerobot.session.log import (
+    FileSource,
+    MessageLog,
+    parse_messages,
+    read_lines_backwards,
+    read_messages,
+    take,
+)
+from zerobot.session.store import SessionStore, StoredSession
+from zerobot.utils.helpers import ensure_dir, safe_filename
+
+
+@dataclass
+class _FileState:
+    """What a session file on disk holds, as last written or read by this store."""
+    messages: int  # Messages in the file
+    last: dict[str, Any] | None  # The in-memory message written last (checked by identity)
+    size: int  # File size in bytes after our last write
+    stale: int  # Superseded metadata records
+    meta: str  # Last metadata record
+
+
+class JsonlSessionStore(SessionStore):
+    """
+    Sessions as JSONL files in a directory.
+
+    Each file holds the messages, each batch followed by a metadata record
+    that also holds the message count so far (the last record wins on
+    load). Writes only append, so a turn costs O(new messages) and a crash
+    can at most tear the final line. The file is rewritten in full
+    (atomically) when the session was cleared, changed on disk behind our
+    back, or has accumulated enough superseded metadata records to be worth
+    compacting.
+
+    Large files are opened lazily: the file is read backwards from the end
+    until the metadata record and the wanted tail of messages are found.
+
+    Files left idle can be moved into a compressed archive (see
+    SessionArchive) in the archive/ subdirectory; loading an archived
+    session restores its file first.
+    """
+
+    def __init__(
+        self,
+        sessions_dir: Path,
+        compact_min_records: int = 64,
+        lazy_min_bytes: int = 64 * 1024,
+        fsync: str = "never",
+    ):
+        self.sessions_dir = ensure_dir(sessions_dir)
+        self.compact_min_records = compact_min_records
+        self.lazy_min_bytes = lazy_min_bytes  # Smaller files are simply read whole
+        self.fsync = fsync  # "never" (leave it to the OS) or "always" (fsync every write)
+        self._files: dict[str, _FileState] = {}
+        self.archive = SessionArchive(self.sessions_dir / "archive")
+
+    def path(self, key: str) -> Path:
+        """Get the file path for a session."""
+        safe_key = safe_filename(key.replace(":", "_"))
+        return self.sessions_dir / f"{safe_key}.jsonl"
+
+    def load(self, key: str, tail_messages: int) -> StoredSession | None:
+        path = self.path(key)
+
+        if not path.exists():
+            if not self.archive.restore(path.name, path):
+                return None
+            logger.debug(f"Session {key}: restored from the archive")
+        elif path.name in self.archive:
+            self.archive.remove(path.name)  # Archiving was interrupted; the file is current
+
+        if path.stat().st_size >= self.lazy_min_bytes and (stored := self._read_tail(key, path, tail_messages)):
+            return stored
+
+        messages = []
+        meta: dict[str, Any] = {}
+        meta_line = ""
+        meta_records = 0
+        damaged = 0
+
+        with open(path, "rb") as f:
+            raw = f.read()
+        for line in raw.decode("utf-8", errors="replace").splitlines():
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError:
+                damaged += 1  # Usually a write torn by a crash
+                continue
+
+            if data.get("_type") == "metadata":
+                meta, meta_line = data, line
+                meta_records += 1
+            else:
+                messages.append(data)
+
+        if damaged:
+            logger.warning(f"Session {key}: skipped {damaged} damaged line(s); the file will be rewritten")
+        else:
+            self._files[key] = _FileState(
+                messages=len(messages),
+                last=messages[-1] if messages else None,
+                size=len(raw),
+                stale=max(0, meta_records - 1),
+                meta=meta_line,
+            )
+        return _stored(MessageLog(messages), meta)
+
+    def _read_tail(self, key: str, path: Path, tail_messages: int) -> StoredSession | None:
+        """
+        Load only the end of a session file.
+
+        Returns:
+            The session, or None if the file needs a full read (no message
+            count in its metadata, or damaged lines near the end).
+        """
+        size = path.stat().st_size
+        tail: list[dict[str, Any]] = []
+        meta: dict[str, Any] | None = None
+        meta_line = ""
+        meta_records = 0
+        after_meta = 0  # Messages after the last metadata record
+        first = size  # Offset of the earliest line read
+        want = None
+
+        for offset, raw in read_lines_backwards(path, size):
+            line = raw.strip()
+            if line:
+                try:
+                    data = json.loads(line)
+                except json.JSONDecodeError:
+                    return None
+                if data.get("_type") == "metadata":
+                    meta_records += 1
+                    if meta is None:
+                        if "messages" not in data:
+                            return None  # Written before message counts were recorded
+                        meta, meta_line = data, line.decode("utf-8")
+                        total = data["messages"] + after_meta
+                        want = max(tail_messages, total - data.get("last_consolidated", 0))
+                else:
+                    tail.append(data)
+                    if meta is None:
+                        after_meta += 1
+            first = offset
+            if want is not None and len(tail) >= want:
+                break
+        else:
+            return None  # Read it all anyway; let the full reader handle it
+
+        tail.reverse()
+        base = total - len(tail)
+        self._files[key] = _FileState(
+            messages=total,
+            last=tail[-1] if tail else None,
+            size=size,
+            stale=max(0, meta_records - 1),
+            meta=meta_line,
+        )
+        return _stored(MessageLog(tail, base=base, source=FileSource(path, base, first)), meta)
+
+    def write(self, key: str, messages: list[dict[str, Any]] | MessageLog, count: int, meta: str) -> None:
+        path = self.path(key)
+        state = self._files.get(key)
+
+        if state is None or not self._can_append(path, messages, count, state):
+            self._rewrite(path, key, messages, count, meta)
+            return
+
+        new = take(messages, state.messages, count)
+        if not new and meta == state.meta:
+            return
+        data = "".join(json.dumps(m) + "\n" for m in new) + meta + "\n"
+        with open(path, "a") as f:
+            f.write(data)
+            self._sync(f)
+        state.messages = count
+        state.last = new[-1] if new else state.last
+        state.size += len(data.encode("utf-8"))
+        state.stale += 1
+        state.meta = meta
+        if state.stale >= max(self.compact_min_records, count // 4):
+            self._rewrite(path, key, messages, count, meta)
+
+    def compact(self, key: str, messages: list[dict[str, Any]] | MessageLog, count: int, meta: str) -> bool:
+        state = self._files.get(key)
+        if state is None or not state.stale:
+            return False
+        self._rewrite(self.path(key), key, messages, count, meta)
+        return True
+
+    def forget(self, key: str) -> None:
+        self._files.pop(key, None)
+
+    @staticmethod
+    def _can_append(path: Path, messages: list[dict[str, Any]] | MessageLog, count: int, state: _FileState) -> bool:
+        """Whether the file still holds exactly a prefix of the snapshot's messages."""
+        n = state.messages
+        if n > count or (n and take(messages, n - 1, n)[0] is not state.last):
+            return False  # Cleared or replaced since the last save
+        try:
+            return path.stat().st_size == state.size
+        except OSError:
+            return False
+
+    def _rewrite(self, path: Path, key: str, messages: list[dict[str, Any]] | MessageLog, count: int, meta: str) -> None:
+        """Write the whole session to a temp file and swap it in."""
+        base = messages.base if isinstance(messages, MessageLog) else 0
+        current = take(messages, 0, count)
+        lines = [json.dumps(m) for m in current]
+        data = "".join(line + "\n" for line in lines) + meta + "\n"
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w") as f:
+            f.write(data)
+            self._sync(f)
+        os.replace(tmp, path)
+        if base:
+            # Older messages are now found at new offsets (lines are ASCII: json.dumps escapes the rest)
+            offset = sum(len(line) + 1 for line in lines[:base])
+            messages.reseat(FileSource(path, base, offset))
+        self._files[key] = _FileState(
+            messages=count,
+            last=current[-1] if current else None,
+            size=len(data.encode("utf-8")),
+            stale=0,
+            meta=meta,
+        )
+
+    def _sync(self, f: Any) -> None:
+        if self.fsync == "always":
+            f.flush()
+            os.fsync(f.fileno())
+
+    def archive_idle(self, idle_s: float, keep: set[str]) -> dict[str, int]:
+        cutoff = time.time() - idle_s
+        files = []
+        for path in self.sessions_dir.glob("*.jsonl"):
+            try:
+                if path.stat().st_mtime > cutoff:
+                    continue
+                info = _session_info(path)
+            except Exception:
+                continue
+            if info is None or info["key"] in keep:
+                continue
+            self._files.pop(info["key"], None)
+            files.append((path, {k: info[k] for k in ("key", "created_at", "updated_at")}))
+        return self.archive.add(files)
+
+    def archive_stats(self) -> dict[str, int]:
+        live = [p.stat().st_size for p in self.sessions_dir.glob("*.jsonl")]
+        archived = self.archive.stats()
+        return {"live_sessions": len(live), "live_bytes": sum(live), **{f"archived_{k}": v for k, v in archived.items()}}
+
+    def list_sessions(self) -> list[dict[str, Any]]:
+        sessions = []
+        live = set()
+
+        for path in self.sessions_dir.glob("*.jsonl"):
+            try:
+                info = _session_info(path)
+            except Exception:
+                continue
+            if info is not None:
+                sessions.append(info)
+                live.add(path.name)
+
+        for name, entry in self.archive.entries().items():
+            if name not in live:
+                sessions.append({
+                    "key": entry["key"],
+                    "created_at": entry.get("created_at"),
+                    "updated_at": entry.get("updated_at"),
+                    "path": str(self.archive.archive_dir / entry["segment"]),
+                    "archived": True,
+                })
+
+        return sorted(sessions, key=lambda x: x.get("updated_at") or "", reverse=True)
+
+    def read_all(self, key: str) -> list[dict[str, Any]]:
+        path = self.path(key)
+        if path.exists():
+            return read_messages(path)
+        data = self.archive.read(path.name)
+        return parse_messages(data.decode("utf-8", errors="replace").splitlines()) if data else []
+
+    def read_metadata(self, path: Path) -> dict[str, Any]:
+        """The current metadata record of a session file ({} if it has none)."""
+        meta: dict[str, Any] = {}
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if '"_type": "metadata"' not in line:
+                    continue
+                try:
+                    meta = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+        return meta
+
+
+def _stored(messages: MessageLog, meta: dict[str, Any]) -> StoredSession:
+    return StoredSession(
+        messages=messages,
+        created_at=meta.get("created_at"),
+        updated_at=meta.get("updated_at"),
+        metadata=meta.get("metadata", {}),
+        last_consolidated=meta.get("last_consolidated", 0),
+    )
+
+
+def _session_info(path: Path) -> dict[str, Any] | None:
+    """Key and timestamps of a session file, from its current metadata record."""
+    # The trailing metadata record is the current one; older files only have a leading one
+    last = _read_last_line(path)
+    if '"_type": "metadata"' in last:
+        data = json.loads(last)
+    else:
+        with open(path) as f:
+            data = json.loads(f.readline().strip() or "{}")
+    if data.get("_type") != "metadata":
+        return None
+    return {
+        "key": data.get("key") or path.stem.replace("_", ":", 1),
+        "created_at": data.get("created_at"),
+        "updated_at": data.get("updated_at"),
+        "path": str(path)
+    }
+
+
+def _read_last_line(path: Path, block: int = 4096) -> str:
+    """Read the last non-empty line of a file without reading the whole file."""
+    with open(path, "rb") as f:
+        end = f.seek(0, os.SEEK_END)
+        data = b""
+        pos = end
+        while pos > 0:
+            pos = max(0, pos - block)
+            f.seek(pos)
+            data = f.read(end - pos)
+            stripped = data.rstrip(b"\n")
+            if b"\n" in stripped or pos == 0:
+                return stripped.rsplit(b"\n", 1)[-1].decode("utf-8", errors="replace").strip()
+    return ""
@@ -0,0 +1,261 @@
+"""Lazily loaded session message lists."""
+
+import asyncio
+import json
+import os
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Protocol
+
+from zerobot.utils.helpers import estimate_tokens
+
+_BLOCK = 64 * 1024
+_MIN_CHUNK = 64  # Fewest older messages fetched at once
+
+
+class MessageSource(Protocol):
+    """Where a MessageLog reads messages older than its loaded window."""
+
+    def read(self, start: int, stop: int, advance: bool = False) -> list[dict[str, Any]]:
+        """
+        Messages [start, stop).
+
+        `advance` is set when the result is kept in memory (the reader may
+        remember the position for the next, older read).
+        """
+        ...
+
+
+class MessageLog:
+    """
+    The messages of a session, of which only the newest may be in memory.
+
+    Indexing, slicing and len() cover the whole session, so code written
+    against a plain list keeps working. Messages before the loaded window
+    are read from the store on first access (in growing chunks) and then
+    kept; read() returns a range without keeping it. Code on the event loop
+    should call load_async() first, so the disk read happens in a worker
+    thread rather than on first access.
+    """
+
+    def __init__(
+        self,
+        messages: list[dict[str, Any]] | None = None,
+        base: int = 0,
+        source: MessageSource | None = None,
+    ):
+        # (index of the first loaded message, loaded messages); replaced as one
+        # value so a writer thread always sees a consistent pair
+        self._window: tuple[int, list[dict[str, Any]]] = (base, list(messages or []))
+        self._source = source
+        self._views: dict[int, dict[str, Any]] = {}
+        self._tokens: dict[int, int] = {}
+
+    @property
+    def base(self) -> int:
+        """Index of the oldest message in memory."""
+        return self._window[0]
+
+    @property
+    def loaded(self) -> int:
+        """Number of messages in memory."""
+        return len(self._window[1])
+
+    def __len__(self) -> int:
+        base, tail = self._window
+        return base + len(tail)
+
+    def __getitem__(self, index: int | slice) -> Any:
+        n = len(self)
+        if isinstance(index, slice):
+            start, stop, step = index.indices(n)
+            if step != 1:
+                return self.read(0, n)[index]
+            if start >= stop:
+                return []
+            self._load_from(start)
+            base, tail = self._window
+            return tail[start - base:stop - base]
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("message index out of range")
+        self._load_from(index)
+        base, tail = self._window
+        return tail[index - base]
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        return iter(self[:])
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, MessageLog)):
+            return self[:] == other[:]
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"MessageLog({len(self)} messages, {self.loaded} loaded)"
+
+    def append(self, message: dict[str, Any]) -> None:
+        self._window[1].append(message)
+
+    def copy(self) -> list[dict[str, Any]]:
+        return self[:]
+
+    def read(self, start: int, stop: int) -> list[dict[str, Any]]:
+        """Messages [start, stop) without keeping older ones in memory (safe from any thread)."""
+        base, tail = self._window
+        older = self._source.read(start, min(stop, base)) if start < base and self._source else []
+        return older + tail[max(start, base) - base:max(stop - base, 0)]
+
+    def view(self, index: int) -> dict[str, Any]:
+        """
+        The message in LLM format (role + content only).
+
+        Views are built once and shared between turns; callers must not modify them.
+        """
+        if index < 0:
+            index += len(self)
+        view = self._views.get(index)
+        if view is None:
+            m = self[index]
+            view = self._views[index] = {"role": m["role"], "content": m["content"]}
+        return view
+
+    def tokens(self, index: int) -> int:
+        """Estimated tokens of a message, computed once and kept beside it (not in it)."""
+        if index < 0:
+            index += len(self)
+        tokens = self._tokens.get(index)
+        if tokens is None:
+            content = self[index].get("content")
+            text = content if isinstance(content, str) else json.dumps(content, ensure_ascii=False)
+            tokens = self._tokens[index] = estimate_tokens(text) + 4  # role/framing overhead
+        return tokens
+
+    def reseat(self, source: MessageSource) -> None:
+        """Point older-message reads at a new source (e.g. the file was rewritten)."""
+        self._source = source
+
+    async def load_async(self, start: int) -> None:
+        """Bring messages from `start` on into memory, reading them in a worker thread."""
+        base, tail = self._window
+        if start >= base or not self._source:
+            return
+        start = self._chunk_start(start)
+        older = await asyncio.to_thread(self._source.read, start, base, True)
+        if self._window[0] == base:  # Not loaded meanwhile; appends went to the same tail list
+            self._window = (base - len(older), older + self._window[1])
+
+    def _load_from(self, start: int) -> None:
+        base, tail = self._window
+        if start >= base:
+            return
+        start = self._chunk_start(start)
+        older = self._source.read(start, base, advance=True) if self._source else []
+        self._window = (base - len(older), older + tail)
+
+    def _chunk_start(self, start: int) -> int:
+        # Fetch at least as much again as is loaded, so repeated misses stay cheap
+        base, tail = self._window
+        return max(0, min(start, base - max(len(tail), _MIN_CHUNK)))
+
+
+class FileSource:
+    """
+    Reads the messages before a known position of a session file.
+
+    `count` messages precede byte `offset`. Reads scan backwards from there,
+    so fetching the messages just before the loaded window costs only what
+    is read. If the file was replaced since, it is parsed in full instead.
+    """
+
+    def __init__(self, path: Path, count: int, offset: int):
+        self.path = path
+        self._ino = _inode(path)
+        self._cursor = (count, offset)
+
+    def read(self, start: int, stop: int, advance: bool = False) -> list[dict[str, Any]]:
+        count, offset = self._cursor
+        if stop <= start:
+            return []
+        if stop > count or _inode(self.path) != self._ino:
+            return read_messages(self.path)[start:stop]
+
+        out: list[dict[str, Any]] = []
+        for line_offset, line in read_lines_backwards(self.path, offset):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError:
+                return read_messages(self.path)[start:stop]
+            if data.get("_type") == "metadata":
+                continue
+            count -= 1
+            if count < stop:
+                out.append(data)
+            if count == start:
+                break
+        else:
+            return read_messages(self.path)[start:stop]  # Fewer messages than expected
+        out.reverse()
+        if advance:
+            self._cursor = (start, line_offset)
+        return out
+
+
+def take(messages: list[dict[str, Any]] | MessageLog, start: int, stop: int) -> list[dict[str, Any]]:
+    """Slice a message snapshot without pulling older messages into memory."""
+    if isinstance(messages, MessageLog):
+        return messages.read(start, stop)
+    return messages[start:stop]
+
+
+def read_lines_backwards(path: Path, end: int, block: int = _BLOCK) -> Iterator[tuple[int, bytes]]:
+    """Yield (offset, line) for the lines before byte `end` of a file, last line first."""
+    with open(path, "rb") as f:
+        pos = end
+        rest = b""
+        while pos > 0:
+            step = min(block, pos)
+            pos -= step
+            f.seek(pos)
+            lines = (f.read(step) + rest).split(b"\n")
+            rest = lines[0]  # May continue in the previous block
+            offset = pos + len(rest) + 1
+            found = []
+            for line in lines[1:]:
+                found.append((offset, line))
+                offset += len(line) + 1
+            yield from reversed(found)
+        if rest:
+            yield 0, rest
+
+
+def read_messages(path: Path) -> list[dict[str, Any]]:
+    """All messages of a session file, skipping metadata records and damaged lines."""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        return parse_messages(f)
+
+
+def parse_messages(lines: Iterable[str]) -> list[dict[str, Any]]:
+    """The messages among JSONL session lines, skipping metadata records and damaged lines."""
+    messages = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if data.get("_type") != "metadata":
+            messages.append(data)
+    return messages
+
+
+def _inode(path: Path) -> int | None:
+    try:
+        return os.stat(path).st_ino
+    except OSError:
+        return None
@@ -1,6 +1,12 @@
 """Session management for conversation history."""
 
+import asyncio
+import atexit
 import json
+import threading
+import time
+import weakref
+from collections import OrderedDict
 from pathlib import Path
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -8,7 +14,9 @@ from typing import Any
 
 from loguru import logger
 
-from zerobot.utils.helpers import ensure_dir, safe_filename
+from zerobot.session.jsonl_store import JsonlSessionStore
+from zerobot.session.log import MessageLog
+from zerobot.session.store import SessionStore, Snapshot
 
 
 @dataclass
@@ -21,15 +29,22 @@ class Session:
     Important: Messages are append-only for LLM cache efficiency.
     The consolidation process writes summaries to MEMORY.md/HISTORY.md
     but does NOT modify the messages list or get_history() output.
+
+    `messages` is a MessageLog: a loaded session may hold only its newest
+    messages in memory, with older ones read from disk when indexed.
     """
 
     key: str  # channel:chat_id
-    messages: list[dict[str, Any]] = field(default_factory=list)
+    messages: MessageLog = field(default_factory=MessageLog)
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     metadata: dict[str, Any] = field(default_factory=dict)
     last_consolidated: int = 0  # Number of messages already consolidated to files
     
+    def __post_init__(self) -> None:
+        if not isinstance(self.messages, MessageLog):
+            self.messages = MessageLog(self.messages)
+    
     def add_message(self, role: str, content: str, **kwargs: Any) -> None:
         """Add a message to the session."""
         msg = {
@@ -41,33 +56,154 @@ class Session:
         self.messages.append(msg)
         self.updated_at = datetime.now()
     
-    def get_history(self, max_messages: int = 500) -> list[dict[str, Any]]:
-        """Get recent messages in LLM format (role + content only)."""
-        return [{"role": m["role"], "content": m["content"]} for m in self.messages[-max_messages:]]
+    def get_history(self, max_messages: int = 500, max_tokens: int | None = None) -> list[dict[str, Any]]:
+        """
+        Get recent messages in LLM format (role + content only).
+        
+        Args:
+            max_messages: Upper bound on the number of messages.
+            max_tokens: Optional token budget. The newest messages that fit are
+                kept and older ones dropped; a single message larger than a
+                quarter of the budget is shortened in the middle.
+        """
+        messages = self.messages
+        if not isinstance(messages, MessageLog):  # Assigned a plain list
+            messages = self.messages = MessageLog(messages)
+        end = len(messages)
+        start = max(0, end - max_messages)
+        if max_tokens is None:
+            return [messages.view(i) for i in range(start, end)]
+        
+        # Walk back from the newest message so only what fits is ever loaded
+        per_message = max(max_tokens // 4, 256)
+        history: list[dict[str, Any]] = []
+        used = 0
+        for i in range(end - 1, start - 1, -1):
+            m = messages[i]
+            content = m["content"]
+            tokens = messages.tokens(i)
+            if tokens > per_message and isinstance(content, str):
+                content = _shorten(content, tokens, per_message)
+                tokens = per_message
+                item = {"role": m["role"], "content": content}
+            else:
+                item = messages.view(i)
+            if used + tokens > max_tokens:
+                break
+            used += tokens
+            history.append(item)
+        history.reverse()
+        
+        # Don't start the window mid-exchange
+        while history and history[0]["role"] != "user":
+            history.pop(0)
+        return history
+    
+    async def get_history_async(self, max_messages: int = 500, max_tokens: int | None = None) -> list[dict[str, Any]]:
+        """Like get_history(), but older messages it needs are read from disk in a worker thread."""
+        messages = self.messages
+        if not isinstance(messages, MessageLog):
+            messages = self.messages = MessageLog(messages)
+        end = len(messages)
+        start = max(0, end - max_messages)
+        per_message = max((max_tokens or 0) // 4, 256)
+        while messages.base > start:
+            if max_tokens is not None:
+                loaded = sum(min(messages.tokens(i), per_message) for i in range(messages.base, end))
+                if loaded > max_tokens:
+                    break  # The walk back stops inside what is loaded
+            base = messages.base
+            await messages.load_async(start if max_tokens is None else base - 1)
+            if messages.base == base:
+                break  # Nothing more could be read
+        return self.get_history(max_messages, max_tokens)
     
     def clear(self) -> None:
         """Clear all messages and reset session to initial state."""
-        self.messages = []
+        self.messages = MessageLog()
         self.last_consolidated = 0
         self.updated_at = datetime.now()
 
 
+def _shorten(content: str, tokens: int, limit: int) -> str:
+    """Cut the middle out of an oversized message so it fits in `limit` tokens."""
+    keep = max(1, len(content) * (limit - 16) // tokens)  # leave room for the marker
+    head = keep * 2 // 3
+    tail = keep - head
+    omitted = len(content) - head - tail
+    return f"{content[:head]}\n\n[... {omitted} characters omitted ...]\n\n{content[len(content) - tail:]}"
+
+
 class SessionManager:
     """
     Manages conversation sessions.
 
-    Sessions are stored as JSONL files in the sessions directory.
+    Sessions are persisted through a SessionStore: JSONL files in the
+    sessions directory by default (see JsonlSessionStore), or a SQLite
+    database (see SqliteSessionStore). Both only write what changed since
+    the last save.
+
+    With a positive flush_interval_s, saves are write-behind: save() only
+    records the session as dirty and a worker thread writes dirty sessions
+    in batches at most flush_interval_s later, so no file I/O or JSON
+    encoding happens on the event loop. Repeated saves of a session within
+    one interval are coalesced. close() (also run at exit) flushes the rest.
+
+    Loaded sessions are kept in an LRU cache bounded by a total message
+    budget and an idle timeout; evicted sessions are reloaded from disk on
+    the next access. A session evicted while still referenced elsewhere
+    (e.g. by a running consolidation) is handed out again instead of being
+    reloaded, so there is never more than one live Session per key.
+
+    Sessions are opened lazily: only the last `tail_messages` (or all
+    unconsolidated) messages are read; older ones are read on demand.
+
+    With a positive archive_after_s, the writer also moves sessions not
+    written for that long (and not in memory) into the store's compressed
+    archive now and then; they are restored when next loaded.
     """
 
-    def __init__(self, workspace: Path):
+    def __init__(
+        self,
+        workspace: Path,
+        compact_min_records: int = 64,
+        flush_interval_s: float = 0.0,
+        fsync: str = "never",
+        cache_max_messages: int = 20000,
+        cache_idle_s: float = 3600.0,
+        tail_messages: int = 200,
+        lazy_min_bytes: int = 64 * 1024,
+        archive_after_s: float = 0.0,
+        store: SessionStore | None = None,
+        sessions_dir: Path | None = None,
+    ):
         self.workspace = workspace
-        self.sessions_dir = ensure_dir(Path.home() / ".zerobot" / "sessions")
-        self._cache: dict[str, Session] = {}
-    
-    def _get_session_path(self, key: str) -> Path:
-        """Get the file path for a session."""
-        safe_key = safe_filename(key.replace(":", "_"))
-        return self.sessions_dir / f"{safe_key}.jsonl"
+        # The JSONL options only apply to the default store
+        self.store = store or JsonlSessionStore(
+            sessions_dir or Path.home() / ".zerobot" / "sessions",
+            compact_min_records=compact_min_records,
+            lazy_min_bytes=lazy_min_bytes,
+            fsync=fsync,
+        )
+        self.sessions_dir: Path | None = getattr(self.store, "sessions_dir", None)
+        self.flush_interval_s = flush_interval_s
+        self.cache_max_messages = cache_max_messages  # 0 = unbounded
+        self.cache_idle_s = cache_idle_s  # 0 = never evict for idleness
+        self.tail_messages = tail_messages
+        self.archive_after_s = archive_after_s  # 0 = never archive automatically
+        self._next_archive = time.monotonic() + _ARCHIVE_FIRST_S
+        self._loaded_keys: set[str] = set()  # Loaded since the last archiving run
+        self._cache: OrderedDict[str, tuple[Session, float]] = OrderedDict()  # LRU first; (session, last used)
+        self._evicted: weakref.WeakValueDictionary[str, Session] = weakref.WeakValueDictionary()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._io_lock = threading.RLock()  # Serializes store reads and writes
+        self._cache_lock = threading.Lock()  # Guards _cache/_evicted changes against the writer's snapshot
+        self._cond = threading.Condition()
+        self._pending: dict[str, Snapshot] = {}
+        self._writer: threading.Thread | None = None
+        self._closed = False
     
     def get_or_create(self, key: str) -> Session:
         """
@@ -79,101 +215,264 @@ class SessionManager:
         Returns:
             The session.
         """
-        if key in self._cache:
-            return self._cache[key]
+        if (session := self._lookup(key)) is not None:
+            self._hits += 1
+            return session
+        
+        self._misses += 1
+        session = self._load(key) or Session(key=key)
+        self._remember(session)
+        return session
+    
+    async def get_or_create_async(self, key: str) -> Session:
+        """Like get_or_create(), but reads the session file in a worker thread."""
+        if (session := self._lookup(key)) is not None:
+            self._hits += 1
+            return session
         
-        session = self._load(key)
-        if session is None:
-            session = Session(key=key)
+        self._misses += 1
+        loaded = await asyncio.to_thread(self._load, key)
+        if (session := self._lookup(key)) is not None:  # Loaded concurrently
+            return session
         
-        self._cache[key] = session
+        session = loaded or Session(key=key)
+        self._remember(session)
+        return session
+    
+    def cache_stats(self) -> dict[str, int]:
+        """Cache occupancy and hit/miss/eviction counters."""
+        return {
+            "sessions": len(self._cache),
+            "messages": sum(_loaded(s) for s, _ in self._cache.values()),
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+        }
+    
+    def _lookup(self, key: str) -> Session | None:
+        """A cached (or evicted but still live) session, marked as most recently used."""
+        entry = self._cache.get(key)
+        if entry:
+            session = entry[0]
+        else:
+            with self._cache_lock:
+                session = self._evicted.pop(key, None)
+        if session is not None:
+            self._remember(session)
         return session
     
+    def _remember(self, session: Session) -> None:
+        """Put a session at the most recently used end of the cache and enforce the budget."""
+        with self._cache_lock:
+            self._cache.pop(session.key, None)
+            self._cache[session.key] = (session, time.monotonic())
+            self._evict(keep=session.key)
+    
+    def _evict(self, keep: str) -> None:
+        now = time.monotonic()
+        total = sum(_loaded(s) for s, _ in self._cache.values())
+        for key, (session, used) in list(self._cache.items()):
+            if key == keep:
+                break
+            idle = self.cache_idle_s > 0 and now - used > self.cache_idle_s
+            over = self.cache_max_messages > 0 and total > self.cache_max_messages
+            if not (idle or over):
+                break  # Everything after this was used more recently
+            del self._cache[key]
+            self._evicted[key] = session
+            self._evictions += 1
+            total -= _loaded(session)
+            self._forget_file(key)
+            logger.debug(f"Session cache: evicted {key} ({_loaded(session)} messages loaded, idle={idle})")
+    
+    def _forget_file(self, key: str) -> None:
+        """Drop the store's write state of an evicted session unless the writer is busy with it."""
+        if not self._io_lock.acquire(blocking=False):
+            return  # Never block the event loop on a flush; the state is small
+        try:
+            with self._cond:
+                if key not in self._pending:
+                    self.store.forget(key)
+        finally:
+            self._io_lock.release()
+    
     def _load(self, key: str) -> Session | None:
         """Load a session from disk."""
-        path = self._get_session_path(key)
-
-        if not path.exists():
-            return None
-
+        with self._io_lock:
+            # A save still waiting for the writer would otherwise be missed
+            with self._cond:
+                pending = self._pending.pop(key, None)
+            if pending:
+                self.store.write(key, *pending)
+            self._loaded_keys.add(key)
+            return self._read(key)
+    
+    def _read(self, key: str) -> Session | None:
         try:
-            messages = []
-            metadata = {}
-            created_at = None
-            last_consolidated = 0
-
-            with open(path) as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                    data = json.loads(line)
-
-                    if data.get("_type") == "metadata":
-                        metadata = data.get("metadata", {})
-                        created_at = datetime.fromisoformat(data["created_at"]) if data.get("created_at") else None
-                        last_consolidated = data.get("last_consolidated", 0)
-                    else:
-                        messages.append(data)
-
-            return Session(
-                key=key,
-                messages=messages,
-                created_at=created_at or datetime.now(),
-                metadata=metadata,
-                last_consolidated=last_consolidated
-            )
+            stored = self.store.load(key, self.tail_messages)
         except Exception as e:
             logger.warning(f"Failed to load session {key}: {e}")
             return None
+        if stored is None:
+            return None
+        created_at = datetime.fromisoformat(stored.created_at) if stored.created_at else datetime.now()
+        return Session(
+            key=key,
+            messages=stored.messages,
+            created_at=created_at,
+            updated_at=datetime.fromisoformat(stored.updated_at) if stored.updated_at else created_at,
+            metadata=stored.metadata,
+            last_consolidated=stored.last_consolidated,
+        )
     
     def save(self, session: Session) -> None:
-        """Save a session to disk."""
-        path = self._get_session_path(session.key)
-
-        with open(path, "w") as f:
-            metadata_line = {
-                "_type": "metadata",
-                "created_at": session.created_at.isoformat(),
-                "updated_at": session.updated_at.isoformat(),
-                "metadata": session.metadata,
-                "last_consolidated": session.last_consolidated
-            }
-            f.write(json.dumps(metadata_line) + "\n")
-            for msg in session.messages:
-                f.write(json.dumps(msg) + "\n")
-
-        self._cache[session.key] = session
+        """Persist a session, appending only what changed since the last save."""
+        self._remember(session)
+        meta = self._metadata_line(session)
+        # Messages are append-only (clear() swaps in a new list), so the list
+        # and its current length are a consistent snapshot without copying.
+        snapshot = (session.messages, len(session.messages), meta)
+
+        if self.flush_interval_s <= 0 or self._closed:
+            with self._io_lock:
+                self.store.write(session.key, *snapshot)
+            return
+
+        with self._cond:
+            self._pending[session.key] = snapshot
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run_writer, name="session-writer", daemon=True)
+                self._writer.start()
+                atexit.register(self.close)
+            self._cond.notify()
+    
+    def flush(self) -> None:
+        """Write all pending saves now (blocking)."""
+        with self._io_lock:
+            with self._cond:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return
+            for key, e in self.store.write_batch(batch).items():
+                # The next save of this session rewrites it from memory
+                self.store.forget(key)
+                logger.error(f"Failed to save session {key}: {e}")
+    
+    def close(self) -> None:
+        """Flush pending saves and stop the writer; later saves are written synchronously."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self.flush()
+        if self._writer is not None and self._writer is not threading.current_thread():
+            self._writer.join()
+        self._writer = None
+    
+    def _run_writer(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                # Let more saves join the batch
+                deadline = time.monotonic() + self.flush_interval_s
+                while not self._closed and (remaining := deadline - time.monotonic()) > 0:
+                    self._cond.wait(remaining)
+                if self._closed:
+                    return  # close() flushes what is left
+            self.flush()
+            if self.archive_after_s > 0 and time.monotonic() >= self._next_archive:
+                self._next_archive = time.monotonic() + _ARCHIVE_EVERY_S
+                try:
+                    self.archive_idle()
+                except Exception as e:
+                    logger.warning(f"Session archiving failed: {e}")
+    
+    def archive_idle(self, idle_s: float | None = None) -> dict[str, int]:
+        """
+        Compress sessions not written for `idle_s` seconds (default: archive_after_s).
+
+        Sessions in memory (or loaded since the last run) are left alone.
+
+        Returns:
+            Counts of archived sessions and their size before and after compression.
+        """
+        idle_s = self.archive_after_s if idle_s is None else idle_s
+        self.flush()
+        with self._io_lock:
+            with self._cache_lock:
+                keep = set(self._cache) | set(self._evicted.keys()) | self._loaded_keys
+            with self._cond:
+                keep |= set(self._pending)
+            self._loaded_keys = set()
+            result = self.store.archive_idle(idle_s, keep)
+        if result["sessions"]:
+            logger.info(
+                f"Archived {result['sessions']} idle sessions: "
+                f"{result['bytes']} -> {result['compressed']} bytes"
+            )
+        return result
     
+    def compact(self, key: str) -> bool:
+        """
+        Let the store reclaim superseded records of a cached session.
+
+        Returns:
+            True if anything was rewritten.
+        """
+        entry = self._cache.get(key)
+        if entry is None:
+            return False
+        session = entry[0]
+        with self._io_lock:
+            with self._cond:
+                self._pending.pop(key, None)  # Superseded by the compaction
+            return self.store.compact(key, session.messages, len(session.messages), self._metadata_line(session))
+    
+    @staticmethod
+    def _metadata_line(session: Session) -> str:
+        return json.dumps({
+            "_type": "metadata",
+            "key": session.key,
+            "messages": len(session.messages),
+            "created_at": session.created_at.isoformat(),
+            "updated_at": session.updated_at.isoformat(),
+            "metadata": session.metadata,
+            "last_consolidated": session.last_consolidated
+        })
+    
+    def is_current(self, session: Session) -> bool:
+        """Whether the manager still maps the session's key to this very object."""
+        entry = self._cache.get(session.key)
+        if entry is not None:
+            return entry[0] is session
+        return self._evicted.get(session.key) is session
+
     def invalidate(self, key: str) -> None:
         """Remove a session from the in-memory cache."""
-        self._cache.pop(key, None)
+        with self._cache_lock:
+            self._cache.pop(key, None)
+            self._evicted.pop(key, None)
     
     def list_sessions(self) -> list[dict[str, Any]]:
         """
         List all sessions.
         
         Returns:
-            List of session info dicts.
+            List of session info dicts, most recently updated first.
         """
-        sessions = []
-        
-        for path in self.sessions_dir.glob("*.jsonl"):
-            try:
-                # Read just the metadata line
-                with open(path) as f:
-                    first_line = f.readline().strip()
-                    if first_line:
-                        data = json.loads(first_line)
-                        if data.get("_type") == "metadata":
-                            sessions.append({
-                                "key": path.stem.replace("_", ":"),
-                                "created_at": data.get("created_at"),
-                                "updated_at": data.get("updated_at"),
-                                "path": str(path)
-                            })
-            except Exception:
-                continue
-        
-        return sorted(sessions, key=lambda x: x.get("updated_at", ""), reverse=True)
+        return self.store.list_sessions()
+    
+    def read_all(self, key: str) -> list[dict[str, Any]]:
+        """Every stored message of a session, including consolidated ones."""
+        self.flush()
+        return self.store.read_all(key)
+
+
+_ARCHIVE_FIRST_S = 60.0  # Delay before the first archiving run (short CLI runs never archive)
+_ARCHIVE_EVERY_S = 3600.0
+
+
+def _loaded(session: Session) -> int:
+    """Messages of a session held in memory."""
+    messages = session.messages
+    return messages.loaded if isinstance(messages, MessageLog) else len(messages)
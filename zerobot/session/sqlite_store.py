@@ -0,0 +1,174 @@
+"""Session store backed by a single SQLite database."""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+from zerobot.session.log import MessageLog, take
+from zerobot.session.store import SessionStore, Snapshot, StoredSession
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    key TEXT PRIMARY KEY,
+    created_at TEXT,
+    updated_at TEXT,
+    metadata TEXT NOT NULL DEFAULT '{}',
+    last_consolidated INTEGER NOT NULL DEFAULT 0,
+    message_count INTEGER NOT NULL DEFAULT 0,
+    generation INTEGER NOT NULL DEFAULT 0  -- Bumped whenever the messages are rewritten
+);
+CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at);
+CREATE TABLE IF NOT EXISTS messages (
+    key TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (key, seq)
+) WITHOUT ROWID;
+"""
+
+
+class SqliteSessionStore(SessionStore):
+    """
+    Sessions as rows of one SQLite database (WAL mode).
+
+    Messages are keyed by (session, position), so loading the tail of a
+    session and fetching older messages are index range scans, and listing
+    sessions by recency uses the updated_at index. A batch of writes is one
+    transaction.
+    """
+
+    def __init__(self, db_path: Path, fsync: str = "never"):
+        self.db_path = db_path
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={'FULL' if fsync == 'always' else 'NORMAL'}")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.RLock()
+        # key -> (messages stored, the in-memory message written last, checked by identity)
+        self._written: dict[str, tuple[int, dict[str, Any] | None]] = {}
+
+    def load(self, key: str, tail_messages: int) -> StoredSession | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT created_at, updated_at, metadata, last_consolidated, message_count FROM sessions WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            created_at, updated_at, metadata, last_consolidated, count = row
+            base = max(0, count - max(tail_messages, count - last_consolidated))
+            tail = self.read_range(key, base, count)
+            self._written[key] = (count, tail[-1] if tail else None)
+        return StoredSession(
+            messages=MessageLog(tail, base=base, source=_RowSource(self, key)),
+            created_at=created_at,
+            updated_at=updated_at,
+            metadata=json.loads(metadata),
+            last_consolidated=last_consolidated,
+        )
+
+    def write(self, key: str, messages: list[dict[str, Any]] | MessageLog, count: int, meta: str) -> None:
+        failed = self.write_batch({key: (messages, count, meta)})
+        if failed:
+            raise failed[key]
+
+    def write_batch(self, batch: dict[str, Snapshot]) -> dict[str, Exception]:
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                written = {key: self._write_one(key, *snapshot) for key, snapshot in batch.items()}
+                self._conn.execute("COMMIT")
+            except Exception as e:
+                self._conn.execute("ROLLBACK")
+                for key in batch:
+                    self._written.pop(key, None)
+                return {key: e for key in batch}
+            self._written.update(written)
+        return {}
+
+    def _write_one(
+        self, key: str, messages: list[dict[str, Any]] | MessageLog, count: int, meta: str
+    ) -> tuple[int, dict[str, Any] | None]:
+        row = self._conn.execute("SELECT message_count FROM sessions WHERE key = ?", (key,)).fetchone()
+        stored = row[0] if row else None
+        n, last = self._written.get(key, (None, None))
+        append = (
+            n is not None and n == stored and n <= count
+            and (n == 0 or take(messages, n - 1, n)[0] is last)
+        )
+        start = n if append else 0
+        new = take(messages, start, count)
+        if not append:
+            self._conn.execute("DELETE FROM messages WHERE key = ?", (key,))
+        self._conn.executemany(
+            "INSERT INTO messages (key, seq, data) VALUES (?, ?, ?)",
+            [(key, start + i, json.dumps(m)) for i, m in enumerate(new)],
+        )
+
+        record = json.loads(meta)
+        self._conn.execute(
+            "INSERT INTO sessions (key, created_at, updated_at, metadata, last_consolidated, message_count) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET created_at = excluded.created_at, updated_at = excluded.updated_at, "
+            "metadata = excluded.metadata, last_consolidated = excluded.last_consolidated, "
+            "message_count = excluded.message_count, generation = generation + ?",
+            (
+                key,
+                record.get("created_at"),
+                record.get("updated_at"),
+                json.dumps(record.get("metadata", {})),
+                record.get("last_consolidated", 0),
+                count,
+                0 if append else 1,
+            ),
+        )
+        return count, new[-1] if new else last
+
+    def forget(self, key: str) -> None:
+        with self._lock:
+            self._written.pop(key, None)
+
+    def list_sessions(self) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, created_at, updated_at FROM sessions ORDER BY updated_at DESC"
+            ).fetchall()
+        return [
+            {"key": key, "created_at": created_at, "updated_at": updated_at, "path": str(self.db_path)}
+            for key, created_at, updated_at in rows
+        ]
+
+    def read_all(self, key: str) -> list[dict[str, Any]]:
+        return self.read_range(key, 0, None)
+
+    def read_range(self, key: str, start: int, stop: int | None) -> list[dict[str, Any]]:
+        """Messages [start, stop) of a session (stop=None: to the end)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM messages WHERE key = ? AND seq >= ? AND seq < ? ORDER BY seq",
+                (key, start, stop if stop is not None else 2**62),
+            ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def versions(self) -> list[tuple[str, int, int]]:
+        """(key, message_count, generation) of every session, for incremental indexing."""
+        with self._lock:
+            return self._conn.execute("SELECT key, message_count, generation FROM sessions").fetchall()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class _RowSource:
+    """Older-message reader for a MessageLog loaded from SQLite."""
+
+    def __init__(self, store: SqliteSessionStore, key: str):
+        self._store = store
+        self._key = key
+
+    def read(self, start: int, stop: int, advance: bool = False) -> list[dict[str, Any]]:
+        return self._store.read_range(self._key, start, stop)
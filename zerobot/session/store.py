@@ -0,0 +1,161 @@
+"""Session store interface."""
+
+import json
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any
+
+from loguru import logger
+
+from zerobot.session.log import MessageLog
+
+# (messages, count, metadata record): the first `count` messages plus the
+# session's metadata as a JSON object, captured on the event loop by save()
+Snapshot = tuple[list[dict[str, Any]] | MessageLog, int, str]
+
+
+@dataclass
+class StoredSession:
+    """A session as read back from a store."""
+    messages: MessageLog
+    created_at: str | None = None
+    updated_at: str | None = None
+    metadata: dict[str, Any] = field(default_factory=dict)
+    last_consolidated: int = 0
+
+
+class SessionStore(ABC):
+    """
+    Persistent storage for sessions.
+
+    SessionManager calls load/write/compact/forget with its I/O lock held,
+    so implementations see one of those at a time; list_sessions, read_all
+    and older-message reads from a MessageLog may run concurrently from
+    other threads.
+    """
+
+    @abstractmethod
+    def load(self, key: str, tail_messages: int) -> StoredSession | None:
+        """
+        Load a session.
+
+        Args:
+            key: Session key.
+            tail_messages: The store may keep just this many newest messages
+                (and all unconsolidated ones) in memory, reading older ones on
+                demand through the returned MessageLog.
+
+        Returns:
+            The session, or None if it does not exist.
+        """
+        pass
+
+    @abstractmethod
+    def write(self, key: str, messages: list[dict[str, Any]] | MessageLog, count: int, meta: str) -> None:
+        """Bring a stored session up to date with a snapshot (see Snapshot)."""
+        pass
+
+    def write_batch(self, batch: dict[str, Snapshot]) -> dict[str, Exception]:
+        """
+        Write several snapshots.
+
+        Returns:
+            The error for each key that failed to write.
+        """
+        failed = {}
+        for key, snapshot in batch.items():
+            try:
+                self.write(key, *snapshot)
+            except Exception as e:
+                failed[key] = e
+        return failed
+
+    def compact(self, key: str, messages: list[dict[str, Any]] | MessageLog, count: int, meta: str) -> bool:
+        """Reclaim space taken by superseded records of a session. Returns True if anything changed."""
+        return False
+
+    def forget(self, key: str) -> None:
+        """Drop per-session write state; the next write of the session starts from scratch."""
+        pass
+
+    def archive_idle(self, idle_s: float, keep: set[str]) -> dict[str, int]:
+        """
+        Compress sessions not written for `idle_s` seconds, except those in `keep`.
+
+        Archived sessions are restored transparently by load().
+
+        Returns:
+            Counts of archived sessions and their size before and after compression.
+        """
+        return {"sessions": 0, "bytes": 0, "compressed": 0}
+
+    def archive_stats(self) -> dict[str, int]:
+        """Sizes of the live and archived sessions ({} if the store does not archive)."""
+        return {}
+
+    @abstractmethod
+    def list_sessions(self) -> list[dict[str, Any]]:
+        """Session info dicts (key, created_at, updated_at, path), most recently updated first."""
+        pass
+
+    @abstractmethod
+    def read_all(self, key: str) -> list[dict[str, Any]]:
+        """Every stored message of a session (for export and migration)."""
+        pass
+
+
+def copy_sessions(source: SessionStore, target: SessionStore, overwrite: bool = False, batch_size: int = 100) -> dict[str, int]:
+    """
+    Copy every session of one store into another (e.g. JSONL files into SQLite).
+
+    Sessions already present in the target are skipped unless `overwrite`.
+    The source is left untouched.
+
+    Returns:
+        Counts of copied and skipped sessions, copied messages and failures.
+    """
+    counts = {"sessions": 0, "messages": 0, "skipped": 0, "failed": 0}
+    existing = {info["key"] for info in target.list_sessions()}
+    batch: dict[str, Snapshot] = {}
+
+    def write() -> None:
+        failed = target.write_batch(batch)
+        for key, e in failed.items():
+            logger.error(f"Failed to copy session {key}: {e}")
+        counts["failed"] += len(failed)
+        counts["sessions"] += len(batch) - len(failed)
+        counts["messages"] += sum(count for key, (_, count, _) in batch.items() if key not in failed)
+        batch.clear()
+
+    for info in source.list_sessions():
+        key = info["key"]
+        if key in existing and not overwrite:
+            counts["skipped"] += 1
+            continue
+        try:
+            stored = source.load(key, 0)
+            messages = stored.messages[:] if stored else []
+        except Exception as e:
+            logger.error(f"Failed to read session {key}: {e}")
+            counts["failed"] += 1
+            continue
+        finally:
+            source.forget(key)
+        if stored is None:
+            continue
+        meta = json.dumps({
+            "_type": "metadata",
+            "key": key,
+            "messages": len(messages),
+            "created_at": stored.created_at,
+            "updated_at": stored.updated_at,
+            "metadata": stored.metadata,
+            "last_consolidated": stored.last_consolidated,
+        })
+        target.forget(key)  # Replace, don't append to, an existing copy
+        batch[key] = (messages, len(messages), meta)
+        if len(batch) >= batch_size:
+            write()
+    if batch:
+        write()
+    return counts
@@ -8,7 +8,6 @@ from uuid import uuid4
 from pathlib import Path
 from typing import Any
 
-import httpx
 import websockets
 
 from loguru import logger
@@ -18,6 +17,7 @@ from zerobot.universe.node_server import NodeServer, NodeServerConfig
 from zerobot.universe.relay_client import RelayNodeClient, RelayNodeClientConfig
 from zerobot.universe.protocol import Envelope, make_envelope
 from zerobot.universe.public_client import knowledge_publish
+from zerobot.utils.http import get_http_client
 
 
 def _load_knowledge_pack_file(path: Path) -> dict[str, Any] | None:
@@ -143,11 +143,10 @@ def build_capability_card(cfg: Config, endpoint_url: str) -> dict[str, Any]:
 
 async def _detect_public_ip(url: str) -> str | None:
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            r = await client.get(url)
-            r.raise_for_status()
-            ip = (r.text or "").strip()
-            return ip or None
+        r = await get_http_client().get(url, timeout=5.0)
+        r.raise_for_status()
+        ip = (r.text or "").strip()
+        return ip or None
     except Exception:
         return None
 
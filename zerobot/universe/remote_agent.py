@@ -16,6 +16,7 @@ class RemoteAgentConfig:
     max_iterations: int = 8
     temperature: float = 0.7
     max_tokens: int = 1024
+    max_parallel_tools: int = 4
 
 
 class RemoteAgent:
@@ -71,7 +72,11 @@ class RemoteAgent:
             for tc in resp.tool_calls:
                 args_str = json.dumps(tc.arguments, ensure_ascii=False)
                 logger.info(f"remote tool call: {tc.name}({args_str[:200]})")
-                result = await self.tools.execute(tc.name, tc.arguments)
+            results = await self.tools.execute_many(
+                [(tc.name, tc.arguments) for tc in resp.tool_calls],
+                max_concurrency=self.cfg.max_parallel_tools,
+            )
+            for tc, result in zip(resp.tool_calls, results):
                 messages.append({"role": "tool", "tool_call_id": tc.id, "name": tc.name, "content": result})
 
             messages.append({"role": "user", "content": "Continue with the task using the tool results."})
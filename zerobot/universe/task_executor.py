@@ -5,9 +5,13 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 from zerobot.config.loader import load_config
+from zerobot.config.schema import Config
 from zerobot.agent.tools.registry import ToolRegistry
 from zerobot.agent.tools.web import WebFetchTool, WebSearchTool
+from zerobot.providers.base import LLMProvider
+from zerobot.providers.cache import CachingProvider, with_response_cache
 from zerobot.providers.litellm_provider import LiteLLMProvider
+from zerobot.providers.rate_limit import llm_priority
 from zerobot.universe.remote_agent import RemoteAgent, RemoteAgentConfig
 
 
@@ -26,14 +30,17 @@ class TaskExecutor:
             max_tokens=int(base.universe.public_max_tokens or 1024),
             agent_max_iterations=int(base.universe.public_agent_max_iterations or 8),
         )
+        self._cache: CachingProvider | None = None
 
     async def run(self, kind: str, prompt: str) -> str:
         if kind == "echo":
             return prompt
-        if kind == "zerobot.agent":
-            return await self._run_remote_agent(prompt)
-        if kind == "llm.chat":
-            return await self._run_llm_chat(prompt)
+        # Tasks from other nodes yield to this node's own conversations
+        with llm_priority("background"):
+            if kind == "zerobot.agent":
+                return await self._run_remote_agent(prompt)
+            if kind == "llm.chat":
+                return await self._run_llm_chat(prompt)
         raise RuntimeError(f"unsupported kind: {kind}")
 
     async def _run_llm_chat(self, prompt: str) -> str:
@@ -50,6 +57,8 @@ class TaskExecutor:
             extra_headers=provider_cfg.extra_headers,
             provider_name=provider_name,
         )
+        if cfg.agents.defaults.llm_cache:
+            provider = self._cached(provider, cfg)
 
         max_tokens = min(int(self._cfg.max_tokens or 1024), 2048)
         resp = await provider.chat(
@@ -61,6 +70,14 @@ class TaskExecutor:
         )
         return resp.content or ""
 
+    def _cached(self, provider: LLMProvider, cfg: Config) -> LLMProvider:
+        # One cache for the executor's lifetime, so repeated tasks hit it and concurrent ones share a call
+        if self._cache is None:
+            self._cache = with_response_cache(provider, cfg.agents.defaults)
+        else:
+            self._cache.provider = provider
+        return self._cache
+
     async def _run_remote_agent(self, prompt: str) -> str:
         cfg = load_config()
         if not self._cfg.allow_agent_tasks:
@@ -94,6 +111,7 @@ class TaskExecutor:
                 max_iterations=int(self._cfg.agent_max_iterations or 8),
                 temperature=cfg.agents.defaults.temperature,
                 max_tokens=min(int(self._cfg.max_tokens or 1024), 2048),
+                max_parallel_tools=cfg.tools.max_parallel_calls,
             ),
         )
         return await agent.run(prompt)
@@ -1,8 +1,12 @@
 """Utility functions for zerobot."""
 
+import re
 from pathlib import Path
 from datetime import datetime
 
+# CJK, kana, hangul and fullwidth forms: roughly one token per character
+_WIDE_CHARS = re.compile(r"[\u2e80-\u9fff\uac00-\ud7af\uf900-\ufaff\uff00-\uffef]")
+
 
 def ensure_dir(path: Path) -> Path:
     """Ensure a directory exists, creating it if necessary."""
@@ -55,6 +59,28 @@ def truncate_string(s: str, max_len: int = 100, suffix: str = "...") -> str:
     return s[: max_len - len(suffix)] + suffix
 
 
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate for budgeting (no tokenizer).
+    
+    Counts ~4 characters per token for Latin text and one token per
+    CJK character; errs slightly high on purpose.
+    """
+    if not text:
+        return 0
+    wide = len(_WIDE_CHARS.findall(text))
+    return (len(text) - wide + 3) // 4 + wide
+
+
+def file_signature(path: Path) -> tuple[int, int] | None:
+    """Cheap change detector for a file: (mtime_ns, size), or None if missing."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
 def safe_filename(name: str) -> str:
     """Convert a string to a safe filename."""
     # Replace unsafe characters
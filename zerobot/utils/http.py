@@ -0,0 +1,245 @@
+"""Process-wide pooled HTTP clients."""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+from loguru import logger
+
+
+@dataclass
+class HostStats:
+    """Request counters for one host."""
+    requests: int = 0
+    errors: int = 0  # Requests that raised before a response arrived
+    in_flight: int = 0
+    waited: int = 0  # Requests that had to wait for a per-host slot
+    connections: int = 0  # TCP connections opened
+    tls_handshakes: int = 0
+    responses: int = 0
+    total_s: float = 0.0  # Time to response headers, summed over responses
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body that frees the per-host slot when it is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Any):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._release:
+                self._release()
+                self._release = None
+
+
+class PooledClient(httpx.AsyncClient):
+    """An AsyncClient that reports to its pool and honours its per-host limit. Don't close it yourself."""
+
+    def __init__(self, pool: HttpClientPool, state: _LoopState, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._owner = pool
+        self._loop_state = state
+
+    async def send(self, request: httpx.Request, **kwargs: Any) -> httpx.Response:
+        host = request.url.host
+        stats = self._owner.host_stats(host)
+        slot = self._loop_state.slot(host, self._owner.per_host_limit)
+        if slot is not None:
+            if slot.locked():
+                stats.waited += 1
+            await slot.acquire()
+
+        stats.requests += 1
+        stats.in_flight += 1
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                stats.in_flight -= 1
+                if slot is not None:
+                    slot.release()
+
+        outer_trace = request.extensions.get("trace")
+
+        async def trace(event: str, info: dict[str, Any]) -> None:
+            if event == "connection.connect_tcp.complete":
+                stats.connections += 1
+            elif event == "connection.start_tls.complete":
+                stats.tls_handshakes += 1
+            if outer_trace is not None:
+                await outer_trace(event, info)
+
+        request.extensions["trace"] = trace
+        started = time.monotonic()
+        try:
+            response = await super().send(request, **kwargs)
+        except BaseException:
+            stats.errors += 1
+            release()
+            raise
+        stats.responses += 1
+        stats.total_s += time.monotonic() - started
+        if response.is_closed:
+            release()
+        else:
+            response.stream = _ReleasingStream(response.stream, release)
+        return response
+
+
+class _LoopState:
+    """Clients and per-host slots for one event loop (httpx pools can't cross loops)."""
+
+    def __init__(self) -> None:
+        self.clients: dict[tuple, PooledClient] = {}
+        self.slots: dict[str, asyncio.Semaphore] = {}
+
+    def slot(self, host: str, limit: int) -> asyncio.Semaphore | None:
+        if limit <= 0:
+            return None
+        if host not in self.slots:
+            self.slots[host] = asyncio.Semaphore(limit)
+        return self.slots[host]
+
+
+class HttpClientPool:
+    """
+    Shared HTTP clients, so repeated requests reuse kept-alive connections.
+
+    Callers ask for a client by the options that change connection
+    behaviour (certificate verification, redirects) and get the same
+    client every time on the same event loop. Timeouts, proxy, HTTP/2 and
+    connection limits are shared; `per_host_limit` caps concurrent
+    requests to one host across all clients of a loop (a streamed response
+    holds its slot until it is closed). HTTP/2 needs the optional `h2`
+    package and is left off without it.
+    """
+
+    def __init__(
+        self,
+        timeout_s: float = 30.0,
+        connect_timeout_s: float = 10.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry_s: float = 30.0,
+        per_host_limit: int = 0,
+        http2: bool = False,
+        proxy: str | None = None,
+    ):
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested but the h2 package is not installed (pip install h2); using HTTP/1.1")
+            http2 = False
+        self.timeout = httpx.Timeout(timeout_s, connect=min(connect_timeout_s, timeout_s))
+        self.limits = httpx.Limits(
+            max_connections=max_connections or None,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry_s,
+        )
+        self.per_host_limit = per_host_limit  # 0 = unlimited
+        self.http2 = http2
+        self.proxy = proxy or None
+        self._loops: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState] = weakref.WeakKeyDictionary()
+        self._hosts: dict[str, HostStats] = {}
+
+    def client(self, verify: bool = True, max_redirects: int = 20) -> httpx.AsyncClient:
+        """The shared client for these options on the running event loop."""
+        state = self._loops.setdefault(asyncio.get_running_loop(), _LoopState())
+        key = (verify, max_redirects)
+        client = state.clients.get(key)
+        if client is None or client.is_closed:
+            client = PooledClient(
+                self,
+                state,
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+                proxy=self.proxy,
+                verify=verify,
+                max_redirects=max_redirects,
+            )
+            state.clients[key] = client
+        return client
+
+    def host_stats(self, host: str) -> HostStats:
+        if host not in self._hosts:
+            self._hosts[host] = HostStats()
+        return self._hosts[host]
+
+    async def aclose(self) -> None:
+        """Close the running loop's clients (and their connections)."""
+        state = self._loops.pop(asyncio.get_running_loop(), None)
+        if state:
+            await asyncio.gather(*(c.aclose() for c in state.clients.values()), return_exceptions=True)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Per-host request, connection and latency counters."""
+        hosts = {}
+        for host, s in sorted(self._hosts.items()):
+            hosts[host] = {
+                "requests": s.requests,
+                "errors": s.errors,
+                "in_flight": s.in_flight,
+                "waited": s.waited,
+                "connections": s.connections,
+                "tls_handshakes": s.tls_handshakes,
+                "avg_s": round(s.total_s / s.responses, 3) if s.responses else 0.0,
+            }
+        return {
+            "http2": self.http2,
+            "per_host_limit": self.per_host_limit,
+            "clients": sum(len(state.clients) for state in self._loops.values()),
+            "requests": sum(s.requests for s in self._hosts.values()),
+            "connections": sum(s.connections for s in self._hosts.values()),
+            "hosts": hosts,
+        }
+
+
+_pool = HttpClientPool()
+
+
+def configure_http(config: Any) -> HttpClientPool:
+    """Replace the shared pool with one built from an HttpConfig. Call before making requests."""
+    global _pool
+    _pool = HttpClientPool(
+        timeout_s=config.timeout_s,
+        connect_timeout_s=config.connect_timeout_s,
+        max_connections=config.max_connections,
+        max_keepalive_connections=config.max_keepalive_connections,
+        keepalive_expiry_s=config.keepalive_expiry_s,
+        per_host_limit=config.per_host_limit,
+        http2=config.http2,
+        proxy=config.proxy,
+    )
+    return _pool
+
+
+def get_http_client(verify: bool = True, max_redirects: int = 20) -> httpx.AsyncClient:
+    """The process-wide HTTP client for these options. Don't close it; see close_http_clients."""
+    return _pool.client(verify=verify, max_redirects=max_redirects)
+
+
+def http_stats() -> dict[str, Any]:
+    return _pool.snapshot()
+
+
+async def close_http_clients() -> None:
+    """Close the shared clients of the running loop, logging how well connections were reused."""
+    stats = _pool.snapshot()
+    if stats["requests"]:
+        logger.info(f"HTTP: {stats['requests']} requests over {stats['connections']} new connections")
+    await _pool.aclose()